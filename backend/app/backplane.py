@@ -0,0 +1,190 @@
+import asyncio
+from collections import defaultdict
+from typing import Callable
+from urllib.parse import urlparse
+
+from app.metrics import registry
+
+BACKPLANE_MESSAGES = registry.counter("backplane_messages_total", "Backplane messages by direction (published/received)")
+BACKPLANE_RECONNECTS = registry.counter("backplane_reconnects_total", "Backplane connection re-establishments")
+
+Handler = Callable[[str], None]
+
+
+class Backplane:
+    def __init__(self):
+        self._handlers: dict[str, list[Handler]] = defaultdict(list)
+
+    async def start(self):
+        pass
+
+    async def aclose(self):
+        pass
+
+    async def publish(self, channel: str, message: str):
+        raise NotImplementedError
+
+    def subscribe(self, channel: str, handler: Handler):
+        first = not self._handlers.get(channel)
+        self._handlers[channel].append(handler)
+        if first:
+            self._on_first_subscriber(channel)
+
+    def unsubscribe(self, channel: str, handler: Handler):
+        handlers = self._handlers.get(channel)
+        if not handlers or handler not in handlers:
+            return
+        handlers.remove(handler)
+        if not handlers:
+            del self._handlers[channel]
+            self._on_last_unsubscriber(channel)
+
+    def _on_first_subscriber(self, channel: str):
+        pass
+
+    def _on_last_unsubscriber(self, channel: str):
+        pass
+
+    def _dispatch(self, channel: str, message: str):
+        BACKPLANE_MESSAGES.inc(direction="received")
+        for handler in list(self._handlers.get(channel, ())):
+            handler(message)
+
+
+class InProcessBackplane(Backplane):
+    async def publish(self, channel: str, message: str):
+        BACKPLANE_MESSAGES.inc(direction="published")
+        self._dispatch(channel, message)
+
+
+class RedisError(Exception):
+    pass
+
+
+def _encode(*parts: str) -> bytes:
+    out = [f"*{len(parts)}\r\n".encode()]
+    for part in parts:
+        raw = part.encode()
+        out.append(b"$%d\r\n%s\r\n" % (len(raw), raw))
+    return b"".join(out)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    line = await reader.readuntil(b"\r\n")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        return RedisError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        size = int(body)
+        if size < 0:
+            return None
+        return (await reader.readexactly(size + 2))[:-2].decode()
+    if kind == b"*":
+        size = int(body)
+        return None if size < 0 else [await _read_reply(reader) for _ in range(size)]
+    raise ConnectionError(f"unexpected RESP line {line!r}")
+
+
+class RedisBackplane(Backplane):
+    def __init__(self, url: str, reconnect_delay_secs: float = 0.5, publish_timeout_secs: float = 1.0):
+        super().__init__()
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.reconnect_delay_secs = reconnect_delay_secs
+        self.publish_timeout_secs = publish_timeout_secs
+        self._pub: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None = None
+        self._sub_reader: asyncio.StreamReader | None = None
+        self._sub_writer: asyncio.StreamWriter | None = None
+        self._publish_lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task] = []
+        self._connected = asyncio.Event()
+
+    async def start(self):
+        if self._tasks:
+            return
+        await self._connect()
+        self._tasks = [asyncio.create_task(self._supervise())]
+
+    async def aclose(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._disconnect()
+
+    async def publish(self, channel: str, message: str):
+        if not self._connected.is_set():
+            raise ConnectionError("backplane is not connected")
+        async with self._publish_lock:
+            if self._pub is None:
+                raise ConnectionError("backplane is not connected")
+            reader, writer = self._pub
+            try:
+                async with asyncio.timeout(self.publish_timeout_secs):
+                    writer.write(_encode("PUBLISH", channel, message))
+                    await writer.drain()
+                    reply = await _read_reply(reader)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError, TimeoutError):
+                if self._pub is not None and self._pub[1] is writer:
+                    self._disconnect()
+                raise
+        if isinstance(reply, RedisError):
+            raise reply
+        BACKPLANE_MESSAGES.inc(direction="published")
+
+    def _on_first_subscriber(self, channel: str):
+        if self._sub_writer is not None:
+            self._sub_writer.write(_encode("SUBSCRIBE", channel))
+
+    def _on_last_unsubscriber(self, channel: str):
+        if self._sub_writer is not None:
+            self._sub_writer.write(_encode("UNSUBSCRIBE", channel))
+
+    async def _connect(self):
+        self._pub = await asyncio.open_connection(self.host, self.port)
+        self._sub_reader, self._sub_writer = await asyncio.open_connection(self.host, self.port)
+        if self._handlers:
+            self._sub_writer.write(_encode("SUBSCRIBE", *self._handlers))
+        self._connected.set()
+
+    def _disconnect(self):
+        self._connected.clear()
+        for writer in (self._pub[1] if self._pub else None, self._sub_writer):
+            if writer is not None:
+                writer.close()
+        self._pub, self._sub_writer = None, None
+
+    async def _supervise(self):
+        while True:
+            try:
+                await self._read_messages(self._sub_reader)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                pass
+            self._disconnect()
+            while True:
+                await asyncio.sleep(self.reconnect_delay_secs)
+                try:
+                    await self._connect()
+                    BACKPLANE_RECONNECTS.inc()
+                    break
+                except OSError:
+                    continue
+
+    async def _read_messages(self, reader: asyncio.StreamReader):
+        while True:
+            reply = await _read_reply(reader)
+            if isinstance(reply, list) and len(reply) == 3 and reply[0] == "message":
+                self._dispatch(reply[1], reply[2])
+
+
+def make_backplane(url: str) -> Backplane:
+    if not url:
+        return InProcessBackplane()
+    if urlparse(url).scheme == "redis":
+        return RedisBackplane(url)
+    raise ValueError(f"unsupported backplane url: {url}")
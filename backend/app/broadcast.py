@@ -0,0 +1,119 @@
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable
+
+from fastapi import WebSocket
+
+from app.metrics import registry
+
+BROADCAST_QUEUE_DEPTH = registry.gauge("broadcast_queue_depth", "Frames waiting in per-connection send queues")
+BROADCAST_SEND_LATENCY = registry.histogram("broadcast_send_latency_seconds", "Time from enqueue to completed socket send")
+BROADCAST_SLOW_CONSUMERS = registry.counter("broadcast_slow_consumers_total", "Connections whose send queue overflowed, by action")
+
+_CATCH_UP = object()
+
+
+def serialize(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+class ClientConnection:
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        max_queue: int,
+        slow_consumer_policy: str,
+        last_turn_index: int,
+        on_catch_up: Callable[["ClientConnection"], Awaitable[None]],
+        on_dead: Callable[["ClientConnection"], None],
+        paused: bool = False,
+    ):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.slow_consumer_policy = slow_consumer_policy
+        self.last_turn_index = last_turn_index
+        self.catching_up = False
+        self.closed = False
+        self._on_catch_up = on_catch_up
+        self._on_dead = on_dead
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._closer: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+        if not paused:
+            self._ready.set()
+        self._writer = asyncio.create_task(self._drain())
+
+    def offer(self, text: str, turn_index: int | None = None):
+        if self.closed:
+            return
+        if self.queue.qsize() >= self.max_queue:
+            self._overflow()
+            return
+        self.queue.put_nowait((text, turn_index, time.perf_counter()))
+        BROADCAST_QUEUE_DEPTH.inc()
+
+    async def send_now(self, text: str, turn_index: int | None = None):
+        await self.websocket.send_text(text)
+        if turn_index is not None:
+            self.last_turn_index = max(self.last_turn_index, turn_index)
+
+    def resume(self):
+        self._ready.set()
+
+    async def close(self, code: int | None = None):
+        if self.closed:
+            return
+        self.closed = True
+        self._writer.cancel()
+        self._clear()
+        if code is not None:
+            try:
+                await self.websocket.close(code=code)
+            except Exception:
+                pass
+
+    def _overflow(self):
+        if self.catching_up:
+            return
+        BROADCAST_SLOW_CONSUMERS.inc(action=self.slow_consumer_policy)
+        self._clear()
+        if self.slow_consumer_policy == "evict":
+            self._on_dead(self)
+            self._closer = asyncio.create_task(self.close(code=1013))
+            return
+        self.catching_up = True
+        self.queue.put_nowait(_CATCH_UP)
+        BROADCAST_QUEUE_DEPTH.inc()
+
+    def _clear(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            BROADCAST_QUEUE_DEPTH.dec()
+
+    async def _drain(self):
+        try:
+            await self._ready.wait()
+            while True:
+                item = await self.queue.get()
+                BROADCAST_QUEUE_DEPTH.dec()
+                try:
+                    if item is _CATCH_UP:
+                        self.catching_up = False
+                        await self._on_catch_up(self)
+                        continue
+                    text, turn_index, enqueued_at = item
+                    if turn_index is not None and turn_index <= self.last_turn_index:
+                        continue
+                    await self.send_now(text, turn_index)
+                    BROADCAST_SEND_LATENCY.observe(time.perf_counter() - enqueued_at)
+                finally:
+                    self.queue.task_done()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.closed = True
+            self._clear()
+            self._on_dead(self)
@@ -5,18 +5,79 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     db_path: str = "game.db"
+    db_reader_threads: int = 4
+    db_journal_mode: str = "WAL"
+    db_synchronous: str = "NORMAL"
+    db_cache_size_kib: int = 16384
+    db_mmap_size_bytes: int = 268435456
+    db_busy_timeout_ms: int = 5000
+    db_statement_cache_size: int = 256
 
     llm_base_url: str = "https://api.openai.com/v1"
     llm_api_key: str = ""
     llm_model_speaker: str = "gpt-4o-mini"
     llm_model_judge: str = "gpt-4o-mini"
     llm_timeout_secs: float = 15.0
+    llm_speaker_deadline_secs: float = 8.0
+    llm_judge_deadline_secs: float = 20.0
+    llm_max_retries: int = 2
+    llm_retry_base_delay_secs: float = 0.25
+    llm_retry_max_delay_secs: float = 4.0
+    llm_retry_min_attempt_secs: float = 1.0
     llm_max_tokens_speaker: int = 128
     llm_max_tokens_judge: int = 128
     llm_temperature_speaker: float = 0.9
     llm_temperature_judge: float = 0.2
+    llm_stream_speaker: bool = True
+    speculative_generation: bool = False
+    utterance_pool_enabled: bool = False
+    utterance_pool_candidates: int = 3
+    utterance_pool_max_per_seat: int = 6
+    utterance_pool_max_staleness_turns: int = 8
+    utterance_pool_latency_budget_secs: float = 4.0
+    llm_endpoints: list[dict] = []
+    llm_hedging: bool = True
+    llm_hedge_quantile: float = 0.95
+    llm_hedge_default_delay_secs: float = 2.0
+    llm_hedge_min_delay_secs: float = 0.2
+    llm_ewma_alpha: float = 0.2
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_reset_secs: float = 30.0
+    llm_http2: bool = False
+    llm_pool_max_connections: int = 100
+    llm_pool_max_keepalive: int = 20
+    llm_pool_keepalive_expiry_secs: float = 30.0
+    llm_max_concurrency: int = 32
+    llm_requests_per_min: float = 0.0
+    llm_tokens_per_min: float = 0.0
+    llm_model_limits: dict[str, dict[str, float]] = {}
+
+    session_cache_max_entries: int = 10000
+    loop_lag_interval_secs: float = 0.25
+    loop_stall_threshold_ms: float = 0.0
+    debug_profiling_enabled: bool = False
+    debug_profile_max_secs: float = 30.0
+    admin_endpoints_enabled: bool = False
+    trace_exporter: str = ""
+    trace_path: str = "traces.jsonl"
+    trace_sample_rate: float = 1.0
+    trace_min_duration_ms: float = 0.0
+    backplane_url: str = ""
+    session_lease_ttl_secs: float = 15.0
+    session_idle_ttl_secs: float = 1800.0
+    recovery_on_startup: bool = True
+    recovery_engines_per_sec: float = 20.0
+    session_reap_interval_secs: float = 60.0
+    judge_workers: int = 4
+    judge_queue_max: int = 256
+
+    resume_batch_size: int = 200
+    broadcast_queue_max: int = 256
+    broadcast_slow_consumer_policy: str = "snapshot"
 
     human_turn_timeout_secs: int = 60
+    timer_tick_secs: float = 0.05
+    timer_wheel_slots: int = 512
     typing_delay_per_char: float = 0.1
     typing_delay_min_secs: float = 0.2
     typing_delay_max_secs: float = 2.4
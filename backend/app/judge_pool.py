@@ -0,0 +1,61 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from app.metrics import registry
+
+JUDGE_QUEUE_DEPTH = registry.gauge("judge_queue_depth", "Sessions waiting for a judge worker")
+JUDGE_BACKPRESSURE = registry.counter("judge_backpressure_total", "Judge submissions that waited on a full queue")
+JUDGE_DURATION = registry.histogram("judge_duration_seconds", "Judge job wall time by outcome")
+
+
+class JudgeWorkerPool:
+    def __init__(self, judge: Callable[[str], Awaitable[None]], workers: int, max_queue: int):
+        self._judge = judge
+        self.workers = workers
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self.pending: set[str] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    async def submit(self, session_id: str):
+        if session_id in self.pending:
+            return
+        self._ensure_workers()
+        self.pending.add(session_id)
+        if self.queue.full():
+            JUDGE_BACKPRESSURE.inc()
+        try:
+            await self.queue.put(session_id)
+        except BaseException:
+            self.pending.discard(session_id)
+            raise
+        JUDGE_QUEUE_DEPTH.set(self.queue.qsize())
+
+    async def join(self):
+        await self.queue.join()
+
+    async def aclose(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _ensure_workers(self):
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._work()))
+
+    async def _work(self):
+        while True:
+            session_id = await self.queue.get()
+            JUDGE_QUEUE_DEPTH.set(self.queue.qsize())
+            started = time.perf_counter()
+            outcome = "ok"
+            try:
+                await self._judge(session_id)
+            except Exception:
+                outcome = "error"
+            finally:
+                self.pending.discard(session_id)
+                self.queue.task_done()
+                JUDGE_DURATION.observe(time.perf_counter() - started, outcome=outcome)
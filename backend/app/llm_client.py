@@ -1,35 +1,366 @@
 import asyncio
+import importlib.util
+import itertools
+import json
+import logging
+import random
+import time
+from contextlib import AsyncExitStack, contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator
 
 import httpx
 
 from app.config import settings
+from app.llm_router import LLM_HEDGES, Endpoint, LLMRouter, LLMUnavailableError
+from app.llm_scheduler import LLMPriority, LLMScheduler, estimate_tokens
+from app.metrics import registry
+from app.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+LLM_REQUEST_DURATION = registry.histogram(
+    "llm_request_seconds", "LLM call wall time including admission and retries, by model and outcome (ok/error/deadline/cancelled)"
+)
+LLM_RETRIES = registry.counter("llm_retries_total", "LLM call retries by reason (timeout/transport/status)")
+LLM_DEADLINE_EXHAUSTED = registry.counter(
+    "llm_deadline_exhausted_total", "LLM calls given up on the turn deadline, by reason (timeout/no_budget)"
+)
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status == 429
+    return True
+
+
+def _failure_reason(exc: Exception) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return "status"
+    return "timeout" if isinstance(exc, httpx.TimeoutException) else "transport"
+
+
+def _retry_after_secs(exc: Exception) -> float | None:
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    value = exc.response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+async def _cancel_all(tasks: set[asyncio.Task], recheck_secs: float = 0.05, max_rounds: int = 20):
+    pending = tasks
+    for _ in range(max_rounds):
+        if not pending:
+            break
+        for task in pending:
+            task.cancel()
+        _, pending = await asyncio.wait(pending, timeout=recheck_secs)
+    if pending:
+        logger.warning("%d hedged LLM attempt(s) ignored cancellation for %.1fs; leaving them behind", len(pending), max_rounds * recheck_secs)
+        for task in pending:
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    for task in tasks - pending:
+        if not task.cancelled():
+            task.exception()
 
 
 class LLMClient:
-    def __init__(self):
-        self.base_url = settings.llm_base_url.rstrip("/")
-        self.api_key = settings.llm_api_key
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        scheduler: LLMScheduler | None = None,
+        router: LLMRouter | None = None,
+    ):
         self.timeout = settings.llm_timeout_secs
+        self.scheduler = scheduler or LLMScheduler.from_settings()
+        self.router = router or LLMRouter.from_settings(base_url, api_key)
+        self.rng = random.Random()
+        self._client: httpx.AsyncClient | None = None
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.llm_pool_max_connections,
+            max_keepalive_connections=settings.llm_pool_max_keepalive,
+            keepalive_expiry=settings.llm_pool_keepalive_expiry_secs,
+        )
+        http2 = settings.llm_http2 and importlib.util.find_spec("h2") is not None
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits, http2=http2)
+
+    async def start(self):
+        if self._client is None:
+            self._client = self._build_client()
+
+    async def aclose(self):
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    def _headers(self, endpoint: Endpoint) -> dict:
+        return {"Authorization": f"Bearer {endpoint.api_key}", "Content-Type": "application/json"}
+
+    @contextmanager
+    def _observed(self, name: str, model: str, activate: bool = True):
+        started = time.perf_counter()
+        outcome = "error"
+        with tracer.span(name, activate=activate, model=model) as span:
+            try:
+                yield span
+                outcome = "ok"
+            except GeneratorExit:
+                outcome = "ok"
+                raise
+            except LLMDeadlineExceeded:
+                outcome = "deadline"
+                raise
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                LLM_REQUEST_DURATION.observe(time.perf_counter() - started, model=model, outcome=outcome)
+                span.set_attribute("outcome", outcome)
+
+    def _deadline(self, budget_secs: float | None) -> float | None:
+        return asyncio.get_running_loop().time() + budget_secs if budget_secs else None
+
+    def _retry_delay(self, attempt: int, exc: Exception, deadline: float | None) -> float | None:
+        if attempt >= settings.llm_max_retries or not _is_retryable(exc):
+            return None
+        delay = self.rng.uniform(0, min(settings.llm_retry_max_delay_secs, settings.llm_retry_base_delay_secs * 2**attempt))
+        retry_after = _retry_after_secs(exc)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if deadline is not None and deadline - asyncio.get_running_loop().time() - delay < settings.llm_retry_min_attempt_secs:
+            LLM_DEADLINE_EXHAUSTED.inc(reason="no_budget")
+            return None
+        LLM_RETRIES.inc(reason=_failure_reason(exc))
+        return delay
+
+    def _record_failure(self, endpoint: Endpoint, exc: Exception, started: float, failed: set[Endpoint]):
+        if _is_retryable(exc):
+            failed.add(endpoint)
+            self.router.record_failure(endpoint, time.perf_counter() - started)
 
-    async def chat(self, *, model: str, messages: list[dict], temperature: float, max_tokens: int) -> str:
-        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+    def _acquire(self, failed: set[Endpoint]) -> Endpoint:
+        endpoint = self.router.acquire(failed) or self.router.acquire()
+        if endpoint is None:
+            raise LLMUnavailableError("every LLM endpoint circuit is open")
+        return endpoint
+
+    async def chat(
+        self,
+        *,
+        model: str,
+        messages: list[dict],
+        temperature: float,
+        max_tokens: int,
+        usage: dict | None = None,
+        priority: LLMPriority = LLMPriority.BACKGROUND,
+        budget_secs: float | None = None,
+    ) -> str:
         payload = {
             "model": model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
-        retries = 2
-        for attempt in range(retries + 1):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload)
+        data = await self._complete(payload, priority, estimate_tokens(messages, max_tokens), budget_secs)
+        if usage is not None:
+            usage.update(data.get("usage") or {})
+        return data["choices"][0]["message"]["content"]
+
+    async def chat_candidates(
+        self,
+        *,
+        model: str,
+        messages: list[dict],
+        temperature: float,
+        max_tokens: int,
+        n: int,
+        priority: LLMPriority = LLMPriority.BACKGROUND,
+        budget_secs: float | None = None,
+    ) -> list[str]:
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "n": n,
+        }
+        data = await self._complete(payload, priority, estimate_tokens(messages, max_tokens * n), budget_secs)
+        return [choice["message"]["content"] for choice in data["choices"]]
+
+    async def _complete(self, payload: dict, priority: LLMPriority, estimate: int, budget_secs: float | None) -> dict:
+        with self._observed("llm.chat", payload["model"]) as span:
+            deadline = self._deadline(budget_secs)
+            failed: set[Endpoint] = set()
+            for attempt in itertools.count():
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        async with self.scheduler.admit(payload["model"], priority, estimate) as ticket:
+                            data = await self._hedged_post(payload, failed)
+                            ticket.used_tokens = (data.get("usage") or {}).get("total_tokens")
+                    return data
+                except TimeoutError as exc:
+                    LLM_DEADLINE_EXHAUSTED.inc(reason="timeout")
+                    raise LLMDeadlineExceeded(f"LLM call exceeded its {budget_secs}s budget") from exc
+                except (httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError) as exc:
+                    delay = self._retry_delay(attempt, exc, deadline)
+                    if delay is None:
+                        raise
+                    span.set_attribute("retries", attempt + 1)
+                    await asyncio.sleep(delay)
+
+    async def _hedged_post(self, payload: dict, failed: set[Endpoint]) -> dict:
+        primary = self._acquire(failed)
+        tasks = {self._start_post(primary, payload, failed)}
+        delay = self.router.hedge_delay(primary)
+        hedge: asyncio.Task | None = None
+        error: BaseException | None = None
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, timeout=delay if hedge is None else None, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    backup = self.router.acquire({primary, *failed})
+                    if backup is None:
+                        delay = None
+                        continue
+                    LLM_HEDGES.inc(outcome="launched")
+                    hedge = self._start_post(backup, payload, failed)
+                    tasks.add(hedge)
+                    continue
+                for task in done:
+                    tasks.discard(task)
+                    if task.exception() is None:
+                        if hedge is not None:
+                            LLM_HEDGES.inc(outcome="won" if task is hedge else "lost")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            await _cancel_all(tasks)
+
+    def _start_post(self, endpoint: Endpoint, payload: dict, failed: set[Endpoint]) -> asyncio.Task:
+        task = asyncio.create_task(self._post(endpoint, payload, failed))
+        task.add_done_callback(lambda _: self.router.release(endpoint))
+        return task
+
+    async def _post(self, endpoint: Endpoint, payload: dict, failed: set[Endpoint]) -> dict:
+        started = time.perf_counter()
+        try:
+            with tracer.span("llm.http", endpoint=endpoint.name):
+                resp = await self.client.post(
+                    f"{endpoint.base_url}/chat/completions", headers=self._headers(endpoint), json=endpoint.payload_for(payload)
+                )
                 if resp.status_code >= 500:
                     raise httpx.HTTPStatusError("server error", request=resp.request, response=resp)
                 resp.raise_for_status()
                 data = resp.json()
-                return data["choices"][0]["message"]["content"]
-            except (httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError):
-                if attempt == retries:
-                    raise
-                await asyncio.sleep(0.5 * (attempt + 1))
+        except Exception as exc:
+            self._record_failure(endpoint, exc, started, failed)
+            raise
+        self.router.record_success(endpoint, time.perf_counter() - started)
+        return data
+
+    async def chat_stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict],
+        temperature: float,
+        max_tokens: int,
+        priority: LLMPriority = LLMPriority.BACKGROUND,
+        budget_secs: float | None = None,
+    ) -> AsyncIterator[str]:
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+        estimate = estimate_tokens(messages, max_tokens)
+        with self._observed("llm.stream", model, activate=False) as span:
+            deadline = self._deadline(budget_secs)
+            failed: set[Endpoint] = set()
+            for attempt in itertools.count():
+                emitted = False
+                try:
+                    async with AsyncExitStack() as stack:
+                        async with asyncio.timeout_at(deadline):
+                            await stack.enter_async_context(self.scheduler.admit(model, priority, estimate))
+                            endpoint = self._acquire(failed)
+                            stack.callback(self.router.release, endpoint)
+                            span.set_attribute("endpoint", endpoint.name)
+                            started = time.perf_counter()
+                            request = self.client.build_request(
+                                "POST", f"{endpoint.base_url}/chat/completions", headers=self._headers(endpoint), json=endpoint.payload_for(payload)
+                            )
+                            try:
+                                resp = await self.client.send(request, stream=True)
+                                stack.push_async_callback(resp.aclose)
+                                if resp.status_code >= 500:
+                                    raise httpx.HTTPStatusError("server error", request=resp.request, response=resp)
+                                resp.raise_for_status()
+                            except Exception as exc:
+                                self._record_failure(endpoint, exc, started, failed)
+                                raise
+                        deltas = self._iter_sse_deltas(resp)
+                        stack.push_async_callback(deltas.aclose)
+                        while True:
+                            try:
+                                async with asyncio.timeout_at(deadline):
+                                    delta = await anext(deltas, None)
+                            except Exception as exc:
+                                if not emitted and not isinstance(exc, TimeoutError):
+                                    self._record_failure(endpoint, exc, started, failed)
+                                raise
+                            if delta is None:
+                                break
+                            if not emitted:
+                                emitted = True
+                                self.router.record_success(endpoint, time.perf_counter() - started)
+                            yield delta
+                    return
+                except TimeoutError as exc:
+                    LLM_DEADLINE_EXHAUSTED.inc(reason="timeout")
+                    raise LLMDeadlineExceeded(f"LLM stream exceeded its {budget_secs}s budget") from exc
+                except (httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError) as exc:
+                    delay = None if emitted else self._retry_delay(attempt, exc, deadline)
+                    if delay is None:
+                        raise
+                    span.set_attribute("retries", attempt + 1)
+                    await asyncio.sleep(delay)
+
+    async def _iter_sse_deltas(self, resp: "httpx.Response") -> AsyncIterator[str]:
+        async for line in resp.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                continue
+            choices = json.loads(data).get("choices") or []
+            content = (choices[0].get("delta") or {}).get("content") if choices else None
+            if content:
+                yield content
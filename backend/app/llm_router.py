@@ -0,0 +1,145 @@
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from app.config import settings
+from app.metrics import registry
+
+LLM_ENDPOINT_LATENCY = registry.histogram("llm_endpoint_latency_seconds", "Upstream LLM call latency by endpoint and outcome (ok/error)")
+LLM_HEDGES = registry.counter("llm_hedged_requests_total", "Hedged LLM duplicates by outcome (launched/won/lost)")
+LLM_BREAKER_TRANSITIONS = registry.counter("llm_breaker_transitions_total", "LLM endpoint circuit breaker transitions by endpoint and state")
+
+
+class LLMUnavailableError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_secs: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_secs = reset_secs
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def allow(self, now: float) -> bool:
+        if self.state == self.OPEN and now - self.opened_at >= self.reset_secs:
+            self._transition(self.HALF_OPEN)
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self, now: float):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.opened_at = now
+            self._transition(self.OPEN)
+
+    def _transition(self, state: str):
+        self.state = state
+        self.probing = False
+        LLM_BREAKER_TRANSITIONS.inc(endpoint=self.name, state=state)
+
+
+class Endpoint:
+    def __init__(self, name: str, base_url: str, api_key: str, models: dict[str, str], breaker: CircuitBreaker, window: int = 128):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.models = models
+        self.breaker = breaker
+        self.ewma: float | None = None
+        self.samples: deque[float] = deque(maxlen=window)
+        self.in_flight = 0
+
+    def payload_for(self, payload: dict) -> dict:
+        model = self.models.get(payload["model"])
+        return payload if model is None else {**payload, "model": model}
+
+    def quantile(self, q: float) -> float | None:
+        if len(self.samples) < 8:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class LLMRouter:
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        *,
+        hedging: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_default_delay_secs: float = 2.0,
+        hedge_min_delay_secs: float = 0.2,
+        ewma_alpha: float = 0.2,
+    ):
+        if not endpoints:
+            raise ValueError("at least one LLM endpoint is required")
+        self.endpoints = endpoints
+        self.hedging = hedging
+        self.hedge_quantile = hedge_quantile
+        self.hedge_default_delay_secs = hedge_default_delay_secs
+        self.hedge_min_delay_secs = hedge_min_delay_secs
+        self.ewma_alpha = ewma_alpha
+
+    @classmethod
+    def from_settings(cls, base_url: str | None = None, api_key: str | None = None) -> "LLMRouter":
+        default_key = settings.llm_api_key if api_key is None else api_key
+        if base_url is not None or not settings.llm_endpoints:
+            specs = [{"base_url": base_url or settings.llm_base_url}]
+        else:
+            specs = settings.llm_endpoints
+        endpoints = []
+        for spec in specs:
+            name = spec.get("name") or urlparse(spec["base_url"]).netloc
+            breaker = CircuitBreaker(name, settings.llm_breaker_failure_threshold, settings.llm_breaker_reset_secs)
+            endpoints.append(Endpoint(name, spec["base_url"], spec.get("api_key", default_key), spec.get("models", {}), breaker))
+        return cls(
+            endpoints,
+            hedging=settings.llm_hedging,
+            hedge_quantile=settings.llm_hedge_quantile,
+            hedge_default_delay_secs=settings.llm_hedge_default_delay_secs,
+            hedge_min_delay_secs=settings.llm_hedge_min_delay_secs,
+            ewma_alpha=settings.llm_ewma_alpha,
+        )
+
+    def acquire(self, exclude: set[Endpoint] | frozenset = frozenset()) -> Endpoint | None:
+        now = time.monotonic()
+        for endpoint in sorted(self.endpoints, key=lambda e: (e.ewma or 0.0) * (1 + e.in_flight)):
+            if endpoint not in exclude and endpoint.breaker.allow(now):
+                endpoint.in_flight += 1
+                return endpoint
+        return None
+
+    def release(self, endpoint: Endpoint):
+        endpoint.in_flight -= 1
+        endpoint.breaker.probing = False
+
+    def record_success(self, endpoint: Endpoint, latency: float):
+        endpoint.samples.append(latency)
+        endpoint.ewma = latency if endpoint.ewma is None else self.ewma_alpha * latency + (1 - self.ewma_alpha) * endpoint.ewma
+        endpoint.breaker.record_success()
+        LLM_ENDPOINT_LATENCY.observe(latency, endpoint=endpoint.name, outcome="ok")
+
+    def record_failure(self, endpoint: Endpoint, latency: float):
+        endpoint.breaker.record_failure(time.monotonic())
+        LLM_ENDPOINT_LATENCY.observe(latency, endpoint=endpoint.name, outcome="error")
+
+    def hedge_delay(self, endpoint: Endpoint) -> float | None:
+        if not self.hedging or len(self.endpoints) < 2:
+            return None
+        observed = endpoint.quantile(self.hedge_quantile)
+        return max(self.hedge_default_delay_secs if observed is None else observed, self.hedge_min_delay_secs)
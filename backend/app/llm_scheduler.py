@@ -0,0 +1,148 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+from app.config import settings
+from app.metrics import registry
+from app.tracing import tracer
+
+LLM_QUEUE_WAIT = registry.histogram("llm_queue_wait_seconds", "Time LLM calls waited for admission, by model and priority")
+LLM_QUEUE_DEPTH = registry.gauge("llm_queue_depth", "LLM calls waiting for admission, by model")
+LLM_IN_FLIGHT = registry.gauge("llm_in_flight", "Admitted LLM calls currently running, by model")
+
+
+class LLMPriority(IntEnum):
+    INTERACTIVE = 0
+    JUDGE = 1
+    BACKGROUND = 2
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int) -> int:
+    return sum(len(m.get("content") or "") for m in messages) + max_tokens
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class Ticket:
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.used_tokens: int | None = None
+
+
+class _Lane:
+    def __init__(self, model: str, concurrency: int, requests_per_min: float, tokens_per_min: float):
+        self.model = model
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.requests = TokenBucket(requests_per_min) if requests_per_min > 0 else None
+        self.tokens = TokenBucket(tokens_per_min) if tokens_per_min > 0 else None
+        self.waiters: list[tuple[int, int, asyncio.Future, int]] = []
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        concurrency: int,
+        requests_per_min: float = 0.0,
+        tokens_per_min: float = 0.0,
+        model_limits: dict[str, dict[str, float]] | None = None,
+    ):
+        self.defaults = {"concurrency": concurrency, "requests_per_min": requests_per_min, "tokens_per_min": tokens_per_min}
+        self.model_limits = model_limits or {}
+        self._lanes: dict[str, _Lane] = {}
+        self._seq = itertools.count()
+
+    @classmethod
+    def from_settings(cls) -> "LLMScheduler":
+        return cls(settings.llm_max_concurrency, settings.llm_requests_per_min, settings.llm_tokens_per_min, settings.llm_model_limits)
+
+    def _lane(self, model: str) -> _Lane:
+        lane = self._lanes.get(model)
+        if lane is None:
+            limits = {**self.defaults, **self.model_limits.get(model, {})}
+            lane = self._lanes[model] = _Lane(model, int(limits["concurrency"]), limits["requests_per_min"], limits["tokens_per_min"])
+        return lane
+
+    @asynccontextmanager
+    async def admit(self, model: str, priority: LLMPriority, tokens: int):
+        lane = self._lane(model)
+        started = time.perf_counter()
+        entry = (int(priority), next(self._seq), asyncio.get_running_loop().create_future(), tokens)
+        heapq.heappush(lane.waiters, entry)
+        self._pump(lane)
+        try:
+            if not entry[2].done():
+                with tracer.span("llm.admit", model=model, priority=priority.name.lower()):
+                    await entry[2]
+        except asyncio.CancelledError:
+            if entry[2].done() and not entry[2].cancelled():
+                lane.in_flight -= 1
+            elif entry in lane.waiters:
+                lane.waiters.remove(entry)
+                heapq.heapify(lane.waiters)
+            self._pump(lane)
+            raise
+        LLM_QUEUE_WAIT.observe(time.perf_counter() - started, model=model, priority=priority.name.lower())
+        ticket = Ticket(tokens)
+        try:
+            yield ticket
+        finally:
+            lane.in_flight -= 1
+            if lane.tokens is not None and ticket.used_tokens is not None:
+                lane.tokens.adjust(ticket.used_tokens - ticket.estimated_tokens)
+            self._pump(lane)
+
+    def _pump(self, lane: _Lane):
+        now = time.monotonic()
+        while lane.waiters and lane.in_flight < lane.concurrency:
+            _, _, fut, tokens = lane.waiters[0]
+            if fut.done():
+                heapq.heappop(lane.waiters)
+                continue
+            wait = max(
+                lane.requests.wait_time(1, now) if lane.requests else 0.0,
+                lane.tokens.wait_time(tokens, now) if lane.tokens else 0.0,
+            )
+            if wait > 0:
+                if lane.timer is None:
+                    lane.timer = asyncio.get_running_loop().call_later(wait, self._wake, lane)
+                break
+            heapq.heappop(lane.waiters)
+            if lane.requests:
+                lane.requests.take(1, now)
+            if lane.tokens:
+                lane.tokens.take(tokens, now)
+            lane.in_flight += 1
+            fut.set_result(None)
+        LLM_QUEUE_DEPTH.set(len(lane.waiters), model=lane.model)
+        LLM_IN_FLIGHT.set(lane.in_flight, model=lane.model)
+
+    def _wake(self, lane: _Lane):
+        lane.timer = None
+        self._pump(lane)
@@ -0,0 +1,35 @@
+import asyncio
+
+from app.metrics import registry
+
+EVENT_LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a scheduled wakeup",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_LAG_LAST = registry.gauge("event_loop_lag_last_seconds", "Event loop lag measured by the most recent wakeup")
+
+
+class LoopLagMonitor:
+    def __init__(self, interval_secs: float):
+        self.interval_secs = interval_secs
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self.interval_secs > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_secs
+            await asyncio.sleep(self.interval_secs)
+            lag = max(loop.time() - expected, 0.0)
+            EVENT_LOOP_LAG.observe(lag)
+            EVENT_LOOP_LAG_LAST.set(lag)
@@ -1,25 +1,53 @@
 import json
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 
+from app.backplane import make_backplane
 from app.config import settings
 from app.llm_client import LLMClient
+from app.loop_monitor import LoopLagMonitor
+from app.metrics import registry
 from app.orchestrator import GameOrchestrator
+from app.profiling import ProfilerBusyError, SamplingProfiler, StallDetector
 from app.schemas import CreateSessionRequest, CreateSessionResponse, ResultResponse
-from app.store import SQLiteStore
+from app.store import AsyncSQLiteStore, SQLiteStore
+from app.tracing import tracer
 from app.ws import make_ws_router
 
-store = SQLiteStore(settings.db_path)
+store = AsyncSQLiteStore(SQLiteStore(settings.db_path), reader_threads=settings.db_reader_threads)
 llm_client = LLMClient()
-orchestrator = GameOrchestrator(store, llm_client)
+orchestrator = GameOrchestrator(store, llm_client, make_backplane(settings.backplane_url))
+loop_monitor = LoopLagMonitor(settings.loop_lag_interval_secs)
+stall_detector = StallDetector(settings.loop_stall_threshold_ms / 1000)
+profiler = SamplingProfiler(settings.debug_profile_max_secs)
 
-app = FastAPI(title="Human-or-LLM 추리 대화 게임")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await llm_client.start()
+    await orchestrator.start()
+    loop_monitor.start()
+    stall_detector.start()
+    try:
+        yield
+    finally:
+        await stall_detector.aclose()
+        await loop_monitor.aclose()
+        await orchestrator.aclose()
+        await llm_client.aclose()
+        store.close()
+        tracer.close()
+
+
+app = FastAPI(title="Human-or-LLM 추리 대화 게임", lifespan=lifespan)
 app.include_router(make_ws_router(orchestrator))
 
 
 @app.post("/sessions", response_model=CreateSessionResponse)
 async def create_session(req: CreateSessionRequest):
-    session_id = orchestrator.create_session(
+    session_id = await orchestrator.create_session(
         topic=req.topic,
         num_llm_speakers=req.num_llm_speakers,
         turns_per_speaker=req.turns_per_speaker,
@@ -29,9 +57,64 @@ async def create_session(req: CreateSessionRequest):
     return CreateSessionResponse(session_id=session_id, ws_url=f"/ws/sessions/{session_id}")
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _require_debug_profiling():
+    if not settings.debug_profiling_enabled:
+        raise HTTPException(status_code=404, detail="debug profiling disabled")
+
+
+@app.get("/debug/metrics")
+async def debug_metrics():
+    _require_debug_profiling()
+    return registry.export()
+
+
+@app.get("/debug/profile", response_class=PlainTextResponse)
+async def debug_profile(seconds: float = 5.0, interval_ms: float = 10.0, all_threads: bool = False):
+    _require_debug_profiling()
+    if seconds <= 0 or interval_ms < 1:
+        raise HTTPException(status_code=422, detail="seconds must be > 0 and interval_ms >= 1")
+    try:
+        samples = await profiler.profile(seconds, interval_ms / 1000, all_threads)
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return PlainTextResponse(profiler.render(samples))
+
+
+@app.get("/debug/stalls")
+async def debug_stalls():
+    _require_debug_profiling()
+    return {"threshold_ms": settings.loop_stall_threshold_ms, "stalls": list(stall_detector.recent)}
+
+
+@app.get("/admin/sessions")
+async def admin_sessions(
+    status: str | None = None,
+    stuck: bool | None = None,
+    owned: bool | None = None,
+    sort: str = "secs_since_last_turn",
+    order: str = "desc",
+    limit: int = 100,
+):
+    if not settings.admin_endpoints_enabled:
+        raise HTTPException(status_code=404, detail="admin endpoints disabled")
+    if order not in ("asc", "desc") or limit < 1:
+        raise HTTPException(status_code=422, detail="order must be asc or desc and limit >= 1")
+    statuses = {part.strip().upper() for part in status.split(",") if part.strip()} if status else None
+    try:
+        rows = orchestrator.inspect_sessions(statuses=statuses, stuck=stuck, owned=owned, sort=sort, descending=order == "desc")
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return {"worker_id": orchestrator.worker_id, "count": len(rows), "sessions": rows[:limit]}
+
+
 @app.get("/sessions/{session_id}")
 async def get_session(session_id: str):
-    session = store.get_session(session_id)
+    session = await store.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="session not found")
     turn_state = json.loads(session["turn_state_json"])
@@ -39,7 +122,7 @@ async def get_session(session_id: str):
         "session_id": session_id,
         "status": session["status"],
         "topic": session["topic"],
-        "participants": [{"seat": p["seat"]} for p in store.list_participants(session_id) if p["type"] != "judge"],
+        "participants": [{"seat": p["seat"]} for p in await store.list_participants(session_id) if p["type"] != "judge"],
         "turns_per_speaker": session["turns_per_speaker"],
         "turn_counts": turn_state["turn_counts"],
         "current_speaker_seat": turn_state["current_speaker_seat"],
@@ -49,14 +132,14 @@ async def get_session(session_id: str):
 
 @app.get("/sessions/{session_id}/messages")
 async def get_messages(session_id: str):
-    if not store.get_session(session_id):
+    if not await store.get_session(session_id):
         raise HTTPException(status_code=404, detail="session not found")
-    return {"session_id": session_id, "messages": store.list_messages(session_id)}
+    return {"session_id": session_id, "messages": await store.list_messages(session_id)}
 
 
 @app.get("/sessions/{session_id}/result", response_model=ResultResponse)
 async def get_result(session_id: str):
-    result = store.get_result(session_id)
+    result = await store.get_result(session_id)
     if not result:
         raise HTTPException(status_code=404, detail="result not ready")
     return ResultResponse(session_id=session_id, pick_seat=result["pick_seat"], confidence=result["confidence"], why=result["why"])
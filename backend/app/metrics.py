@@ -0,0 +1,158 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: dict, **extra) -> str:
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in items.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(items, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str = ""):
+        self.name = name
+        self.help_text = help_text
+        self._values: dict[tuple, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels):
+        self._values[_key(labels)] += amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_key(labels), 0.0)
+
+    def samples(self) -> list[tuple[dict, float]]:
+        return [(dict(key), value) for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels):
+        self._values[_key(labels)] -= amount
+
+    def set(self, value: float, **labels):
+        self._values[_key(labels)] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str = "", buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels):
+        key = _key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(_key(labels), ()))
+
+    def sum(self, **labels) -> float:
+        return self._sums.get(_key(labels), 0.0)
+
+    def samples(self) -> list[tuple[dict, dict]]:
+        return [
+            (dict(key), {"buckets": dict(zip((*self.buckets, float("inf")), counts)), "count": sum(counts), "sum": self._sums[key]})
+            for key, counts in self._counts.items()
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def _get_or_create(self, cls, name: str, help_text: str, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help_text, **kwargs)
+        return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = "", buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], None]):
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def collect(self):
+        for collector in list(self._collectors):
+            collector()
+
+    def snapshot(self) -> dict[str, list[tuple[dict, float | dict]]]:
+        return {name: metric.samples() for name, metric in self._metrics.items()}
+
+    def render_prometheus(self) -> str:
+        self.collect()
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                for labels, sample in metric.samples():
+                    cumulative = 0
+                    for le, count in sample["buckets"].items():
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, le=_format_value(le))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+            else:
+                for labels, value in metric.samples():
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> dict[str, dict]:
+        self.collect()
+        out = {}
+        for name, metric in self._metrics.items():
+            if isinstance(metric, Histogram):
+                samples = [
+                    {
+                        "labels": labels,
+                        "count": sample["count"],
+                        "sum": sample["sum"],
+                        "buckets": [["+Inf" if le == float("inf") else le, count] for le, count in sample["buckets"].items()],
+                    }
+                    for labels, sample in metric.samples()
+                ]
+            else:
+                samples = [{"labels": labels, "value": value} for labels, value in metric.samples()]
+            out[name] = {"kind": metric.kind, "help": metric.help_text, "samples": samples}
+        return out
+
+
+registry = MetricsRegistry()
@@ -1,18 +1,39 @@
 import asyncio
 import json
+import logging
+import math
+import os
 import random
 import re
+import socket
+import time
 from collections import defaultdict
+from contextlib import aclosing, asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Callable
+from functools import partial
+from uuid import uuid4
 
 from fastapi import WebSocket
 
+from app.backplane import Backplane, InProcessBackplane
+from app.broadcast import ClientConnection, serialize
 from app.config import settings
+from app.judge_pool import JudgeWorkerPool
 from app.llm_client import LLMClient
+from app.llm_scheduler import LLMPriority
+from app.metrics import registry
 from app.personas import pick_persona
-from app.prompts import build_judge_messages, build_speaker_messages
-from app.store import SQLiteStore
+from app.prompts import build_judge_messages, build_pool_messages, build_speaker_messages, difficulty_to_window
+from app.session_cache import SessionCache, SessionState
+from app.store import AsyncSQLiteStore
+from app.timers import TimerHandle, TimerWheel
+from app.tracing import tracer
+from app.utterance_pool import UtterancePool
 from app.utils import clamp_text, pick_next_speaker, seat_labels
 
+logger = logging.getLogger(__name__)
+
 PASS_MESSAGES: list[str] = [
     "잠깐 다른 일 했어. 다시 이어가자.",
     "미안, 잠깐 자리 비웠어. 계속하자.",
@@ -28,273 +49,956 @@ PASS_MESSAGES: list[str] = [
 SPEAKER_FALLBACK = "음… 잠깐 생각이 끊겼네. 너는 어떻게 생각해?"
 JUDGE_FALLBACK = "PICK=A CONF=0.5 WHY=판단 근거가 부족함"
 
+SPECULATION_DRAFTS = registry.counter("speculation_drafts_total", "Speculative speaker drafts by outcome (hit/miss/error/pool)")
+SPECULATION_WASTED_TOKENS = registry.counter("speculation_wasted_tokens_total", "Tokens spent on discarded speculative drafts")
+SESSION_CACHE_LOOKUPS = registry.counter("session_cache_lookups_total", "In-process session state lookups by result (hit/miss)")
+SESSIONS_REAPED = registry.counter("orchestrator_sessions_reaped_total", "Per-session orchestrator state released, by reason (finished/idle)")
+LIVE_ENTRIES = registry.gauge("orchestrator_live_entries", "Per-session orchestrator entries currently held, by kind")
+SESSIONS_RECOVERED = registry.counter("sessions_recovered_total", "Sessions resumed by the startup recovery pass, by kind (human/llm/judging/skipped)")
+SESSION_LEASES = registry.counter("session_lease_events_total", "Session ownership lease outcomes (acquired/contended/lost/error/expired)")
+LLM_FALLBACKS = registry.counter("llm_fallbacks_total", "LLM results replaced after an error, by kind (speaker/judge) and source (pool/canned)")
+LOCK_WAIT = registry.histogram("orchestrator_lock_wait_seconds", "Time spent waiting for a per-session lock, by call site")
+LOCK_HOLD = registry.histogram("orchestrator_lock_hold_seconds", "Time a per-session lock was held, by call site")
+TURN_GAP = registry.histogram("turn_gap_seconds", "Time between consecutive committed turns of a session, by speaker type", buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0))
+BROADCAST_FANOUT = registry.histogram("broadcast_fanout_sockets", "Local sockets a session frame was offered to", buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000))
+BROADCAST_PUBLISH = registry.histogram("broadcast_publish_seconds", "Backplane publish latency for session events, by outcome (ok/error)")
+SESSIONS_BY_STATUS = registry.gauge("orchestrator_sessions", "Cached session states by status")
+CONNECTED_SOCKETS = registry.gauge("orchestrator_connected_sockets", "Client sockets registered with this worker")
+ENGINE_TASKS_ALIVE = registry.gauge("orchestrator_engine_tasks_alive", "Session engine tasks that have not finished")
+PENDING_TIMEOUTS = registry.gauge("orchestrator_pending_timeouts", "Human turn timeouts still scheduled")
+SESSION_STATUSES = ("LOBBY", "IN_PROGRESS", "JUDGING", "FINISHED")
+INSPECT_SORT_KEYS = ("secs_since_last_turn", "secs_since_activity", "lock_held_secs", "lock_waiters", "clients", "pending_llm_calls", "turn_index")
+
 
 class GameOrchestrator:
-    def __init__(self, store: SQLiteStore, llm_client: LLMClient):
+    def __init__(self, store: AsyncSQLiteStore, llm_client: LLMClient, backplane: Backplane | None = None):
         self.store = store
         self.llm = llm_client
+        self.backplane = backplane or InProcessBackplane()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._owned: set[str] = set()
+        self._subscriptions: dict[str, Callable[[str], None]] = {}
+        self._background: set[asyncio.Task] = set()
         self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
-        self._connected_clients: dict[str, dict[str, WebSocket]] = defaultdict(dict)
-        self._timeout_tasks: dict[str, asyncio.Task] = {}
+        self._connected_clients: dict[str, dict[str, ClientConnection]] = defaultdict(dict)
+        self._timers = TimerWheel(settings.timer_tick_secs, settings.timer_wheel_slots)
+        self._timeouts: dict[str, TimerHandle] = {}
         self._engine_tasks: dict[str, asyncio.Task] = {}
+        self._speculations: dict[str, dict] = {}
+        self._pools: dict[str, UtterancePool] = {}
+        self._pool_refills: dict[str, asyncio.Task] = {}
+        self._last_activity: dict[str, float] = {}
+        self._last_turn_at: dict[str, float] = {}
+        self._lock_held_since: dict[str, float] = {}
+        self._lock_waiters: dict[str, int] = {}
+        self._llm_pending: dict[str, int] = {}
+        self._reaper_task: asyncio.Task | None = None
+        self._lease_task: asyncio.Task | None = None
+        self._lease_renewed: dict[str, float] = {}
+        self._recovery_task: asyncio.Task | None = None
+        self._sessions = SessionCache(settings.session_cache_max_entries)
+        self._judges = JudgeWorkerPool(self._judge_session, settings.judge_workers, settings.judge_queue_max)
         self.rng = random.Random()
 
-    def create_session(self, topic: str, num_llm_speakers: int, turns_per_speaker: int, max_chars: int, difficulty: str) -> str:
+    async def start(self):
+        await self.backplane.start()
+        registry.add_collector(self.collect_metrics)
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper())
+        if self._lease_task is None or self._lease_task.done():
+            self._lease_task = asyncio.create_task(self._lease_keeper())
+        if settings.recovery_on_startup and self._recovery_task is None:
+            self._recovery_task = asyncio.create_task(self.recover())
+
+    async def aclose(self):
+        registry.remove_collector(self.collect_metrics)
+        for task in (self._recovery_task, self._reaper_task, self._lease_task, *self._background, *self._pool_refills.values()):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._recovery_task = self._reaper_task = self._lease_task = None
+        await self._judges.aclose()
+        await self._timers.aclose()
+        for session_id in list(self._owned):
+            self._disown(session_id)
+            await self.store.release_lease(session_id, self.worker_id)
+        await self.backplane.aclose()
+
+    async def recover(self) -> int:
+        rows = await self.store.load_live_sessions(difficulty_to_window("hard"))
+        recovered, contended = await self._recover_rows(rows)
+        if contended:
+            await asyncio.sleep(settings.session_lease_ttl_secs)
+            retried, _ = await self._recover_rows(contended)
+            recovered += retried
+        return recovered
+
+    async def _recover_rows(self, rows: list[dict]) -> tuple[int, list[dict]]:
+        interval = 1 / settings.recovery_engines_per_sec if settings.recovery_engines_per_sec > 0 else 0
+        recovered, contended = 0, []
+        for row in rows:
+            session_id = row["session"]["id"]
+            task = self._engine_tasks.get(session_id)
+            if task and not task.done():
+                continue
+            if not await self._claim(session_id):
+                SESSIONS_RECOVERED.inc(kind="skipped")
+                contended.append(row)
+                continue
+            state = self._sessions.peek(session_id)
+            if state is None:
+                state = SessionState(row["session"], row["participants"], row["messages"])
+                self._sessions.put(state)
+            seat = state.turn_state.get("current_speaker_seat")
+            paced = True
+            if state.session["status"] == "JUDGING":
+                kind = "judging"
+            elif seat is not None and state.participants[seat]["type"] == "human":
+                kind = "human"
+                deadline = state.turn_state.get("human_deadline")
+                if deadline is None:
+                    turn_state = state.copy_turn_state()
+                    deadline = turn_state["human_deadline"] = (
+                        datetime.fromisoformat(state.session["updated_at"]).timestamp() + settings.human_turn_timeout_secs
+                    )
+                    async with self._locked(session_id, "recover"):
+                        await self._write_turn_state(state, turn_state)
+                paced = deadline <= time.time()
+            else:
+                kind = "llm"
+            self._touch(session_id)
+            self.ensure_engine(session_id)
+            SESSIONS_RECOVERED.inc(kind=kind)
+            recovered += 1
+            if paced and interval:
+                await asyncio.sleep(interval)
+        return recovered, contended
+
+    async def create_session(self, topic: str, num_llm_speakers: int, turns_per_speaker: int, max_chars: int, difficulty: str) -> str:
         seats = seat_labels(num_llm_speakers)
         turn_counts = {seat: 0 for seat in seats}
         turn_state = {"current_speaker_seat": None, "turn_counts": turn_counts, "turn_index": 0}
-        session_id = self.store.create_session(topic, turns_per_speaker, max_chars, difficulty, turn_state, config={})
-        self.store.add_participant(session_id, "A", "human")
+        session_id = await self.store.create_session(topic, turns_per_speaker, max_chars, difficulty, turn_state, config={})
+        await self.store.add_participant(session_id, "A", "human")
         for seat in seats[1:]:
-            self.store.add_participant(session_id, seat, "llm_speaker", persona_id=pick_persona(self.rng))
-        self.store.add_participant(session_id, "J", "judge")
+            await self.store.add_participant(session_id, seat, "llm_speaker", persona_id=pick_persona(self.rng))
+        await self.store.add_participant(session_id, "J", "judge")
+        if settings.utterance_pool_enabled:
+            self._refill_pool(session_id)
         return session_id
 
-    def _get_turn_state(self, session: dict) -> dict:
-        return json.loads(session["turn_state_json"])
+    async def _load_state(self, session_id: str, cache: bool = True) -> SessionState | None:
+        state = self._sessions.get(session_id)
+        if state is not None:
+            SESSION_CACHE_LOOKUPS.inc(result="hit")
+            return state
+        SESSION_CACHE_LOOKUPS.inc(result="miss")
+        session = await self.store.get_session(session_id)
+        if not session:
+            return None
+        participants = await self.store.list_participants(session_id)
+        messages = await self.store.list_recent_messages(session_id, difficulty_to_window(session["difficulty"]))
+        cached = self._sessions.get(session_id)
+        if cached is not None:
+            return cached
+        state = SessionState(session, participants, messages)
+        if cache and session["status"] != "FINISHED":
+            self._sessions.put(state)
+        return state
+
+    async def _write_turn_state(self, state: SessionState, turn_state: dict):
+        await self.store.update_session(state.session_id, turn_state=turn_state)
+        state.turn_state = turn_state
 
-    def _public_participants(self, session_id: str):
-        return [{"seat": p["seat"]} for p in self.store.list_participants(session_id) if p["type"] != "judge"]
+    async def _write_status(self, state: SessionState, status: str):
+        await self.store.update_session(state.session_id, status=status)
+        state.session["status"] = status
+        if status == "FINISHED":
+            self._sessions.invalidate(state.session_id)
 
-    def session_snapshot(self, session_id: str) -> dict:
-        session = self.store.get_session(session_id)
-        if not session:
+    def _public_participants(self, state: SessionState):
+        return [{"seat": p["seat"]} for p in state.participants.values() if p["type"] != "judge"]
+
+    async def session_snapshot(self, session_id: str) -> dict:
+        state = await self._load_state(session_id, cache=False)
+        if not state:
             raise ValueError("session not found")
-        turn_state = self._get_turn_state(session)
+        session = state.session
+        turn_state = state.turn_state
         return {
             "type": "session.state",
             "session_id": session_id,
             "status": session["status"],
             "topic": session["topic"],
-            "participants": self._public_participants(session_id),
+            "participants": self._public_participants(state),
             "turns_per_speaker": session["turns_per_speaker"],
             "turn_counts": turn_state["turn_counts"],
             "current_speaker_seat": turn_state.get("current_speaker_seat"),
             "max_chars": session["max_chars"],
         }
 
-    async def register_client(self, session_id: str, client_id: str, websocket: WebSocket):
-        async with self._locks[session_id]:
+    async def register_client(
+        self, session_id: str, client_id: str, websocket: WebSocket, after_turn_index: int | None = None, paused: bool = False
+    ) -> ClientConnection:
+        self._touch(session_id)
+        async with self._locked(session_id, "register_client"):
+            state = await self._load_state(session_id)
+            if after_turn_index is None:
+                after_turn_index = state.turn_state["turn_index"] if state else 0
             old = self._connected_clients[session_id].get(client_id)
-            self._connected_clients[session_id][client_id] = websocket
-            if old and old is not websocket:
-                await old.close(code=1000)
+            conn = self._connected_clients[session_id][client_id] = ClientConnection(
+                websocket,
+                max_queue=settings.broadcast_queue_max,
+                slow_consumer_policy=settings.broadcast_slow_consumer_policy,
+                last_turn_index=after_turn_index,
+                on_catch_up=lambda conn: self._catch_up_client(session_id, conn),
+                on_dead=lambda conn: self._drop_client(session_id, client_id, conn),
+                paused=paused,
+            )
+            if old:
+                await old.close(code=1000 if old.websocket is not websocket else None)
+            self._subscribe(self._events_channel(session_id), partial(self._on_event, session_id))
+        return conn
 
     async def unregister_client(self, session_id: str, client_id: str, websocket: WebSocket):
-        async with self._locks[session_id]:
-            current = self._connected_clients[session_id].get(client_id)
-            if current is websocket:
-                self._connected_clients[session_id].pop(client_id, None)
+        self._touch(session_id)
+        async with self._locked(session_id, "unregister_client"):
+            clients = self._connected_clients.get(session_id, {})
+            current = clients.get(client_id)
+            if current and current.websocket is websocket:
+                clients.pop(client_id, None)
+                await current.close()
+        self._reap_if_finished(session_id)
+
+    def _drop_client(self, session_id: str, client_id: str, conn: ClientConnection):
+        clients = self._connected_clients.get(session_id)
+        if clients and clients.get(client_id) is conn:
+            clients.pop(client_id, None)
 
     async def _broadcast(self, session_id: str, payload: dict):
-        dead = []
-        for client_id, ws in self._connected_clients[session_id].items():
+        text = serialize(payload)
+        turn_index = payload["turn_index"] if payload["type"] == "message.new" else None
+        started = time.perf_counter()
+        with tracer.span("broadcast", event=payload["type"], bytes=len(text)):
             try:
-                await ws.send_json(payload)
+                await self.backplane.publish(self._events_channel(session_id), f"{self.worker_id}|{'' if turn_index is None else turn_index}|{text}")
             except Exception:
-                dead.append(client_id)
-        for client_id in dead:
-            self._connected_clients[session_id].pop(client_id, None)
+                BROADCAST_PUBLISH.observe(time.perf_counter() - started, outcome="error")
+                self._deliver(session_id, text, turn_index)
+            else:
+                BROADCAST_PUBLISH.observe(time.perf_counter() - started, outcome="ok")
+
+    def _on_event(self, session_id: str, envelope: str):
+        origin, turn_index, text = envelope.split("|", 2)
+        if origin != self.worker_id:
+            self._sessions.invalidate(session_id)
+        self._deliver(session_id, text, int(turn_index) if turn_index else None)
+
+    def _deliver(self, session_id: str, text: str, turn_index: int | None):
+        conns = list(self._connected_clients.get(session_id, {}).values())
+        BROADCAST_FANOUT.observe(len(conns))
+        tracer.current().set_attribute("fanout", len(conns))
+        for conn in conns:
+            conn.offer(text, turn_index)
+
+    def _on_command(self, session_id: str, message: str):
+        command = json.loads(message)
+        if command["type"] == "human.message":
+            self._spawn(self.handle_human_message(session_id, command["client_id"], command["text"]))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _events_channel(self, session_id: str) -> str:
+        return f"session:{session_id}:events"
+
+    def _commands_channel(self, session_id: str) -> str:
+        return f"session:{session_id}:commands"
+
+    def _subscribe(self, channel: str, handler: Callable[[str], None]):
+        if channel not in self._subscriptions:
+            self._subscriptions[channel] = handler
+            self.backplane.subscribe(channel, handler)
+
+    def _unsubscribe(self, channel: str):
+        handler = self._subscriptions.pop(channel, None)
+        if handler is not None:
+            self.backplane.unsubscribe(channel, handler)
+
+    async def _claim(self, session_id: str) -> bool:
+        if session_id in self._owned:
+            return True
+        started = asyncio.get_running_loop().time()
+        if not await self.store.acquire_lease(session_id, self.worker_id, settings.session_lease_ttl_secs):
+            SESSION_LEASES.inc(outcome="contended")
+            return False
+        SESSION_LEASES.inc(outcome="acquired")
+        self._owned.add(session_id)
+        self._lease_renewed[session_id] = started
+        self._subscribe(self._commands_channel(session_id), partial(self._on_command, session_id))
+        return True
+
+    def _disown(self, session_id: str):
+        self._owned.discard(session_id)
+        self._lease_renewed.pop(session_id, None)
+        self._unsubscribe(self._commands_channel(session_id))
+        task = self._engine_tasks.pop(session_id, None)
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+        self._cancel_timeout(session_id)
+        self._discard_speculation(self._speculations.pop(session_id, None))
+        self._pools.pop(session_id, None)
+        refill = self._pool_refills.pop(session_id, None)
+        if refill and not refill.done():
+            refill.cancel()
+        self._sessions.invalidate(session_id)
+
+    async def _lease_keeper(self):
+        while True:
+            await asyncio.sleep(settings.session_lease_ttl_secs / 3)
+            try:
+                await self._renew_leases()
+            except Exception:
+                logger.exception("lease renewal pass failed")
+
+    async def _renew_leases(self):
+        ttl = settings.session_lease_ttl_secs
+        for session_id in list(self._owned):
+            started = asyncio.get_running_loop().time()
+            try:
+                renewed = await self.store.acquire_lease(session_id, self.worker_id, ttl)
+            except Exception:
+                SESSION_LEASES.inc(outcome="error")
+                logger.warning("lease renewal failed for session %s", session_id, exc_info=True)
+                if started + ttl / 3 - self._lease_renewed.get(session_id, started) >= ttl and session_id in self._owned:
+                    SESSION_LEASES.inc(outcome="expired")
+                    self._disown(session_id)
+                continue
+            if not renewed:
+                SESSION_LEASES.inc(outcome="lost")
+                self._disown(session_id)
+            elif session_id in self._owned:
+                self._lease_renewed[session_id] = started
+        for session_id, clients in list(self._connected_clients.items()):
+            if clients and session_id not in self._owned:
+                self.ensure_engine(session_id)
+
+    async def _catch_up_client(self, session_id: str, conn: ClientConnection):
+        await conn.send_now(serialize(await self.session_snapshot(session_id)))
+        for m in await self.store.list_messages_after(session_id, conn.last_turn_index):
+            await conn.send_now(
+                serialize({"type": "message.new", "message_id": m["id"], "turn_index": m["turn_index"], "seat": m["seat"], "text": m["text"]}),
+                m["turn_index"],
+            )
+
+    def _touch(self, session_id: str):
+        self._last_activity[session_id] = asyncio.get_running_loop().time()
+
+    def _reap_if_finished(self, session_id: str):
+        if self._finished(session_id):
+            self._reap(session_id, "finished")
+
+    def _finished(self, session_id: str) -> bool:
+        state = self._sessions.peek(session_id)
+        if state is not None:
+            return state.session["status"] == "FINISHED"
+        if session_id in self._judges.pending:
+            return False
+        return not any(task and not task.done() for task in (self._engine_tasks.get(session_id), self._timeouts.get(session_id)))
+
+    def _reap(self, session_id: str, reason: str) -> bool:
+        lock = self._locks.get(session_id)
+        if lock is not None and (lock.locked() or self._lock_waiters.get(session_id)):
+            return False
+        if self._connected_clients.get(session_id):
+            return False
+        if reason == "idle" and session_id in self._judges.pending:
+            return False
+        if session_id in self._owned:
+            self._spawn(self.store.release_lease(session_id, self.worker_id))
+        self._disown(session_id)
+        self._unsubscribe(self._events_channel(session_id))
+        self._locks.pop(session_id, None)
+        self._connected_clients.pop(session_id, None)
+        self._last_activity.pop(session_id, None)
+        self._last_turn_at.pop(session_id, None)
+        SESSIONS_REAPED.inc(reason=reason)
+        return True
+
+    def _sweep(self, now: float):
+        known = set(self._locks) | set(self._connected_clients) | set(self._engine_tasks) | set(self._timeouts) | set(self._last_activity) | self._owned
+        for session_id in known:
+            if self._connected_clients.get(session_id) or session_id in self._judges.pending:
+                continue
+            if self._finished(session_id):
+                self._reap(session_id, "finished")
+            elif now - self._last_activity.setdefault(session_id, now) >= settings.session_idle_ttl_secs:
+                self._reap(session_id, "idle")
+        self._update_live_gauges()
+
+    def _update_live_gauges(self):
+        for kind, entries in (
+            ("locks", self._locks),
+            ("clients", self._connected_clients),
+            ("engine_tasks", self._engine_tasks),
+            ("timeouts", self._timeouts),
+            ("speculations", self._speculations),
+            ("utterance_pools", self._pools),
+            ("activity", self._last_activity),
+            ("turn_clocks", self._last_turn_at),
+            ("llm_pending", self._llm_pending),
+            ("session_cache", self._sessions),
+            ("owned_leases", self._owned),
+            ("subscriptions", self._subscriptions),
+        ):
+            LIVE_ENTRIES.set(len(entries), kind=kind)
+
+    def collect_metrics(self):
+        counts = dict.fromkeys(SESSION_STATUSES, 0)
+        for state in self._sessions.values():
+            counts[state.session["status"]] = counts.get(state.session["status"], 0) + 1
+        for status, count in counts.items():
+            SESSIONS_BY_STATUS.set(count, status=status)
+        CONNECTED_SOCKETS.set(sum(len(clients) for clients in self._connected_clients.values()))
+        ENGINE_TASKS_ALIVE.set(sum(1 for task in self._engine_tasks.values() if not task.done()))
+        PENDING_TIMEOUTS.set(sum(1 for handle in self._timeouts.values() if not handle.done()))
+        self._update_live_gauges()
+
+    @contextmanager
+    def _llm_call(self, session_id: str):
+        self._llm_pending[session_id] = self._llm_pending.get(session_id, 0) + 1
+        try:
+            yield
+        finally:
+            left = self._llm_pending[session_id] - 1
+            if left:
+                self._llm_pending[session_id] = left
+            else:
+                del self._llm_pending[session_id]
+
+    def inspect_sessions(
+        self,
+        *,
+        statuses: set[str] | None = None,
+        stuck: bool | None = None,
+        owned: bool | None = None,
+        sort: str = "secs_since_last_turn",
+        descending: bool = True,
+    ) -> list[dict]:
+        if sort not in INSPECT_SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(INSPECT_SORT_KEYS)}")
+        cached = {state.session_id: state for state in self._sessions.values()}
+        known = (
+            set(cached)
+            | set(self._locks)
+            | set(self._connected_clients)
+            | set(self._engine_tasks)
+            | set(self._timeouts)
+            | set(self._last_activity)
+            | set(self._llm_pending)
+            | self._owned
+            | self._judges.pending
+        )
+        now = asyncio.get_running_loop().time()
+        rows = [self._inspect(session_id, cached.get(session_id), now) for session_id in known]
+        rows = [
+            row
+            for row in rows
+            if (statuses is None or row["status"] in statuses) and (stuck is None or row["stuck"] == stuck) and (owned is None or row["owned"] == owned)
+        ]
+        present = [row for row in rows if row[sort] is not None]
+        present.sort(key=lambda row: row[sort], reverse=descending)
+        return present + [row for row in rows if row[sort] is None]
+
+    def _inspect(self, session_id: str, state: SessionState | None, now: float) -> dict:
+        turn_state = state.turn_state if state is not None else {}
+        status = state.session["status"] if state is not None else None
+        engine = self._engine_tasks.get(session_id)
+        timeout = self._timeouts.get(session_id)
+        held_since = self._lock_held_since.get(session_id)
+        last_turn = self._last_turn_at.get(session_id)
+        last_activity = self._last_activity.get(session_id)
+        speculation = self._speculations.get(session_id)
+        refill = self._pool_refills.get(session_id)
+        engine_alive = engine is not None and not engine.done()
+        timeout_alive = timeout is not None and not timeout.done()
+        judge_queued = session_id in self._judges.pending
+        owned = session_id in self._owned
+        engine_error = None
+        if engine is not None and engine.done() and not engine.cancelled() and engine.exception() is not None:
+            engine_error = repr(engine.exception())
+        return {
+            "session_id": session_id,
+            "status": status,
+            "current_speaker_seat": turn_state.get("current_speaker_seat"),
+            "turn_index": turn_state.get("turn_index"),
+            "owned": owned,
+            "engine_alive": engine_alive,
+            "engine_error": engine_error,
+            "timeout_alive": timeout_alive,
+            "human_deadline": turn_state.get("human_deadline"),
+            "judge_queued": judge_queued,
+            "secs_since_last_turn": None if last_turn is None else now - last_turn,
+            "secs_since_activity": None if last_activity is None else now - last_activity,
+            "clients": len(self._connected_clients.get(session_id, ())),
+            "pending_llm_calls": self._llm_pending.get(session_id, 0) + (speculation is not None and not speculation["task"].done()),
+            "pool_refilling": refill is not None and not refill.done(),
+            "lock_held_secs": None if held_since is None else now - held_since,
+            "lock_waiters": self._lock_waiters.get(session_id, 0),
+            "stuck": owned
+            and not engine_alive
+            and ((status == "IN_PROGRESS" and not timeout_alive) or (status == "JUDGING" and not judge_queued)),
+        }
+
+    @asynccontextmanager
+    async def _locked(self, session_id: str, site: str):
+        lock = self._locks[session_id]
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if lock.locked():
+            self._lock_waiters[session_id] = self._lock_waiters.get(session_id, 0) + 1
+            try:
+                with tracer.span("lock.wait", site=site):
+                    await lock.acquire()
+            finally:
+                left = self._lock_waiters[session_id] - 1
+                if left:
+                    self._lock_waiters[session_id] = left
+                else:
+                    del self._lock_waiters[session_id]
+        else:
+            await lock.acquire()
+        acquired = loop.time()
+        LOCK_WAIT.observe(acquired - started, site=site)
+        self._lock_held_since[session_id] = acquired
+        try:
+            yield
+        finally:
+            self._lock_held_since.pop(session_id, None)
+            lock.release()
+            LOCK_HOLD.observe(loop.time() - acquired, site=site)
+
+    async def _reaper(self):
+        while True:
+            await asyncio.sleep(settings.session_reap_interval_secs)
+            self._sweep(asyncio.get_running_loop().time())
 
     def ensure_engine(self, session_id: str):
         task = self._engine_tasks.get(session_id)
         if task and not task.done():
             return
+        if task and (task.cancelled() or task.exception() is not None):
+            self._sessions.invalidate(session_id)
         self._engine_tasks[session_id] = asyncio.create_task(self._run_loop(session_id))
 
     async def _run_loop(self, session_id: str):
+        if session_id not in self._owned:
+            async with self._locked(session_id, "run_loop"):
+                state = await self._load_state(session_id)
+            if not state or state.session["status"] == "FINISHED" or not await self._claim(session_id):
+                return
         while True:
-            async with self._locks[session_id]:
-                session = self.store.get_session(session_id)
-                if not session:
+            with tracer.span("engine.step", root=True, session_id=session_id) as span:
+                async with self._locked(session_id, "run_loop"):
+                    state = await self._load_state(session_id)
+                    if not state:
+                        return
+                    session = state.session
+                    status = session["status"]
+                    turn_state = state.copy_turn_state()
+                    if status == "LOBBY":
+                        await self._write_status(state, "IN_PROGRESS")
+                        status = "IN_PROGRESS"
+                    if status == "FINISHED":
+                        return
+                    if status == "JUDGING":
+                        break
+
+                    if turn_state.get("current_speaker_seat") is None:
+                        nxt = turn_state.pop("next_speaker_seat", None) or pick_next_speaker(
+                            turn_state["turn_counts"], session["turns_per_speaker"], self.rng
+                        )
+                        if nxt is None:
+                            await self._write_status(state, "JUDGING")
+                            continue
+                        turn_state["current_speaker_seat"] = nxt
+                        await self._write_turn_state(state, turn_state)
+                        await self._broadcast(session_id, await self.session_snapshot(session_id))
+
+                    current = turn_state["current_speaker_seat"]
+                    span.set_attribute("seat", current)
+                    span.set_attribute("turn_index", turn_state["turn_index"])
+                    if state.participants[current]["type"] == "human":
+                        deadline = turn_state.get("human_deadline")
+                        if deadline is None:
+                            deadline = turn_state["human_deadline"] = time.time() + settings.human_turn_timeout_secs
+                            await self._write_turn_state(state, turn_state)
+                        await self._broadcast(
+                            session_id,
+                            {
+                                "type": "turn.request_human",
+                                "current_speaker_seat": current,
+                                "max_chars": session["max_chars"],
+                                "timeout_secs": max(math.ceil(deadline - time.time()), 0),
+                            },
+                        )
+                        self._schedule_timeout(session_id, deadline)
+                        return
+                await self._run_llm_turn(session_id)
+        await self._judges.submit(session_id)
+
+    def _schedule_timeout(self, session_id: str, deadline: float):
+        self._cancel_timeout(session_id)
+        self._timeouts[session_id] = self._timers.call_later(deadline - time.time(), partial(self.handle_timeout_pass, session_id, deadline))
+
+    def _cancel_timeout(self, session_id: str):
+        handle = self._timeouts.pop(session_id, None)
+        if handle is not None:
+            handle.cancel()
+
+    async def _run_llm_turn(self, session_id: str):
+        with tracer.span("turn.llm", session_id=session_id) as span:
+            async with self._locked(session_id, "run_llm_turn"):
+                state = await self._load_state(session_id)
+                if not state or state.session["status"] != "IN_PROGRESS":
                     return
-                status = session["status"]
-                turn_state = self._get_turn_state(session)
-                if status == "LOBBY":
-                    self.store.update_session(session_id, status="IN_PROGRESS")
-                    status = "IN_PROGRESS"
-                if status == "FINISHED":
+                session = state.session
+                turn_state = state.copy_turn_state()
+                seat = turn_state["current_speaker_seat"]
+                p_map = state.participants
+                if p_map[seat]["type"] != "llm_speaker":
                     return
-                if status == "JUDGING":
-                    await self._run_judge_locked(session_id, session, turn_state)
+                span.set_attribute("seat", seat)
+                span.set_attribute("turn_index", turn_state["turn_index"] + 1)
+                payload_messages = list(state.recent_messages)
+                prompt = build_speaker_messages(
+                    topic=session["topic"],
+                    seat=seat,
+                    persona=p_map[seat]["persona_id"] or "평범함",
+                    messages=payload_messages,
+                    difficulty=session["difficulty"],
+                )
+            draft, waited = await self._take_speculation(
+                session_id, seat, turn_state["turn_index"], self._speaker_window(payload_messages, session["difficulty"])
+            )
+            budget = max(settings.llm_speaker_deadline_secs - waited, 0.0) if settings.llm_speaker_deadline_secs else None
+            if draft is None and budget is not None and budget < settings.llm_retry_min_attempt_secs:
+                draft = self._fallback_text(session_id, seat, turn_state["turn_index"])
+            if draft is not None:
+                await self._broadcast(session_id, {"type": "message.typing", "seat": seat})
+                clamped = clamp_text(draft, session["max_chars"])
+                delay = self._typing_delay(clamped)
+            elif settings.llm_stream_speaker:
+                await self._broadcast(session_id, {"type": "message.typing", "seat": seat})
+                started = asyncio.get_running_loop().time()
+                text = await self._stream_speaker_text(session_id, seat, turn_state["turn_index"] + 1, prompt, session["max_chars"], budget)
+                clamped = clamp_text(text, session["max_chars"])
+                delay = self._typing_delay(clamped) - (asyncio.get_running_loop().time() - started)
+            else:
+                try:
+                    with self._llm_call(session_id):
+                        _, text = await self._race_pool(
+                            session_id,
+                            seat,
+                            turn_state["turn_index"],
+                            self.llm.chat(
+                                model=settings.llm_model_speaker,
+                                messages=prompt,
+                                temperature=settings.llm_temperature_speaker,
+                                max_tokens=settings.llm_max_tokens_speaker,
+                                priority=self._speaker_priority(session_id),
+                                budget_secs=budget,
+                            ),
+                        )
+                except Exception:
+                    text = self._fallback_text(session_id, seat, turn_state["turn_index"])
+                await self._broadcast(session_id, {"type": "message.typing", "seat": seat})
+                clamped = clamp_text(text, session["max_chars"])
+                delay = self._typing_delay(clamped)
+            nxt = self._pick_after(turn_state, seat, session["turns_per_speaker"])
+            if settings.speculative_generation and nxt is not None and p_map[nxt]["type"] == "llm_speaker":
+                self._start_speculation(session_id, session, nxt, p_map[nxt], [*payload_messages, {"seat": seat, "text": clamped}])
+            if delay > 0:
+                with tracer.span("typing_delay", secs=delay):
+                    await self._timers.sleep(delay)
+            async with self._locked(session_id, "run_llm_turn"):
+                state = await self._load_state(session_id)
+                if not state or state.session["status"] != "IN_PROGRESS":
                     return
-
-                if turn_state.get("current_speaker_seat") is None:
-                    nxt = pick_next_speaker(turn_state["turn_counts"], session["turns_per_speaker"], self.rng)
-                    if nxt is None:
-                        self.store.update_session(session_id, status="JUDGING")
-                        continue
-                    turn_state["current_speaker_seat"] = nxt
-                    self.store.update_session(session_id, turn_state=turn_state)
-                    await self._broadcast(session_id, self.session_snapshot(session_id))
-
-                current = turn_state["current_speaker_seat"]
-                p_map = {p["seat"]: p for p in self.store.list_participants(session_id)}
-                if p_map[current]["type"] == "human":
-                    await self._broadcast(
-                        session_id,
-                        {
-                            "type": "turn.request_human",
-                            "current_speaker_seat": current,
-                            "max_chars": session["max_chars"],
-                            "timeout_secs": settings.human_turn_timeout_secs,
-                        },
-                    )
-                    self._schedule_timeout(session_id)
+                turn_state = state.copy_turn_state()
+                if turn_state.get("current_speaker_seat") != seat:
                     return
-            await self._run_llm_turn(session_id)
+                await self._commit_message_locked(state, turn_state, seat, clamped, nxt)
+        self.ensure_engine(session_id)
 
-    def _schedule_timeout(self, session_id: str):
-        task = self._timeout_tasks.get(session_id)
-        if task and not task.done():
-            task.cancel()
-        self._timeout_tasks[session_id] = asyncio.create_task(self._timeout_worker(session_id))
+    def _speaker_priority(self, session_id: str) -> LLMPriority:
+        return LLMPriority.INTERACTIVE if self._connected_clients.get(session_id) else LLMPriority.BACKGROUND
 
-    async def _timeout_worker(self, session_id: str):
+    def _typing_delay(self, text: str) -> float:
+        return min(max(len(text) * settings.typing_delay_per_char, settings.typing_delay_min_secs), settings.typing_delay_max_secs)
+
+    async def _stream_speaker_text(
+        self, session_id: str, seat: str, turn_index: int, prompt: list[dict], max_chars: int, budget_secs: float | None
+    ) -> str:
+        text, shown = "", ""
+        try:
+            with self._llm_call(session_id):
+                async with aclosing(
+                    self.llm.chat_stream(
+                        model=settings.llm_model_speaker,
+                        messages=prompt,
+                        temperature=settings.llm_temperature_speaker,
+                        max_tokens=settings.llm_max_tokens_speaker,
+                        priority=self._speaker_priority(session_id),
+                        budget_secs=budget_secs,
+                    )
+                ) as stream:
+                    pooled, delta = await self._race_pool(session_id, seat, turn_index - 1, anext(stream, None))
+                    if pooled:
+                        return delta
+                    while delta is not None:
+                        text += delta
+                        visible = clamp_text(text, max_chars)
+                        if len(visible) > len(shown):
+                            await self._broadcast(
+                                session_id,
+                                {"type": "message.delta", "turn_index": turn_index, "seat": seat, "text": visible[len(shown) :]},
+                            )
+                            shown = visible
+                        if len(shown) >= max_chars:
+                            break
+                        delta = await anext(stream, None)
+        except Exception:
+            pass
+        return text if text.strip() else self._fallback_text(session_id, seat, turn_index - 1)
+
+    async def _race_pool(self, session_id: str, seat: str, turn_index: int, aw) -> tuple[bool, object]:
+        task = asyncio.ensure_future(aw)
+        pool = self._pools.get(session_id)
         try:
-            await asyncio.sleep(settings.human_turn_timeout_secs)
+            if pool is not None and pool.size(seat):
+                done, _ = await asyncio.wait({task}, timeout=settings.utterance_pool_latency_budget_secs)
+                if not done:
+                    text = pool.draw(seat, turn_index, "budget")
+                    if text is not None:
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+                        return True, text
+            return False, await task
         except asyncio.CancelledError:
-            return
-        await self.handle_timeout_pass(session_id)
+            task.cancel()
+            raise
 
-    async def _run_llm_turn(self, session_id: str):
-        async with self._locks[session_id]:
-            session = self.store.get_session(session_id)
-            if not session or session["status"] != "IN_PROGRESS":
+    def _fallback_text(self, session_id: str, seat: str, turn_index: int) -> str:
+        pool = self._pools.get(session_id)
+        text = pool.draw(seat, turn_index, "error") if pool is not None else None
+        LLM_FALLBACKS.inc(kind="speaker", source="canned" if text is None else "pool")
+        return SPEAKER_FALLBACK if text is None else text
+
+    def _refill_pool(self, session_id: str):
+        task = self._pool_refills.get(session_id)
+        if task is None or task.done():
+            self._pools.setdefault(session_id, UtterancePool(settings.utterance_pool_max_per_seat, settings.utterance_pool_max_staleness_turns))
+            self._pool_refills[session_id] = asyncio.create_task(self._fill_pool(session_id))
+
+    async def _fill_pool(self, session_id: str):
+        async with self._locked(session_id, "fill_pool"):
+            state = await self._load_state(session_id)
+            if not state or state.session["status"] not in ("LOBBY", "IN_PROGRESS"):
                 return
-            turn_state = self._get_turn_state(session)
-            seat = turn_state["current_speaker_seat"]
-            p_map = {p["seat"]: p for p in self.store.list_participants(session_id)}
-            if p_map[seat]["type"] != "llm_speaker":
+            session = state.session
+            turn_index = state.turn_state["turn_index"]
+            messages = list(state.recent_messages)
+            seats = [(seat, p["persona_id"]) for seat, p in state.participants.items() if p["type"] == "llm_speaker"]
+        for seat, persona in seats:
+            pool = self._pools.get(session_id)
+            if pool is None:
                 return
-            messages = self.store.list_messages(session_id)
-            payload_messages = [
-                {"seat": m["seat"], "text": m["text"]}
-                for m in messages
-            ]
-            prompt = build_speaker_messages(
-                topic=session["topic"],
-                seat=seat,
-                persona=p_map[seat]["persona_id"] or "평범함",
-                messages=payload_messages,
-                difficulty=session["difficulty"],
-            )
-        try:
-            text = await self.llm.chat(
+            wanted = settings.utterance_pool_candidates - pool.size(seat)
+            if wanted <= 0:
+                continue
+            try:
+                with self._llm_call(session_id):
+                    texts = await self.llm.chat_candidates(
+                        model=settings.llm_model_speaker,
+                        messages=build_pool_messages(session["topic"], seat, persona or "평범함", messages, session["difficulty"]),
+                        temperature=settings.llm_temperature_speaker,
+                        max_tokens=settings.llm_max_tokens_speaker,
+                        n=wanted,
+                        priority=LLMPriority.BACKGROUND,
+                    )
+            except Exception:
+                continue
+            pool.add(seat, [clamp_text(text, session["max_chars"]) for text in texts], turn_index)
+
+    def _speaker_window(self, messages: list[dict], difficulty: str) -> tuple:
+        return tuple((m["seat"], m["text"]) for m in messages[-difficulty_to_window(difficulty) :])
+
+    def _start_speculation(self, session_id: str, session: dict, seat: str, participant: dict, messages: list[dict]):
+        self._discard_speculation(self._speculations.pop(session_id, None))
+        prompt = build_speaker_messages(
+            topic=session["topic"],
+            seat=seat,
+            persona=participant["persona_id"] or "평범함",
+            messages=messages,
+            difficulty=session["difficulty"],
+        )
+        usage: dict = {}
+        task = asyncio.create_task(
+            self.llm.chat(
                 model=settings.llm_model_speaker,
                 messages=prompt,
                 temperature=settings.llm_temperature_speaker,
                 max_tokens=settings.llm_max_tokens_speaker,
+                usage=usage,
+                priority=LLMPriority.BACKGROUND,
+                budget_secs=settings.llm_speaker_deadline_secs,
             )
+        )
+        self._speculations[session_id] = {
+            "seat": seat,
+            "window": self._speaker_window(messages, session["difficulty"]),
+            "task": task,
+            "usage": usage,
+        }
+
+    async def _take_speculation(self, session_id: str, seat: str, turn_index: int, window: tuple) -> tuple[str | None, float]:
+        spec = self._speculations.pop(session_id, None)
+        if spec is None:
+            return None, 0.0
+        if spec["seat"] != seat or spec["window"] != window:
+            SPECULATION_DRAFTS.inc(outcome="miss")
+            self._discard_speculation(spec)
+            return None, 0.0
+        started = asyncio.get_running_loop().time()
+        try:
+            with self._llm_call(session_id):
+                pooled, text = await self._race_pool(session_id, seat, turn_index, spec["task"])
         except Exception:
-            text = SPEAKER_FALLBACK
-
-        await self._broadcast(session_id, {"type": "message.typing", "seat": seat})
-        clamped = clamp_text(text, session["max_chars"])
-        delay = min(max(len(clamped) * settings.typing_delay_per_char, settings.typing_delay_min_secs), settings.typing_delay_max_secs)
-        await asyncio.sleep(delay)
-        async with self._locks[session_id]:
-            session = self.store.get_session(session_id)
-            if not session or session["status"] != "IN_PROGRESS":
-                return
-            turn_state = self._get_turn_state(session)
-            if turn_state.get("current_speaker_seat") != seat:
-                return
-            turn_state["turn_index"] += 1
-            turn_idx = turn_state["turn_index"]
-            msg_id = self.store.add_message(session_id, seat, turn_idx, clamped)
-            turn_state["turn_counts"][seat] += 1
-            turn_state["current_speaker_seat"] = None
-            self.store.update_session(session_id, turn_state=turn_state)
-            await self._broadcast(session_id, {"type": "message.new", "message_id": msg_id, "turn_index": turn_idx, "seat": seat, "text": clamped})
-            nxt = pick_next_speaker(turn_state["turn_counts"], session["turns_per_speaker"], self.rng)
-            if nxt is None:
-                self.store.update_session(session_id, status="JUDGING")
-            else:
-                await self._broadcast(session_id, {"type": "turn.next", "current_speaker_seat": nxt, "turn_counts": turn_state["turn_counts"]})
-        self.ensure_engine(session_id)
+            SPECULATION_DRAFTS.inc(outcome="error")
+            return None, asyncio.get_running_loop().time() - started
+        SPECULATION_DRAFTS.inc(outcome="pool" if pooled else "hit")
+        return text, asyncio.get_running_loop().time() - started
+
+    def _discard_speculation(self, spec: dict | None):
+        if spec is None:
+            return
+        task = spec["task"]
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            SPECULATION_WASTED_TOKENS.inc(spec["usage"].get("total_tokens", 0))
+
+    def _pick_after(self, turn_state: dict, seat: str, turns_per_speaker: int) -> str | None:
+        projected = dict(turn_state["turn_counts"])
+        projected[seat] += 1
+        return pick_next_speaker(projected, turns_per_speaker, self.rng)
+
+    async def _commit_message_locked(self, state: SessionState, turn_state: dict, seat: str, text: str, nxt: str | None):
+        session_id = state.session_id
+        turn_state["turn_index"] += 1
+        turn_idx = turn_state["turn_index"]
+        msg_id = await self.store.add_message(session_id, seat, turn_idx, text)
+        state.recent_messages.append({"seat": seat, "text": text})
+        turn_state["turn_counts"][seat] += 1
+        turn_state["current_speaker_seat"] = None
+        turn_state["next_speaker_seat"] = nxt
+        turn_state.pop("human_deadline", None)
+        await self._write_turn_state(state, turn_state)
+        now = asyncio.get_running_loop().time()
+        self._last_activity[session_id] = now
+        previous = self._last_turn_at.get(session_id)
+        self._last_turn_at[session_id] = now
+        if previous is not None:
+            TURN_GAP.observe(now - previous, seat_type=state.participants[seat]["type"])
+        await self._broadcast(session_id, {"type": "message.new", "message_id": msg_id, "turn_index": turn_idx, "seat": seat, "text": text})
+        if nxt is None:
+            await self._write_status(state, "JUDGING")
+        else:
+            await self._broadcast(session_id, {"type": "turn.next", "current_speaker_seat": nxt, "turn_counts": turn_state["turn_counts"]})
+            if settings.utterance_pool_enabled and turn_idx % len(turn_state["turn_counts"]) == 0:
+                self._refill_pool(session_id)
 
     async def handle_human_message(self, session_id: str, client_id: str, text: str):
-        del client_id
-        async with self._locks[session_id]:
-            session = self.store.get_session(session_id)
-            if not session or session["status"] != "IN_PROGRESS":
-                return
-            turn_state = self._get_turn_state(session)
-            seat = turn_state.get("current_speaker_seat")
-            if seat != "A":
-                return
-            task = self._timeout_tasks.get(session_id)
-            if task and not task.done():
-                task.cancel()
-            clamped = clamp_text(text, session["max_chars"])
-            turn_state["turn_index"] += 1
-            turn_idx = turn_state["turn_index"]
-            msg_id = self.store.add_message(session_id, seat, turn_idx, clamped)
-            turn_state["turn_counts"][seat] += 1
-            turn_state["current_speaker_seat"] = None
-            self.store.update_session(session_id, turn_state=turn_state)
-            await self._broadcast(session_id, {"type": "message.new", "message_id": msg_id, "turn_index": turn_idx, "seat": seat, "text": clamped})
-            nxt = pick_next_speaker(turn_state["turn_counts"], session["turns_per_speaker"], self.rng)
-            if nxt is None:
-                self.store.update_session(session_id, status="JUDGING")
-            else:
-                await self._broadcast(session_id, {"type": "turn.next", "current_speaker_seat": nxt, "turn_counts": turn_state["turn_counts"]})
+        self._touch(session_id)
+        if not await self._claim(session_id):
+            await self.backplane.publish(
+                self._commands_channel(session_id), serialize({"type": "human.message", "client_id": client_id, "text": text})
+            )
+            return
+        with tracer.span("turn.human", session_id=session_id, client_id=client_id) as span:
+            async with self._locked(session_id, "handle_human_message"):
+                state = await self._load_state(session_id)
+                if not state or state.session["status"] != "IN_PROGRESS":
+                    return
+                session = state.session
+                turn_state = state.copy_turn_state()
+                seat = turn_state.get("current_speaker_seat")
+                if seat != "A":
+                    return
+                self._cancel_timeout(session_id)
+                clamped = clamp_text(text, session["max_chars"])
+                nxt = self._pick_after(turn_state, seat, session["turns_per_speaker"])
+                await self._commit_message_locked(state, turn_state, seat, clamped, nxt)
+                span.set_attribute("turn_index", turn_state["turn_index"])
         self.ensure_engine(session_id)
 
-    async def handle_timeout_pass(self, session_id: str):
-        async with self._locks[session_id]:
-            session = self.store.get_session(session_id)
-            if not session or session["status"] != "IN_PROGRESS":
-                return
-            turn_state = self._get_turn_state(session)
-            if turn_state.get("current_speaker_seat") != "A":
-                return
-            turn_state["turn_index"] += 1
-            turn_idx = turn_state["turn_index"]
-            pass_text = self.rng.choice(PASS_MESSAGES)
-            clamped = clamp_text(pass_text, session["max_chars"])
-            msg_id = self.store.add_message(session_id, "A", turn_idx, clamped)
-            turn_state["turn_counts"]["A"] += 1
-            turn_state["current_speaker_seat"] = None
-            self.store.update_session(session_id, turn_state=turn_state)
-            await self._broadcast(session_id, {"type": "message.new", "message_id": msg_id, "turn_index": turn_idx, "seat": "A", "text": clamped})
-            nxt = pick_next_speaker(turn_state["turn_counts"], session["turns_per_speaker"], self.rng)
-            if nxt is None:
-                self.store.update_session(session_id, status="JUDGING")
-            else:
-                await self._broadcast(session_id, {"type": "turn.next", "current_speaker_seat": nxt, "turn_counts": turn_state["turn_counts"]})
+    async def handle_timeout_pass(self, session_id: str, deadline: float | None = None):
+        with tracer.span("turn.timeout_pass", root=True, session_id=session_id) as span:
+            async with self._locked(session_id, "handle_timeout_pass"):
+                state = await self._load_state(session_id)
+                if not state or state.session["status"] != "IN_PROGRESS":
+                    return
+                session = state.session
+                turn_state = state.copy_turn_state()
+                if turn_state.get("current_speaker_seat") != "A":
+                    return
+                if deadline is not None and turn_state.get("human_deadline") != deadline:
+                    return
+                pass_text = self.rng.choice(PASS_MESSAGES)
+                clamped = clamp_text(pass_text, session["max_chars"])
+                nxt = self._pick_after(turn_state, "A", session["turns_per_speaker"])
+                await self._commit_message_locked(state, turn_state, "A", clamped, nxt)
+                span.set_attribute("turn_index", turn_state["turn_index"])
         self.ensure_engine(session_id)
 
-    async def _run_judge_locked(self, session_id: str, session: dict, turn_state: dict):
-        del turn_state
-        participants = [p for p in self.store.list_participants(session_id) if p["type"] != "judge"]
-        seats = [p["seat"] for p in participants]
-        logs = [{"seat": m["seat"], "text": m["text"]} for m in self.store.list_messages(session_id)]
-        prompt = build_judge_messages(session["topic"], seats, logs)
-        try:
-            raw = await self.llm.chat(
-                model=settings.llm_model_judge,
-                messages=prompt,
-                temperature=settings.llm_temperature_judge,
-                max_tokens=settings.llm_max_tokens_judge,
-            )
-        except Exception:
-            raw = JUDGE_FALLBACK
-        parsed = self._parse_judge(raw, seats)
-        self.store.save_result(session_id, parsed["pick_seat"], parsed["confidence"], clamp_text(parsed["why"], session["max_chars"]))
-        self.store.update_session(session_id, status="FINISHED")
-        await self._broadcast(
-            session_id,
-            {
-                "type": "session.finished",
-                "judge": {
-                    "pick_seat": parsed["pick_seat"],
-                    "confidence": parsed["confidence"],
-                    "why": clamp_text(parsed["why"], session["max_chars"]),
-                },
-            },
-        )
+    async def _judge_session(self, session_id: str):
+        with tracer.span("judge", root=True, session_id=session_id):
+            async with self._locked(session_id, "judge_session"):
+                state = await self._load_state(session_id)
+                if not state or state.session["status"] != "JUDGING":
+                    return
+                session = state.session
+                seats = [p["seat"] for p in self._public_participants(state)]
+            logs = [{"seat": m["seat"], "text": m["text"]} for m in await self.store.list_messages(session_id)]
+            prompt = build_judge_messages(session["topic"], seats, logs)
+            try:
+                with self._llm_call(session_id):
+                    raw = await self.llm.chat(
+                        model=settings.llm_model_judge,
+                        messages=prompt,
+                        temperature=settings.llm_temperature_judge,
+                        max_tokens=settings.llm_max_tokens_judge,
+                        priority=LLMPriority.JUDGE,
+                        budget_secs=settings.llm_judge_deadline_secs,
+                    )
+            except Exception:
+                LLM_FALLBACKS.inc(kind="judge", source="canned")
+                raw = JUDGE_FALLBACK
+            parsed = self._parse_judge(raw, seats)
+            why = clamp_text(parsed["why"], session["max_chars"])
+            async with self._locked(session_id, "judge_session"):
+                if not await self.store.finish_session(session_id, parsed["pick_seat"], parsed["confidence"], why):
+                    return
+                state.session["status"] = "FINISHED"
+                self._sessions.invalidate(session_id)
+                await self._broadcast(
+                    session_id,
+                    {"type": "session.finished", "judge": {"pick_seat": parsed["pick_seat"], "confidence": parsed["confidence"], "why": why}},
+                )
+            self._reap(session_id, "finished")
 
     def _parse_judge(self, text: str, seats: list[str]):
         content = clamp_text(text)
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from types import FrameType
+
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LOOP_STALLS = registry.counter("event_loop_stalls_total", "Event loop steps that blocked longer than the stall threshold")
+PROFILES = registry.counter("debug_profiles_total", "On-demand sampling profiles by outcome (ok/busy)")
+
+
+class ProfilerBusyError(RuntimeError):
+    pass
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+
+def collapsed_stack(frame: FrameType | None) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def format_stack(frame: FrameType | None) -> list[str]:
+    lines = []
+    while frame is not None:
+        lines.append(f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return lines[::-1]
+
+
+def _describe_task(task: asyncio.Task | None) -> str | None:
+    if task is None:
+        return None
+    coro = task.get_coro()
+    return f"{task.get_name()} {getattr(coro, '__qualname__', coro)!r}"
+
+
+class SamplingProfiler:
+    def __init__(self, max_secs: float):
+        self.max_secs = max_secs
+        self._lock = threading.Lock()
+
+    async def profile(self, secs: float, interval_secs: float, all_threads: bool = False) -> Counter[str]:
+        if not self._lock.acquire(blocking=False):
+            PROFILES.inc(outcome="busy")
+            raise ProfilerBusyError("a profile is already running")
+        try:
+            stop = threading.Event()
+            samples: Counter[str] = Counter()
+            thread = threading.Thread(
+                target=self._sample,
+                args=(threading.get_ident(), stop, interval_secs, all_threads, samples),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            thread.start()
+            try:
+                await asyncio.sleep(min(secs, self.max_secs))
+            finally:
+                stop.set()
+                await asyncio.to_thread(thread.join)
+            PROFILES.inc(outcome="ok")
+            return samples
+        finally:
+            self._lock.release()
+
+    def _sample(self, loop_ident: int, stop: threading.Event, interval_secs: float, all_threads: bool, samples: Counter[str]):
+        me = threading.get_ident()
+        names = {}
+        while not stop.wait(interval_secs):
+            for ident, frame in sys._current_frames().items():
+                if ident == me or (not all_threads and ident != loop_ident):
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = collapsed_stack(frame)
+                samples[f"{names.get(ident, ident)};{stack}" if all_threads else stack] += 1
+
+    @staticmethod
+    def render(samples: Counter[str]) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+class StallDetector:
+    def __init__(self, threshold_secs: float, history: int = 50):
+        self.threshold_secs = threshold_secs
+        self.period_secs = threshold_secs / 2
+        self.recent: deque[dict] = deque(maxlen=history)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_ident = 0
+        self._beat = 0.0
+        self._reported: dict | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self.threshold_secs <= 0 or self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_ident = threading.get_ident()
+        self._stop.clear()
+        self._heartbeat()
+        self._thread = threading.Thread(target=self._watch, name="loop-stall-detector", daemon=True)
+        self._thread.start()
+
+    async def aclose(self):
+        thread, self._thread = self._thread, None
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if thread is not None:
+            self._stop.set()
+            await asyncio.to_thread(thread.join)
+
+    def _heartbeat(self):
+        now = time.monotonic()
+        stall = self._reported
+        if stall is not None:
+            self._reported = None
+            stall["blocked_ms"] = (now - self._beat - self.period_secs) * 1000
+        self._beat = now
+        self._handle = self._loop.call_later(self.period_secs, self._heartbeat)
+
+    def _watch(self):
+        while not self._stop.wait(self.period_secs / 2):
+            beat = self._beat
+            late = time.monotonic() - beat - self.period_secs
+            if late < self.threshold_secs or self._reported is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_ident)
+            if frame is None or beat != self._beat:
+                continue
+            stall = {
+                "detected_at": time.time(),
+                "blocked_ms": late * 1000,
+                "task": _describe_task(asyncio.current_task(self._loop)),
+                "stack": format_stack(frame),
+            }
+            del frame
+            self._reported = stall
+            self.recent.append(stall)
+            LOOP_STALLS.inc()
+            logger.warning(
+                "event loop blocked for %.0fms+ in %s\n  %s", stall["blocked_ms"], stall["task"] or "a callback", "\n  ".join(stall["stack"][-15:])
+            )
@@ -31,6 +31,19 @@ def build_speaker_messages(topic: str, seat: str, persona: str, messages: list[d
     ]
 
 
+def build_pool_messages(topic: str, seat: str, persona: str, messages: list[dict], difficulty: str) -> list[dict]:
+    recent = messages[-difficulty_to_window(difficulty) :]
+    situation = f"최근 대화:\n{transcript_from_messages(recent)}" if recent else "아직 아무도 말하지 않았어."
+    return [
+        {"role": "system", "content": SPEAKER_SYSTEM_PROMPT.format(persona=persona)},
+        {
+            "role": "user",
+            "content": f"주제: {topic}\n좌석: {seat}\n{situation}\n\n"
+            "다음 네 차례에 그대로 써도 어색하지 않은 한 마디를 말해. 바로 앞 발언에 기대지 말고 주제에 대한 의견이나 질문으로, 160자 이내로.",
+        },
+    ]
+
+
 def build_judge_messages(topic: str, seats: list[str], messages: list[dict]) -> list[dict]:
     return [
         {"role": "system", "content": JUDGE_SYSTEM_PROMPT},
@@ -39,6 +39,8 @@ class ResumeEvent(BaseModel):
     type: Literal["session.resume"]
     client_id: str
     last_seen_message_id: str | None = None
+    last_seen_turn_index: int | None = None
+    batch_replay: bool = False
 
 
 class HumanMessageEvent(BaseModel):
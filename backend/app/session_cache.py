@@ -0,0 +1,47 @@
+import json
+from collections import OrderedDict, deque
+
+from app.prompts import difficulty_to_window
+
+
+class SessionState:
+    def __init__(self, session: dict, participants: list[dict], messages: list[dict]):
+        self.session_id = session["id"]
+        self.session = session
+        self.turn_state = json.loads(session["turn_state_json"])
+        self.participants = {p["seat"]: p for p in participants}
+        self.window = difficulty_to_window(session["difficulty"])
+        self.recent_messages: deque[dict] = deque(({"seat": m["seat"], "text": m["text"]} for m in messages), maxlen=self.window)
+
+    def copy_turn_state(self) -> dict:
+        return {**self.turn_state, "turn_counts": dict(self.turn_state["turn_counts"])}
+
+
+class SessionCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, SessionState] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def values(self) -> list[SessionState]:
+        return list(self._entries.values())
+
+    def peek(self, session_id: str) -> SessionState | None:
+        return self._entries.get(session_id)
+
+    def get(self, session_id: str) -> SessionState | None:
+        state = self._entries.get(session_id)
+        if state is not None:
+            self._entries.move_to_end(session_id)
+        return state
+
+    def put(self, state: SessionState):
+        self._entries[state.session_id] = state
+        self._entries.move_to_end(state.session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: str):
+        self._entries.pop(session_id, None)
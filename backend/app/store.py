@@ -1,70 +1,147 @@
+import asyncio
 import json
 import sqlite3
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from uuid import uuid4
 
+from app.config import settings
+from app.metrics import registry
+from app.tracing import tracer
+
+DB_OP_DURATION = registry.histogram("db_op_seconds", "Async store call time including executor queue wait, by op and pool")
+DB_QUERY_DURATION = registry.histogram("db_query_seconds", "SQLite execution time on the store thread, excluding executor queue wait, by op and pool")
+
+MIGRATIONS: list[tuple[int, list[str]]] = [
+    (
+        1,
+        [
+            """CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                topic TEXT NOT NULL,
+                status TEXT NOT NULL,
+                turns_per_speaker INTEGER NOT NULL,
+                max_chars INTEGER NOT NULL,
+                difficulty TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                turn_state_json TEXT NOT NULL,
+                config_json TEXT
+            )""",
+            """CREATE TABLE IF NOT EXISTS participants (
+                id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                seat TEXT NOT NULL,
+                type TEXT NOT NULL,
+                persona_id TEXT,
+                display_name TEXT,
+                FOREIGN KEY(session_id) REFERENCES sessions(id)
+            )""",
+            """CREATE TABLE IF NOT EXISTS messages (
+                id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                seat TEXT NOT NULL,
+                turn_index INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                FOREIGN KEY(session_id) REFERENCES sessions(id)
+            )""",
+            """CREATE TABLE IF NOT EXISTS results (
+                session_id TEXT PRIMARY KEY,
+                pick_seat TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                why TEXT NOT NULL,
+                FOREIGN KEY(session_id) REFERENCES sessions(id)
+            )""",
+        ],
+    ),
+    (
+        2,
+        [
+            "CREATE INDEX IF NOT EXISTS idx_messages_session_turn ON messages(session_id, turn_index, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_participants_session_seat ON participants(session_id, seat)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_status_updated ON sessions(status, updated_at)",
+        ],
+    ),
+    (
+        3,
+        [
+            """CREATE TABLE IF NOT EXISTS session_leases (
+                session_id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                FOREIGN KEY(session_id) REFERENCES sessions(id)
+            )""",
+        ],
+    ),
+]
+
 
 class SQLiteStore:
     def __init__(self, db_path: str):
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._open_conns: list[sqlite3.Connection] = []
+        self._open_conns_lock = threading.Lock()
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=settings.db_statement_cache_size)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(settings.db_busy_timeout_ms)}")
+        conn.execute(f"PRAGMA journal_mode = {settings.db_journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {settings.db_synchronous}")
+        conn.execute(f"PRAGMA cache_size = {-int(settings.db_cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(settings.db_mmap_size_bytes)}")
+        with self._open_conns_lock:
+            self._open_conns.append(conn)
+        return conn
+
     @contextmanager
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
         try:
             yield conn
             conn.commit()
-        finally:
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close(self):
+        with self._open_conns_lock:
+            conns, self._open_conns = self._open_conns, []
+        for conn in conns:
             conn.close()
+        self._local = threading.local()
 
     def _init_db(self):
         with self._conn() as conn:
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id TEXT PRIMARY KEY,
-                    topic TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    turns_per_speaker INTEGER NOT NULL,
-                    max_chars INTEGER NOT NULL,
-                    difficulty TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    turn_state_json TEXT NOT NULL,
-                    config_json TEXT
-                );
-                CREATE TABLE IF NOT EXISTS participants (
-                    id TEXT PRIMARY KEY,
-                    session_id TEXT NOT NULL,
-                    seat TEXT NOT NULL,
-                    type TEXT NOT NULL,
-                    persona_id TEXT,
-                    display_name TEXT,
-                    FOREIGN KEY(session_id) REFERENCES sessions(id)
-                );
-                CREATE TABLE IF NOT EXISTS messages (
-                    id TEXT PRIMARY KEY,
-                    session_id TEXT NOT NULL,
-                    seat TEXT NOT NULL,
-                    turn_index INTEGER NOT NULL,
-                    text TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY(session_id) REFERENCES sessions(id)
-                );
-                CREATE TABLE IF NOT EXISTS results (
-                    session_id TEXT PRIMARY KEY,
-                    pick_seat TEXT NOT NULL,
-                    confidence REAL NOT NULL,
-                    why TEXT NOT NULL,
-                    FOREIGN KEY(session_id) REFERENCES sessions(id)
-                );
-                """
-            )
+            conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY, applied_at TEXT NOT NULL)")
+            conn.commit()
+            for version, statements in MIGRATIONS:
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0] >= version:
+                    conn.rollback()
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+                    (version, datetime.now(timezone.utc).isoformat()),
+                )
+                conn.commit()
+
+    def schema_version(self) -> int:
+        with self._conn() as conn:
+            return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
 
     def create_session(self, topic: str, turns_per_speaker: int, max_chars: int, difficulty: str, turn_state: dict, config: dict | None):
         session_id = str(uuid4())
@@ -127,6 +204,41 @@ class SQLiteStore:
             ).fetchall()
             return [dict(r) for r in rows]
 
+    def list_recent_messages(self, session_id: str, limit: int):
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT id, seat, turn_index, text, created_at FROM messages WHERE session_id = ? ORDER BY turn_index DESC, created_at DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+            return [dict(r) for r in reversed(rows)]
+
+    def list_messages_after(self, session_id: str, after_turn_index: int):
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT id, seat, turn_index, text, created_at FROM messages WHERE session_id = ? AND turn_index > ? ORDER BY turn_index ASC, created_at ASC",
+                (session_id, after_turn_index),
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def load_live_sessions(self, message_limit: int) -> list[dict]:
+        live = "SELECT id FROM sessions WHERE status IN ('IN_PROGRESS', 'JUDGING')"
+        with self._conn() as conn:
+            sessions = [dict(r) for r in conn.execute(f"SELECT * FROM sessions WHERE id IN ({live}) ORDER BY updated_at ASC").fetchall()]
+            participants, messages = defaultdict(list), defaultdict(list)
+            for row in conn.execute(
+                f"SELECT session_id, seat, type, persona_id, display_name FROM participants WHERE session_id IN ({live}) ORDER BY session_id, seat"
+            ):
+                participants[row["session_id"]].append({k: row[k] for k in ("seat", "type", "persona_id", "display_name")})
+            for row in conn.execute(
+                f"""SELECT session_id, id, seat, turn_index, text, created_at FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY turn_index DESC, created_at DESC) AS recency
+                    FROM messages WHERE session_id IN ({live})
+                ) WHERE recency <= ? ORDER BY session_id, turn_index ASC, created_at ASC""",
+                (message_limit,),
+            ):
+                messages[row["session_id"]].append({k: row[k] for k in ("id", "seat", "turn_index", "text", "created_at")})
+        return [{"session": s, "participants": participants[s["id"]], "messages": messages[s["id"]]} for s in sessions]
+
     def get_message_index(self, session_id: str, message_id: str):
         with self._conn() as conn:
             row = conn.execute(
@@ -142,7 +254,131 @@ class SQLiteStore:
                 (session_id, pick_seat, confidence, why),
             )
 
+    def finish_session(self, session_id: str, pick_seat: str, confidence: float, why: str) -> bool:
+        with self._conn() as conn:
+            cur = conn.execute(
+                "UPDATE sessions SET status = 'FINISHED', updated_at = ? WHERE id = ? AND status = 'JUDGING'",
+                (datetime.now(timezone.utc).isoformat(), session_id),
+            )
+            if cur.rowcount != 1:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO results (session_id, pick_seat, confidence, why) VALUES (?, ?, ?, ?)",
+                (session_id, pick_seat, confidence, why),
+            )
+            conn.execute("DELETE FROM session_leases WHERE session_id = ?", (session_id,))
+            return True
+
+    def acquire_lease(self, session_id: str, owner: str, ttl_secs: float) -> bool:
+        now = time.time()
+        with self._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO session_leases (session_id, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE session_leases.owner = excluded.owner OR session_leases.expires_at < ?",
+                (session_id, owner, now + ttl_secs, now),
+            )
+            return cur.rowcount == 1
+
+    def release_lease(self, session_id: str, owner: str):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM session_leases WHERE session_id = ? AND owner = ?", (session_id, owner))
+
+    def get_lease(self, session_id: str):
+        with self._conn() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM session_leases WHERE session_id = ?", (session_id,)).fetchone()
+            return dict(row) if row else None
+
     def get_result(self, session_id: str):
         with self._conn() as conn:
             row = conn.execute("SELECT * FROM results WHERE session_id = ?", (session_id,)).fetchone()
             return dict(row) if row else None
+
+
+class AsyncSQLiteStore:
+    def __init__(self, store: SQLiteStore, reader_threads: int = 4):
+        self.sync = store
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._readers = ThreadPoolExecutor(max_workers=reader_threads, thread_name_prefix="sqlite-reader")
+
+    async def _write(self, fn, *args, **kwargs):
+        return await self._run(self._writer, "writer", fn, args, kwargs)
+
+    async def _read(self, fn, *args, **kwargs):
+        return await self._run(self._readers, "reader", fn, args, kwargs)
+
+    async def _run(self, executor: ThreadPoolExecutor, pool: str, fn, args: tuple, kwargs: dict):
+        started = time.perf_counter()
+        executed: list[float] = []
+
+        def call():
+            began = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                executed.append(time.perf_counter() - began)
+
+        with tracer.span(f"db.{fn.__name__}", pool=pool) as span:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(executor, call)
+            finally:
+                DB_OP_DURATION.observe(time.perf_counter() - started, op=fn.__name__, pool=pool)
+                if executed:
+                    DB_QUERY_DURATION.observe(executed[0], op=fn.__name__, pool=pool)
+                    span.set_attribute("exec_ms", executed[0] * 1000)
+
+    def close(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        self.sync.close()
+
+    async def create_session(self, topic: str, turns_per_speaker: int, max_chars: int, difficulty: str, turn_state: dict, config: dict | None):
+        return await self._write(self.sync.create_session, topic, turns_per_speaker, max_chars, difficulty, turn_state, config)
+
+    async def add_participant(self, session_id: str, seat: str, p_type: str, persona_id: str | None = None):
+        return await self._write(self.sync.add_participant, session_id, seat, p_type, persona_id)
+
+    async def get_session(self, session_id: str):
+        return await self._read(self.sync.get_session, session_id)
+
+    async def update_session(self, session_id: str, *, status: str | None = None, turn_state: dict | None = None):
+        return await self._write(self.sync.update_session, session_id, status=status, turn_state=turn_state)
+
+    async def list_participants(self, session_id: str):
+        return await self._read(self.sync.list_participants, session_id)
+
+    async def add_message(self, session_id: str, seat: str, turn_index: int, text: str):
+        return await self._write(self.sync.add_message, session_id, seat, turn_index, text)
+
+    async def list_messages(self, session_id: str):
+        return await self._read(self.sync.list_messages, session_id)
+
+    async def list_recent_messages(self, session_id: str, limit: int):
+        return await self._read(self.sync.list_recent_messages, session_id, limit)
+
+    async def list_messages_after(self, session_id: str, after_turn_index: int):
+        return await self._read(self.sync.list_messages_after, session_id, after_turn_index)
+
+    async def load_live_sessions(self, message_limit: int) -> list[dict]:
+        return await self._read(self.sync.load_live_sessions, message_limit)
+
+    async def get_message_index(self, session_id: str, message_id: str):
+        return await self._read(self.sync.get_message_index, session_id, message_id)
+
+    async def save_result(self, session_id: str, pick_seat: str, confidence: float, why: str):
+        return await self._write(self.sync.save_result, session_id, pick_seat, confidence, why)
+
+    async def finish_session(self, session_id: str, pick_seat: str, confidence: float, why: str) -> bool:
+        return await self._write(self.sync.finish_session, session_id, pick_seat, confidence, why)
+
+    async def acquire_lease(self, session_id: str, owner: str, ttl_secs: float) -> bool:
+        return await self._write(self.sync.acquire_lease, session_id, owner, ttl_secs)
+
+    async def release_lease(self, session_id: str, owner: str):
+        return await self._write(self.sync.release_lease, session_id, owner)
+
+    async def get_lease(self, session_id: str):
+        return await self._read(self.sync.get_lease, session_id)
+
+    async def get_result(self, session_id: str):
+        return await self._read(self.sync.get_result, session_id)
@@ -0,0 +1,117 @@
+import asyncio
+import math
+from typing import Awaitable, Callable
+
+from app.metrics import registry
+
+TIMERS_PENDING = registry.gauge("timer_wheel_pending", "Timers scheduled on the orchestrator timer wheel")
+TIMERS_FIRED = registry.counter("timer_wheel_fired_total", "Timers fired by the orchestrator timer wheel")
+
+
+class TimerHandle:
+    __slots__ = ("tick", "callback", "cancelled", "fired", "_wheel")
+
+    def __init__(self, tick: int, callback: Callable[[], Awaitable[None] | None], wheel: "TimerWheel"):
+        self.tick = tick
+        self.callback = callback
+        self.cancelled = False
+        self.fired = False
+        self._wheel = wheel
+
+    def done(self) -> bool:
+        return self.cancelled or self.fired
+
+    def cancel(self):
+        if self.done():
+            return
+        self.cancelled = True
+        self._wheel._remove(self)
+
+
+class TimerWheel:
+    def __init__(self, tick_secs: float = 0.05, slots: int = 512):
+        self.tick_secs = tick_secs
+        self._slots: list[dict[TimerHandle, bool]] = [{} for _ in range(slots)]
+        self._origin = 0.0
+        self._tick = 0
+        self._pending = 0
+        self._driver: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._running: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def call_later(self, delay: float, callback: Callable[[], Awaitable[None] | None]) -> TimerHandle:
+        loop = asyncio.get_running_loop()
+        self._ensure_driver()
+        if not len(self):
+            self._origin, self._tick = loop.time(), 0
+        tick = max(math.ceil((loop.time() + max(delay, 0.0) - self._origin) / self.tick_secs), self._tick + 1)
+        handle = TimerHandle(tick, callback, self)
+        self._slots[tick % len(self._slots)][handle] = True
+        self._pending += 1
+        TIMERS_PENDING.inc()
+        self._wakeup.set()
+        return handle
+
+    async def sleep(self, delay: float):
+        fut = asyncio.get_running_loop().create_future()
+        handle = self.call_later(delay, lambda: fut.done() or fut.set_result(None))
+        try:
+            await fut
+        finally:
+            handle.cancel()
+
+    async def aclose(self):
+        if self._driver is not None:
+            self._driver.cancel()
+            await asyncio.gather(self._driver, return_exceptions=True)
+            self._driver = None
+        for bucket in self._slots:
+            for handle in list(bucket):
+                handle.cancel()
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _remove(self, handle: TimerHandle):
+        if self._slots[handle.tick % len(self._slots)].pop(handle, None) is not None:
+            self._pending -= 1
+            TIMERS_PENDING.dec()
+
+    def _ensure_driver(self):
+        if self._driver is None or self._driver.done():
+            self._wakeup = asyncio.Event()
+            self._driver = asyncio.create_task(self._drive())
+
+    async def _drive(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not len(self):
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            next_at = self._origin + (self._tick + 1) * self.tick_secs
+            await asyncio.sleep(max(next_at - loop.time(), 0.0))
+            self._advance(loop.time())
+
+    def _advance(self, now: float):
+        target = math.floor((now - self._origin) / self.tick_secs)
+        while self._tick < target:
+            self._tick += 1
+            bucket = self._slots[self._tick % len(self._slots)]
+            if not bucket:
+                continue
+            for handle in [h for h in bucket if h.tick <= self._tick]:
+                self._remove(handle)
+                self._fire(handle)
+
+    def _fire(self, handle: TimerHandle):
+        handle.fired = True
+        TIMERS_FIRED.inc()
+        result = handle.callback()
+        if asyncio.iscoroutine(result):
+            task = asyncio.create_task(result)
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
@@ -0,0 +1,163 @@
+import json
+import random
+import sys
+import time
+from contextvars import ContextVar
+from typing import TextIO
+
+from app.config import settings
+from app.metrics import registry
+
+TRACE_SPANS = registry.counter("trace_spans_total", "Finished trace spans by outcome (exported/dropped)")
+
+_current: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+class NoopSpan:
+    sampled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_span_id", "sampled", "attributes", "activate", "start_ns", "end_ns", "status", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_span_id: str | None, sampled: bool, attributes: dict, activate: bool):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{tracer.rng.getrandbits(64):016x}"
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.attributes = attributes
+        self.activate = activate
+        self.start_ns = self.end_ns = 0
+        self.status = {"code": "OK"}
+        self._token = None
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        if self.sampled and self.parent_span_id is None:
+            self.tracer._open[self.trace_id] = []
+        if self.activate:
+            self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        if exc_type is not None and exc_type is not GeneratorExit:
+            self.status = {"code": "ERROR", "message": f"{exc_type.__name__}: {exc}"}
+        if self.sampled:
+            self.tracer._finish(self)
+        return False
+
+    def set_attribute(self, key: str, value):
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1_000_000,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class JsonlExporter:
+    def __init__(self, stream: TextIO, owns_stream: bool = False):
+        self.stream = stream
+        self.owns_stream = owns_stream
+
+    def export(self, spans: list[dict]):
+        self.stream.write("".join(json.dumps(span, ensure_ascii=False, default=str) + "\n" for span in spans))
+        self.stream.flush()
+
+    def close(self):
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+def make_exporter(kind: str, path: str) -> JsonlExporter | None:
+    if kind in ("", "none"):
+        return None
+    if kind == "stdout":
+        return JsonlExporter(sys.stdout)
+    if kind == "jsonl":
+        return JsonlExporter(open(path, "a", encoding="utf-8"), owns_stream=True)
+    raise ValueError(f"unsupported trace exporter: {kind}")
+
+
+class Tracer:
+    def __init__(self, exporter: JsonlExporter | None = None, sample_rate: float = 1.0, min_duration_ms: float = 0.0, resource: dict | None = None):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.min_duration_ms = min_duration_ms
+        self.resource = resource or {"service.name": "human-or-llm"}
+        self.rng = random.Random()
+        self._open: dict[str, list[Span]] = {}
+
+    @classmethod
+    def from_settings(cls) -> "Tracer":
+        return cls(make_exporter(settings.trace_exporter, settings.trace_path), settings.trace_sample_rate, settings.trace_min_duration_ms)
+
+    def span(self, name: str, *, root: bool = False, activate: bool = True, **attributes) -> Span | NoopSpan:
+        if self.exporter is None:
+            return NOOP_SPAN
+        parent = None if root else _current.get()
+        if parent is None:
+            sampled = self.rng.random() < self.sample_rate
+            return Span(self, name, f"{self.rng.getrandbits(128):032x}", None, sampled, attributes, activate)
+        return Span(self, name, parent.trace_id, parent.span_id, parent.sampled, attributes, activate)
+
+    def current(self) -> Span | NoopSpan:
+        return _current.get() or NOOP_SPAN
+
+    def _finish(self, span: Span):
+        if span.parent_span_id is not None:
+            pending = self._open.get(span.trace_id)
+            if pending is not None:
+                pending.append(span)
+            elif self.min_duration_ms <= 0:
+                self._export([span])
+            else:
+                TRACE_SPANS.inc(outcome="dropped")
+            return
+        spans = self._open.pop(span.trace_id, [])
+        spans.append(span)
+        if (span.end_ns - span.start_ns) / 1_000_000 >= self.min_duration_ms:
+            self._export(spans)
+        else:
+            TRACE_SPANS.inc(len(spans), outcome="dropped")
+
+    def _export(self, spans: list[Span]):
+        records = [{**span.to_dict(), "resource": self.resource} for span in spans]
+        self.exporter.export(records)
+        TRACE_SPANS.inc(len(records), outcome="exported")
+
+    def close(self):
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+tracer = Tracer.from_settings()
@@ -0,0 +1,41 @@
+from collections import defaultdict, deque
+
+from app.metrics import registry
+
+UTTERANCE_POOL_DRAWS = registry.counter("utterance_pool_draws_total", "Utterance pool lookups by reason (budget/error) and outcome (hit/empty/stale)")
+UTTERANCE_POOL_STALENESS = registry.histogram(
+    "utterance_pool_staleness_turns", "Turns between generating a pooled utterance and using it", buckets=(0, 1, 2, 4, 8, 16, 32)
+)
+
+
+class UtterancePool:
+    def __init__(self, max_per_seat: int, max_staleness_turns: int):
+        self.max_per_seat = max_per_seat
+        self.max_staleness_turns = max_staleness_turns
+        self._candidates: dict[str, deque[tuple[int, str]]] = defaultdict(deque)
+
+    def size(self, seat: str) -> int:
+        return len(self._candidates.get(seat, ()))
+
+    def add(self, seat: str, texts: list[str], turn_index: int):
+        candidates = self._candidates[seat]
+        for text in texts:
+            if text.strip():
+                candidates.append((turn_index, text))
+        while len(candidates) > self.max_per_seat:
+            candidates.popleft()
+
+    def draw(self, seat: str, turn_index: int, reason: str) -> str | None:
+        candidates = self._candidates.get(seat)
+        outcome = "empty"
+        if candidates:
+            generated_at, text = candidates.pop()
+            staleness = turn_index - generated_at
+            if staleness <= self.max_staleness_turns:
+                UTTERANCE_POOL_STALENESS.observe(staleness)
+                UTTERANCE_POOL_DRAWS.inc(reason=reason, outcome="hit")
+                return text
+            candidates.clear()
+            outcome = "stale"
+        UTTERANCE_POOL_DRAWS.inc(reason=reason, outcome=outcome)
+        return None
@@ -2,73 +2,107 @@ import json
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.broadcast import serialize
+from app.config import settings
+from app.metrics import registry
 from app.orchestrator import GameOrchestrator
 from app.schemas import HumanMessageEvent, JoinEvent, RequestStateEvent, ResumeEvent
+from app.tracing import tracer
 
 router = APIRouter()
 
+WS_CONNECTIONS = registry.gauge("ws_connections", "Open client websockets")
+WS_MESSAGES = registry.counter("ws_messages_received_total", "Client websocket messages received, by type")
+KNOWN_EVENTS = frozenset({"session.join", "session.resume", "human.message", "session.request_state"})
+
 
 def make_ws_router(orchestrator: GameOrchestrator) -> APIRouter:
     @router.websocket("/ws/sessions/{session_id}")
     async def session_socket(websocket: WebSocket, session_id: str):
         await websocket.accept()
+        WS_CONNECTIONS.inc()
         client_id = None
+        conn = None
         try:
             while True:
                 payload = await websocket.receive_text()
                 data = json.loads(payload)
                 event_type = data.get("type")
-                if event_type == "session.join":
-                    ev = JoinEvent(**data)
-                    client_id = ev.client_id
-                    await orchestrator.register_client(session_id, client_id, websocket)
-                    await websocket.send_json(orchestrator.session_snapshot(session_id))
-                    orchestrator.ensure_engine(session_id)
-                elif event_type == "session.resume":
-                    ev = ResumeEvent(**data)
-                    client_id = ev.client_id
-                    await orchestrator.register_client(session_id, client_id, websocket)
-                    snapshot = orchestrator.session_snapshot(session_id)
-                    await websocket.send_json(snapshot)
-
-                    messages = orchestrator.store.list_messages(session_id)
-                    if ev.last_seen_message_id:
-                        last_turn_index = orchestrator.store.get_message_index(session_id, ev.last_seen_message_id)
-                        if last_turn_index is not None:
-                            messages = [m for m in messages if m["turn_index"] > last_turn_index]
+                kind = event_type if event_type in KNOWN_EVENTS else "unknown"
+                WS_MESSAGES.inc(type=kind)
+                with tracer.span(f"ws.{kind}", root=True, session_id=session_id, client_id=client_id):
+                    if event_type == "session.join":
+                        ev = JoinEvent(**data)
+                        client_id = ev.client_id
+                        conn = await orchestrator.register_client(session_id, client_id, websocket, paused=True)
+                        try:
+                            await conn.send_now(serialize(await orchestrator.session_snapshot(session_id)))
+                        finally:
+                            conn.resume()
+                        orchestrator.ensure_engine(session_id)
+                    elif event_type == "session.resume":
+                        ev = ResumeEvent(**data)
+                        client_id = ev.client_id
+                        after_turn_index = ev.last_seen_turn_index
+                        if after_turn_index is None and ev.last_seen_message_id:
+                            after_turn_index = await orchestrator.store.get_message_index(session_id, ev.last_seen_message_id)
+                        after_turn_index = after_turn_index or 0
+                        conn = await orchestrator.register_client(session_id, client_id, websocket, after_turn_index=after_turn_index, paused=True)
+                        try:
+                            snapshot = await orchestrator.session_snapshot(session_id)
+                            await conn.send_now(serialize(snapshot))
 
-                    for m in messages:
-                        await websocket.send_json(
-                            {
-                                "type": "message.new",
-                                "message_id": m["id"],
-                                "turn_index": m["turn_index"],
-                                "seat": m["seat"],
-                                "text": m["text"],
-                            }
-                        )
-
-                    if snapshot["status"] == "FINISHED":
-                        result = orchestrator.store.get_result(session_id)
-                        if result:
-                            await websocket.send_json(
+                            messages = await orchestrator.store.list_messages_after(session_id, after_turn_index)
+                            frames = [
                                 {
-                                    "type": "session.finished",
-                                    "judge": {
-                                        "pick_seat": result["pick_seat"],
-                                        "confidence": result["confidence"],
-                                        "why": result["why"],
-                                    },
+                                    "type": "message.new",
+                                    "message_id": m["id"],
+                                    "turn_index": m["turn_index"],
+                                    "seat": m["seat"],
+                                    "text": m["text"],
                                 }
-                            )
-                    orchestrator.ensure_engine(session_id)
-                elif event_type == "human.message":
-                    ev = HumanMessageEvent(**data)
-                    await orchestrator.handle_human_message(session_id, ev.client_id, ev.text)
-                elif event_type == "session.request_state":
-                    RequestStateEvent(**data)
-                    await websocket.send_json(orchestrator.session_snapshot(session_id))
+                                for m in messages
+                            ]
+                            if ev.batch_replay:
+                                for start in range(0, len(frames), settings.resume_batch_size):
+                                    batch = frames[start : start + settings.resume_batch_size]
+                                    await conn.send_now(serialize({"type": "message.batch", "messages": batch}), batch[-1]["turn_index"])
+                            else:
+                                for frame in frames:
+                                    await conn.send_now(serialize(frame), frame["turn_index"])
+
+                            if snapshot["status"] == "FINISHED":
+                                result = await orchestrator.store.get_result(session_id)
+                                if result:
+                                    await conn.send_now(
+                                        serialize(
+                                            {
+                                                "type": "session.finished",
+                                                "judge": {
+                                                    "pick_seat": result["pick_seat"],
+                                                    "confidence": result["confidence"],
+                                                    "why": result["why"],
+                                                },
+                                            }
+                                        )
+                                    )
+                        finally:
+                            conn.resume()
+                        orchestrator.ensure_engine(session_id)
+                    elif event_type == "human.message":
+                        ev = HumanMessageEvent(**data)
+                        await orchestrator.handle_human_message(session_id, ev.client_id, ev.text)
+                    elif event_type == "session.request_state":
+                        RequestStateEvent(**data)
+                        snapshot = await orchestrator.session_snapshot(session_id)
+                        if conn is None:
+                            await websocket.send_json(snapshot)
+                        else:
+                            conn.offer(serialize(snapshot))
         except WebSocketDisconnect:
+            pass
+        finally:
+            WS_CONNECTIONS.dec()
             if client_id:
                 await orchestrator.unregister_client(session_id, client_id, websocket)
 
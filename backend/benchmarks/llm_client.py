@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.llm_client import LLMClient
+from scripts.mock_llm_server import MockLLMServer
+
+MESSAGES = [{"role": "user", "content": "안녕"}]
+
+
+async def per_call_client(base_url: str) -> str:
+    async with httpx.AsyncClient(timeout=15.0) as client:
+        resp = await client.post(
+            f"{base_url}/chat/completions",
+            json={"model": "mock", "messages": MESSAGES, "temperature": 0.9, "max_tokens": 128},
+        )
+    resp.raise_for_status()
+    return resp.json()["choices"][0]["message"]["content"]
+
+
+async def measure(name: str, call, calls: int) -> dict:
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "name": name,
+        "calls": calls,
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+async def run(calls: int, latency_ms: float):
+    async with MockLLMServer(latency_secs=latency_ms / 1000) as server:
+        base = await measure("per_call_client", lambda: per_call_client(server.base_url), calls)
+        base["connections"] = server.connections
+
+        server.connections = 0
+        llm = LLMClient(base_url=server.base_url, api_key="mock")
+        await llm.start()
+        try:
+            pooled = await measure(
+                "pooled_client",
+                lambda: llm.chat(model="mock", messages=MESSAGES, temperature=0.9, max_tokens=128),
+                calls,
+            )
+        finally:
+            await llm.aclose()
+        pooled["connections"] = server.connections
+
+    for row in (base, pooled):
+        print(
+            f"{row['name']:<16} calls={row['calls']} conns={row['connections']:<4} "
+            f"mean={row['mean_ms']:.3f}ms p50={row['p50_ms']:.3f}ms p95={row['p95_ms']:.3f}ms"
+        )
+    print(f"per-call saving: {base['mean_ms'] - pooled['mean_ms']:.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.latency_ms))
@@ -0,0 +1,57 @@
+import argparse
+import tempfile
+import time
+from collections import deque
+
+from app.prompts import build_speaker_messages, difficulty_to_window
+from app.store import SQLiteStore
+from app.utils import seat_labels
+
+CHECKPOINTS = [50, 100, 200, 450]
+
+
+def full_history_prompt(store: SQLiteStore, session_id: str, difficulty: str) -> list[dict]:
+    messages = [{"seat": m["seat"], "text": m["text"]} for m in store.list_messages(session_id)]
+    return build_speaker_messages("벤치마크", "B", "평범함", messages, difficulty)
+
+
+def windowed_prompt(ring: deque, difficulty: str) -> list[dict]:
+    return build_speaker_messages("벤치마크", "B", "평범함", list(ring), difficulty)
+
+
+def timed(fn, reps: int) -> float:
+    started = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - started) / reps * 1_000_000
+
+
+def run(difficulty: str, reps: int):
+    seats = seat_labels(8)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = SQLiteStore(f"{temp_dir}/bench.db")
+        session_id = store.create_session("벤치마크", 50, 160, difficulty, {"turn_index": 0}, config={})
+        window = difficulty_to_window(difficulty)
+        ring: deque = deque(maxlen=window)
+        turn = 0
+        print(f"{'turns':>6} {'full_history_us':>16} {'window_us':>10}")
+        for checkpoint in CHECKPOINTS:
+            while turn < checkpoint:
+                turn += 1
+                text = f"{turn}번째 발화는 적당히 긴 한국어 문장으로 채워 넣었다"
+                store.add_message(session_id, seats[turn % len(seats)], turn, text)
+                ring.append({"seat": seats[turn % len(seats)], "text": text})
+            full_us = timed(lambda: full_history_prompt(store, session_id, difficulty), reps)
+            window_us = timed(lambda: windowed_prompt(ring, difficulty), reps)
+            print(f"{turn:>6} {full_us:>16.1f} {window_us:>10.1f}")
+        warm_us = timed(lambda: store.list_recent_messages(session_id, window), reps)
+        print(f"cold-start window fetch at {turn} turns: {warm_us:.1f}us")
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--difficulty", default="hard", choices=["easy", "normal", "hard"])
+    parser.add_argument("--reps", type=int, default=200)
+    args = parser.parse_args()
+    run(args.difficulty, args.reps)
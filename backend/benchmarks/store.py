@@ -0,0 +1,51 @@
+import argparse
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+from app.store import SQLiteStore
+
+
+class PerCallConnectionStore(SQLiteStore):
+    @contextmanager
+    def _conn(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def turn_pattern(store: SQLiteStore, turns: int) -> float:
+    turn_state = {"current_speaker_seat": None, "turn_counts": {"A": 0, "B": 0}, "turn_index": 0}
+    session_id = store.create_session("벤치마크", turns, 160, "normal", turn_state, config={})
+    started = time.perf_counter()
+    for idx in range(1, turns + 1):
+        seat = "A" if idx % 2 else "B"
+        store.add_message(session_id, seat, idx, f"메시지 {idx}")
+        turn_state["turn_index"] = idx
+        turn_state["turn_counts"][seat] += 1
+        store.update_session(session_id, turn_state=turn_state)
+    return turns / (time.perf_counter() - started)
+
+
+def run(turns: int):
+    rows = []
+    for name, cls in (("per_call_connection", PerCallConnectionStore), ("persistent_connection", SQLiteStore)):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = cls(f"{temp_dir}/bench.db")
+            rows.append((name, turn_pattern(store, turns)))
+            store.close()
+    for name, turns_per_sec in rows:
+        print(f"{name:<22} turns={turns} turns/sec={turns_per_sec:,.0f} ops/sec={turns_per_sec * 2:,.0f}")
+    print(f"speedup: {rows[1][1] / rows[0][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.turns)
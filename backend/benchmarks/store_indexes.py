@@ -0,0 +1,81 @@
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.store import MIGRATIONS, SQLiteStore
+
+INDEX_NAMES = ["idx_messages_session_turn", "idx_participants_session_seat", "idx_sessions_status_updated"]
+
+
+def populate(store: SQLiteStore, messages: int, per_session: int) -> list[str]:
+    now = datetime.now(timezone.utc).isoformat()
+    session_ids = [str(uuid4()) for _ in range(max(messages // per_session, 1))]
+    with store._conn() as conn:
+        conn.executemany(
+            "INSERT INTO sessions (id, topic, status, turns_per_speaker, max_chars, difficulty, created_at, updated_at, turn_state_json, config_json) "
+            "VALUES (?, '벤치마크', 'FINISHED', 25, 160, 'normal', ?, ?, '{}', '{}')",
+            ((sid, now, now) for sid in session_ids),
+        )
+        conn.executemany(
+            "INSERT INTO participants (id, session_id, seat, type) VALUES (?, ?, ?, 'llm_speaker')",
+            ((str(uuid4()), sid, seat) for sid in session_ids for seat in "ABJ"),
+        )
+        conn.executemany(
+            "INSERT INTO messages (id, session_id, seat, turn_index, text, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (str(uuid4()), sid, "AB"[idx % 2], idx, f"메시지 {idx} " * 4, now)
+                for sid in session_ids
+                for idx in range(1, per_session + 1)
+            ),
+        )
+    return session_ids
+
+
+def measure(store: SQLiteStore, session_ids: list[str], queries: int) -> dict:
+    rng = random.Random(0)
+    picks = [rng.choice(session_ids) for _ in range(queries)]
+    timings = {}
+    for name, fn in (
+        ("list_messages", store.list_messages),
+        ("list_participants", store.list_participants),
+        ("get_message_index", lambda sid: store.get_message_index(sid, "missing")),
+    ):
+        started = time.perf_counter()
+        for sid in picks:
+            fn(sid)
+        timings[name] = (time.perf_counter() - started) / queries * 1000
+    return timings
+
+
+def run(messages: int, per_session: int, queries: int):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = SQLiteStore(f"{temp_dir}/bench.db")
+        started = time.perf_counter()
+        session_ids = populate(store, messages, per_session)
+        print(f"populated {messages:,} messages in {len(session_ids):,} sessions ({time.perf_counter() - started:.1f}s)")
+
+        with store._conn() as conn:
+            for name in INDEX_NAMES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+        before = measure(store, session_ids, queries)
+
+        with store._conn() as conn:
+            for statement in dict(MIGRATIONS)[2]:
+                conn.execute(statement)
+        after = measure(store, session_ids, queries)
+        store.close()
+
+    for name in before:
+        print(f"{name:<18} no-index={before[name]:9.3f}ms/query indexed={after[name]:7.3f}ms/query speedup={before[name] / after[name]:,.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--per-session", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+    run(args.messages, args.per_session, args.queries)
@@ -0,0 +1,202 @@
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+
+from app.orchestrator import GameOrchestrator
+from app.prompts import build_judge_messages, build_speaker_messages
+from app.store import AsyncSQLiteStore, SQLiteStore
+from app.utils import clamp_text, pick_next_speaker, seat_labels
+from benchmarks.store_indexes import populate
+
+FANOUTS = (1, 10, 1000)
+
+
+class NullWebSocket:
+    async def send_text(self, text: str):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def _transcript(count: int, seats: list[str]) -> list[dict]:
+    return [{"seat": seats[i % len(seats)], "text": f"{i}번째 발언인데 요즘 출근길이 너무 힘들어서 말이야 " * 2} for i in range(count)]
+
+
+async def measure(fn, min_time: float, repeats: int) -> dict:
+    is_async = inspect.iscoroutinefunction(fn)
+
+    async def run(loops: int) -> float:
+        started = time.perf_counter()
+        if is_async:
+            for _ in range(loops):
+                await fn()
+        else:
+            for _ in range(loops):
+                fn()
+        return time.perf_counter() - started
+
+    loops = 1
+    while (elapsed := await run(loops)) < min_time / repeats and loops < 1_000_000:
+        loops = max(loops * 2, int(loops * min_time / repeats / max(elapsed, 1e-9)))
+    samples = [await run(loops) / loops * 1_000_000 for _ in range(repeats)]
+    median = statistics.median(samples)
+    return {
+        "median_us": median,
+        "mean_us": statistics.fmean(samples),
+        "min_us": min(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops_per_sec": 1_000_000 / median if median else 0.0,
+        "loops": loops,
+        "repeats": repeats,
+    }
+
+
+def store_cases(store: SQLiteStore, session_ids: list[str]) -> dict:
+    rng = random.Random(0)
+    live = store.create_session("벤치마크", 50, 160, "normal", {"turn_index": 0}, config={})
+    turn = itertools.count(1)
+    turn_state = {"current_speaker_seat": "B", "turn_counts": {"A": 3, "B": 2}, "turn_index": 5}
+    return {
+        "store.create_session": lambda: store.create_session("벤치마크", 5, 160, "normal", {"turn_index": 0}, config={}),
+        "store.add_message": lambda: store.add_message(live, "B", next(turn), "오늘 날씨 얘기 좀 해볼까?"),
+        "store.update_session": lambda: store.update_session(live, turn_state=turn_state),
+        "store.get_session": lambda: store.get_session(rng.choice(session_ids)),
+        "store.list_participants": lambda: store.list_participants(rng.choice(session_ids)),
+        "store.list_recent_messages": lambda: store.list_recent_messages(rng.choice(session_ids), 14),
+        "store.list_messages": lambda: store.list_messages(rng.choice(session_ids)),
+    }
+
+
+def pure_cases() -> dict:
+    seats = seat_labels(8)
+    long_transcript = _transcript(2000, seats)
+    rng = random.Random(0)
+    counts = {seat: rng.randint(0, 4) for seat in seats}
+    spaced, unspaced = " \t\n가" * 25_000, "가" * 100_000
+    judge_reply = "PICK=C CONF=0.83 WHY=" + "말투가 지나치게 매끄럽고 질문에 바로 답하지 않음 " * 8
+    orchestrator = GameOrchestrator(None, None)
+    return {
+        "prompts.build_speaker_messages[2000,hard]": lambda: build_speaker_messages("주제", "B", "평범함", long_transcript, "hard"),
+        "prompts.build_judge_messages[2000]": lambda: build_judge_messages("주제", seats, long_transcript),
+        "utils.pick_next_speaker[9 seats]": lambda: pick_next_speaker(counts, 5, rng),
+        "utils.clamp_text[100k spaces]": lambda: clamp_text(spaced),
+        "utils.clamp_text[100k no spaces]": lambda: clamp_text(unspaced),
+        "orchestrator._parse_judge": lambda: orchestrator._parse_judge(judge_reply, seats),
+    }
+
+
+async def orchestrator_cases(stack: AsyncExitStack, temp_dir: str) -> dict:
+    store = AsyncSQLiteStore(SQLiteStore(f"{temp_dir}/orchestrator.db"))
+    stack.callback(store.close)
+    orchestrator = GameOrchestrator(store, None)
+    stack.push_async_callback(orchestrator.aclose)
+    cases = {}
+    for fanout in FANOUTS:
+        session_id = await orchestrator.create_session("주제", num_llm_speakers=8, turns_per_speaker=5, max_chars=160, difficulty="normal")
+        for i in range(fanout):
+            await orchestrator.register_client(session_id, f"c{i}", NullWebSocket())
+        conns = list(orchestrator._connected_clients[session_id].values())
+        payload = {"type": "message.new", "message_id": "m", "turn_index": 0, "seat": "B", "text": "안녕, 다들 주말에 뭐 했어?"}
+
+        async def fan_out(session_id=session_id, conns=conns):
+            await orchestrator._broadcast(session_id, {**payload, "turn_index": conns[0].last_turn_index + 1})
+            for conn in conns:
+                await conn.queue.join()
+
+        async def snapshot(session_id=session_id):
+            await orchestrator.session_snapshot(session_id)
+
+        cases[f"orchestrator._broadcast[{fanout} sockets]"] = fan_out
+        if fanout == 1:
+            cases["orchestrator.session_snapshot"] = snapshot
+    return cases
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    rows = []
+    for name, row in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            rows.append({"name": name, "status": "new", "median_us": row["median_us"], "baseline_us": None, "change": None})
+            continue
+        change = row["median_us"] / base["median_us"] - 1
+        status = "regressed" if change > threshold else "improved" if change < -threshold else "ok"
+        rows.append({"name": name, "status": status, "median_us": row["median_us"], "baseline_us": base["median_us"], "change": change})
+    return rows
+
+
+async def run(args: argparse.Namespace) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        async with AsyncExitStack() as stack:
+            store = SQLiteStore(f"{temp_dir}/bench.db")
+            stack.callback(store.close)
+            started = time.perf_counter()
+            session_ids = populate(store, args.db_messages, 50)
+            print(f"populated {args.db_messages:,} messages ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+            cases = {**store_cases(store, session_ids), **pure_cases(), **await orchestrator_cases(stack, temp_dir)}
+            for name, fn in cases.items():
+                if args.filter and args.filter not in name:
+                    continue
+                results[name] = await measure(fn, args.min_time, args.repeats)
+                print(f"{name:<46} {results[name]['median_us']:>12.2f}us  ±{results[name]['stdev_us']:.2f}", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "db_messages": args.db_messages,
+        },
+        "results": results,
+    }
+
+
+def print_comparison(rows: list[dict]):
+    print(f"{'benchmark':<46} {'baseline_us':>12} {'current_us':>12} {'change':>8}  status")
+    for row in rows:
+        baseline = "-" if row["baseline_us"] is None else f"{row['baseline_us']:.2f}"
+        change = "-" if row["change"] is None else f"{row['change']:+.1%}"
+        print(f"{row['name']:<46} {baseline:>12} {row['median_us']:>12.2f} {change:>8}  {row['status']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json", help="write results to this path")
+    parser.add_argument("--baseline", help="compare against a previous --json output; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative median slowdown counted as a regression")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds spent per benchmark")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--db-messages", type=int, default=200_000)
+    args = parser.parse_args()
+    report = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            rows = compare(report["results"], json.load(f), args.threshold)
+        print_comparison(rows)
+        sys.exit(1 if any(row["status"] == "regressed" for row in rows) else 0)
+    if not args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
@@ -0,0 +1,231 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter
+
+import httpx
+import websockets
+
+from scripts.mock_llm_server import parse_distribution
+
+HUMAN_LINES = [
+    "오늘은 출근길 지하철이 너무 답답해서 진이 다 빠졌어.",
+    "나는 그냥 주말에 집에서 쉬는 게 제일 좋더라.",
+    "그 얘기 들으니까 예전에 비슷한 일 있었던 게 생각나네.",
+    "음, 난 반대로 생각해. 너무 과장된 것 같아.",
+    "요즘 다들 그 얘기만 하는 것 같아.",
+]
+
+
+def percentile(samples: list[float], q: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def summarize_ms(samples: list[float]) -> dict:
+    return {
+        "count": len(samples),
+        **{name: None if value is None else value * 1000 for name, value in (("p50", percentile(samples, 0.5)), ("p95", percentile(samples, 0.95)), ("p99", percentile(samples, 0.99)))},
+    }
+
+
+def histogram_delta(before: dict | None, after: dict | None, name: str) -> list[dict]:
+    if after is None or name not in after:
+        return []
+    previous = {json.dumps(s["labels"], sort_keys=True): s for s in ((before or {}).get(name) or {}).get("samples", [])}
+    out = []
+    for sample in after[name]["samples"]:
+        base = previous.get(json.dumps(sample["labels"], sort_keys=True))
+        base_counts = [count for _, count in base["buckets"]] if base else [0] * len(sample["buckets"])
+        buckets = [[le, count - prior] for (le, count), prior in zip(sample["buckets"], base_counts)]
+        count = sample["count"] - (base["count"] if base else 0)
+        if count:
+            out.append({"labels": sample["labels"], "count": count, "sum": sample["sum"] - (base["sum"] if base else 0.0), "buckets": buckets})
+    return out
+
+
+def histogram_quantile(buckets: list[list], q: float) -> float | None:
+    total = sum(count for _, count in buckets)
+    if not total:
+        return None
+    running = 0
+    for le, count in buckets:
+        running += count
+        if running >= q * total:
+            return float("inf") if le == "+Inf" else le
+    return float("inf")
+
+
+def merge_histograms(samples: list[dict]) -> dict | None:
+    if not samples:
+        return None
+    buckets = [[le, sum(s["buckets"][i][1] for s in samples)] for i, (le, _) in enumerate(samples[0]["buckets"])]
+    return {"count": sum(s["count"] for s in samples), "sum": sum(s["sum"] for s in samples), "buckets": buckets}
+
+
+def server_report(before: dict | None, after: dict | None, top_db_ops: int) -> dict | None:
+    if after is None:
+        return None
+    lag = merge_histograms(histogram_delta(before, after, "event_loop_lag_seconds"))
+    db_ops = [
+        {
+            **sample["labels"],
+            "count": sample["count"],
+            "total_ms": sample["sum"] * 1000,
+            "mean_ms": sample["sum"] / sample["count"] * 1000,
+            "p95_ms_le": histogram_quantile(sample["buckets"], 0.95) * 1000,
+        }
+        for sample in histogram_delta(before, after, "db_op_seconds")
+    ]
+    db_ops.sort(key=lambda row: row["total_ms"], reverse=True)
+    return {
+        "event_loop_lag_ms": None
+        if lag is None
+        else {
+            "samples": lag["count"],
+            "mean": lag["sum"] / lag["count"] * 1000,
+            **{name: histogram_quantile(lag["buckets"], q) * 1000 for name, q in (("p50_le", 0.5), ("p95_le", 0.95), ("p99_le", 0.99))},
+        },
+        "db_ops": db_ops[:top_db_ops],
+    }
+
+
+async def fetch_metrics(http: httpx.AsyncClient) -> dict | None:
+    try:
+        resp = await http.get("/debug/metrics")
+        resp.raise_for_status()
+        return resp.json()
+    except httpx.HTTPError:
+        return None
+
+
+async def play_session(http: httpx.AsyncClient, ws_base: str, args: argparse.Namespace, think, rng: random.Random, stats: dict):
+    started = time.perf_counter()
+    resp = await http.post(
+        "/sessions",
+        json={
+            "topic": args.topic,
+            "num_llm_speakers": args.llm_speakers,
+            "turns_per_speaker": args.turns_per_speaker,
+            "max_chars": args.max_chars,
+            "difficulty": args.difficulty,
+        },
+    )
+    resp.raise_for_status()
+    stats["create"].append(time.perf_counter() - started)
+    client_id = str(uuid.uuid4())
+    async with websockets.connect(f"{ws_base}{resp.json()['ws_url']}", max_size=None) as ws:
+        await ws.send(json.dumps({"type": "session.join", "client_id": client_id}))
+        turn_started, awaiting_delta = time.perf_counter(), True
+        while True:
+            msg = json.loads(await ws.recv())
+            kind, now = msg.get("type"), time.perf_counter()
+            if kind == "turn.request_human":
+                await asyncio.sleep(think(rng))
+                await ws.send(json.dumps({"type": "human.message", "client_id": client_id, "text": rng.choice(HUMAN_LINES)}))
+                turn_started, awaiting_delta = time.perf_counter(), True
+            elif kind == "message.delta" and awaiting_delta:
+                stats["first_delta"].append(now - turn_started)
+                awaiting_delta = False
+            elif kind == "message.new":
+                if msg["seat"] != "A":
+                    stats["turn"].append(now - turn_started)
+                turn_started, awaiting_delta = now, True
+            elif kind == "session.finished":
+                return
+
+
+async def run(args: argparse.Namespace) -> dict:
+    think = parse_distribution(args.think_time)
+    rng = random.Random(args.seed)
+    ws_base = args.ws_base or args.base_url.replace("http", "ws", 1)
+    stats: dict[str, list[float]] = {"create": [], "turn": [], "first_delta": []}
+    failures: Counter[str] = Counter()
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30.0) as http:
+
+        async def one():
+            async with gate:
+                try:
+                    async with asyncio.timeout(args.session_timeout):
+                        await play_session(http, ws_base, args, think, rng, stats)
+                    return True
+                except Exception as exc:
+                    failures[type(exc).__name__] += 1
+                    return False
+
+        before = await fetch_metrics(http)
+        started = time.perf_counter()
+        completed = sum(await asyncio.gather(*(one() for _ in range(args.sessions))))
+        elapsed = time.perf_counter() - started
+        after = await fetch_metrics(http)
+
+    return {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "completed": completed,
+        "failed": args.sessions - completed,
+        "failures": dict(failures),
+        "elapsed_secs": elapsed,
+        "sessions_per_sec": completed / elapsed if elapsed else 0.0,
+        "create_ms": summarize_ms(stats["create"]),
+        "turn_latency_ms": summarize_ms(stats["turn"]),
+        "first_delta_ms": summarize_ms(stats["first_delta"]),
+        "server": server_report(before, after, args.top_db_ops),
+    }
+
+
+def _fmt(row: dict) -> str:
+    return " ".join(f"{k}={'-' if v is None else f'{v:.1f}'}" for k, v in row.items() if k != "count") + f" (n={row['count']})"
+
+
+def print_report(report: dict):
+    print(
+        f"sessions={report['sessions']} completed={report['completed']} failed={report['failed']} {report['failures'] or ''}\n"
+        f"elapsed={report['elapsed_secs']:.1f}s sessions/sec={report['sessions_per_sec']:.2f}"
+    )
+    print(f"create ms        {_fmt(report['create_ms'])}")
+    print(f"llm turn ms      {_fmt(report['turn_latency_ms'])}")
+    print(f"first delta ms   {_fmt(report['first_delta_ms'])}")
+    server = report["server"]
+    if server is None:
+        print("server metrics unavailable (GET /debug/metrics failed; start the server with DEBUG_PROFILING_ENABLED=true)")
+        return
+    lag = server["event_loop_lag_ms"]
+    if lag:
+        print(f"loop lag ms      mean={lag['mean']:.2f} p50<={lag['p50_le']:g} p95<={lag['p95_le']:g} p99<={lag['p99_le']:g} (n={lag['samples']})")
+    for row in server["db_ops"]:
+        print(f"db {row['pool']:<6} {row['op']:<28} n={row['count']:<7} mean={row['mean_ms']:.2f}ms p95<={row['p95_ms_le']:g}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        epilog="Server-side metrics (loop lag, DB op timings) come from GET /debug/metrics, "
+        "which is only served when the server runs with DEBUG_PROFILING_ENABLED=true."
+    )
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--ws-base", help="defaults to --base-url with a ws scheme")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--think-time", default="lognormal:1.5,0.5", help="human reply delay in seconds, same syntax as mock --latency")
+    parser.add_argument("--topic", default="요즘 가장 짜증났던 일")
+    parser.add_argument("--llm-speakers", type=int, default=2)
+    parser.add_argument("--turns-per-speaker", type=int, default=3)
+    parser.add_argument("--max-chars", type=int, default=160)
+    parser.add_argument("--difficulty", default="normal")
+    parser.add_argument("--session-timeout", type=float, default=300.0)
+    parser.add_argument("--top-db-ops", type=int, default=10)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", help="also write the report to this path")
+    args = parser.parse_args()
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
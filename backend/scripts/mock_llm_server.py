@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from typing import Callable
+
+DEFAULT_REPLY = "그러게, 나도 요즘 그 얘기 자주 들었어. 너는 어떻게 생각해?"
+
+Distribution = Callable[[random.Random], float]
+
+
+def parse_distribution(spec: str) -> Distribution:
+    kind, _, params = spec.partition(":")
+    if not params:
+        value = float(kind)
+        return lambda rng: value
+    args = [float(x) for x in params.split(",")]
+    if kind == "fixed":
+        return lambda rng: args[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == "normal":
+        return lambda rng: max(rng.gauss(args[0], args[1]), 0.0)
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(args[0]), args[1])
+    if kind == "exp":
+        return lambda rng: rng.expovariate(1 / args[0])
+    raise ValueError(f"unknown distribution: {spec}")
+
+
+class MockLLMServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_secs: float = 0.0,
+        reply: str = DEFAULT_REPLY,
+        chunk_chars: int = 4,
+        chunk_delay_secs: float = 0.0,
+        fail_status: int = 0,
+        fail_count: int | None = None,
+        retry_after: str | None = None,
+        latency: Distribution | None = None,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        rate_limit_rps: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency_secs = latency_secs
+        self.reply = reply
+        self.chunk_chars = chunk_chars
+        self.chunk_delay_secs = chunk_delay_secs
+        self.fail_status = fail_status
+        self.fail_count = fail_count
+        self.retry_after = retry_after
+        self.latency = latency
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.rate_limit_rps = rate_limit_rps
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self.requests = 0
+        self.statuses: Counter[int | str] = Counter()
+        self._allowance = max(rate_limit_rps, 1.0)
+        self._allowance_at = time.monotonic()
+        self._server: asyncio.base_events.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                self.requests += 1
+                await self._respond(writer, method, path, body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", "0")))
+        return method, path, headers, body
+
+    async def _respond(self, writer: asyncio.StreamWriter, method: str, path: str, body: bytes):
+        if method != "POST" or not path.endswith("/chat/completions"):
+            self._write(writer, 404, {"error": {"message": "not found"}})
+            await writer.drain()
+            return
+        payload = json.loads(body or b"{}")
+        wait = self._rate_limit_wait()
+        if wait:
+            await self._fail(writer, 429, f"{wait:.3f}")
+            return
+        latency = self.latency(self.rng) if self.latency else self.latency_secs
+        if latency:
+            await asyncio.sleep(latency)
+        if self.drop_rate and self.rng.random() < self.drop_rate:
+            self.statuses["dropped"] += 1
+            raise ConnectionResetError("mock drop")
+        if self.fail_status and (self.fail_count is None or self.fail_count > 0):
+            if self.fail_count is not None:
+                self.fail_count -= 1
+            await self._fail(writer, self.fail_status, self.retry_after)
+            return
+        if self.error_rate and self.rng.random() < self.error_rate:
+            await self._fail(writer, 500, None)
+            return
+        self.statuses[200] += 1
+        if payload.get("stream"):
+            await self._stream(writer, payload)
+            return
+        self._write(writer, 200, self._completion(payload))
+        await writer.drain()
+
+    def _rate_limit_wait(self) -> float:
+        if not self.rate_limit_rps:
+            return 0.0
+        now = time.monotonic()
+        self._allowance = min(max(self.rate_limit_rps, 1.0), self._allowance + (now - self._allowance_at) * self.rate_limit_rps)
+        self._allowance_at = now
+        if self._allowance >= 1:
+            self._allowance -= 1
+            return 0.0
+        return (1 - self._allowance) / self.rate_limit_rps
+
+    async def _fail(self, writer: asyncio.StreamWriter, status: int, retry_after: str | None):
+        self.statuses[status] += 1
+        headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        self._write(writer, status, {"error": {"message": "mock failure"}}, headers)
+        await writer.drain()
+
+    async def _stream(self, writer: asyncio.StreamWriter, payload: dict):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n")
+        for start in range(0, len(self.reply), self.chunk_chars):
+            chunk = {
+                "id": f"mock-{self.requests}",
+                "object": "chat.completion.chunk",
+                "model": payload.get("model", "mock"),
+                "choices": [{"index": 0, "delta": {"content": self.reply[start : start + self.chunk_chars]}, "finish_reason": None}],
+            }
+            self._write_chunk(writer, f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+            await writer.drain()
+            if self.chunk_delay_secs:
+                await asyncio.sleep(self.chunk_delay_secs)
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _write_chunk(self, writer: asyncio.StreamWriter, data: bytes):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def _completion(self, payload: dict) -> dict:
+        prompt_tokens = sum(len(m.get("content") or "") for m in payload.get("messages", []))
+        n = payload.get("n", 1)
+        return {
+            "id": f"mock-{self.requests}",
+            "object": "chat.completion",
+            "model": payload.get("model", "mock"),
+            "choices": [{"index": i, "message": {"role": "assistant", "content": self.reply}, "finish_reason": "stop"} for i in range(n)],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(self.reply) * n, "total_tokens": prompt_tokens + len(self.reply) * n},
+        }
+
+    def _write(self, writer: asyncio.StreamWriter, status: int, data: dict, headers: dict | None = None):
+        raw = json.dumps(data, ensure_ascii=False).encode()
+        reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests"}.get(status, "Error")
+        extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(raw)}\r\nConnection: keep-alive\r\n{extra}\r\n".encode()
+            + raw
+        )
+
+
+async def serve(args: argparse.Namespace):
+    server = MockLLMServer(
+        args.host,
+        args.port,
+        args.latency_ms / 1000,
+        reply=args.reply,
+        chunk_chars=args.chunk_chars,
+        chunk_delay_secs=args.chunk_delay_ms / 1000,
+        latency=parse_distribution(args.latency) if args.latency else None,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        rate_limit_rps=args.rate_limit_rps,
+        seed=args.seed,
+    )
+    await server.start()
+    print(f"mock LLM listening on {server.base_url}")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"requests={server.requests} connections={server.connections} statuses={dict(server.statuses)}")
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency", help="seconds: fixed:S, uniform:LO,HI, normal:MEAN,SD, lognormal:MEDIAN,SIGMA or exp:MEAN")
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    parser.add_argument("--chunk-chars", type=int, default=4)
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of calls whose connection is reset")
+    parser.add_argument("--rate-limit-rps", type=float, default=0.0, help="answer 429 + Retry-After above this rate")
+    parser.add_argument("--seed", type=int)
+    asyncio.run(serve(parser.parse_args()))
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+from collections import defaultdict
+
+
+def _bulk(value: str) -> bytes:
+    raw = value.encode()
+    return b"$%d\r\n%s\r\n" % (len(raw), raw)
+
+
+def _array(*items: bytes) -> bytes:
+    return b"*%d\r\n" % len(items) + b"".join(items)
+
+
+class MockRedisServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self.published = 0
+        self._subscribers: dict[str, set[asyncio.StreamWriter]] = defaultdict(set)
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.base_events.Server | None = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        channels: set[str] = set()
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                name, args = command[0].upper(), command[1:]
+                if name == "PING":
+                    writer.write(b"+PONG\r\n")
+                elif name == "PUBLISH":
+                    channel, message = args
+                    receivers = list(self._subscribers.get(channel, ()))
+                    for receiver in receivers:
+                        receiver.write(_array(_bulk("message"), _bulk(channel), _bulk(message)))
+                    self.published += 1
+                    writer.write(b":%d\r\n" % len(receivers))
+                elif name in ("SUBSCRIBE", "UNSUBSCRIBE"):
+                    for channel in args:
+                        if name == "SUBSCRIBE":
+                            channels.add(channel)
+                            self._subscribers[channel].add(writer)
+                        else:
+                            channels.discard(channel)
+                            self._subscribers[channel].discard(writer)
+                        writer.write(_array(_bulk(name.lower()), _bulk(channel), b":%d\r\n" % len(channels)))
+                else:
+                    writer.write(f"-ERR unknown command '{name}'\r\n".encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in channels:
+                self._subscribers[channel].discard(writer)
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> list[str] | None:
+        try:
+            header = await reader.readuntil(b"\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        parts = []
+        for _ in range(int(header[1:-2])):
+            size = int((await reader.readuntil(b"\r\n"))[1:-2])
+            parts.append((await reader.readexactly(size + 2))[:-2].decode())
+        return parts
+
+
+async def serve(host: str, port: int):
+    server = MockRedisServer(host, port)
+    await server.start()
+    print(f"mock redis pub/sub listening on {server.url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
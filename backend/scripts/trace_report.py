@@ -0,0 +1,76 @@
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+
+def load_traces(lines) -> dict[str, list[dict]]:
+    traces: dict[str, list[dict]] = defaultdict(list)
+    for line in lines:
+        line = line.strip()
+        if line:
+            span = json.loads(line)
+            traces[span["trace_id"]].append(span)
+    return traces
+
+
+def root_of(spans: list[dict]) -> dict:
+    ids = {span["span_id"] for span in spans}
+    orphans = [span for span in spans if span["parent_span_id"] not in ids]
+    return min(orphans, key=lambda span: span["start_time_unix_nano"])
+
+
+def slowest(traces: dict[str, list[dict]], top: int, name: str | None = None, session_id: str | None = None) -> list[list[dict]]:
+    picked = []
+    for spans in traces.values():
+        root = root_of(spans)
+        if name and not root["name"].startswith(name):
+            continue
+        if session_id and root["attributes"].get("session_id") != session_id:
+            continue
+        picked.append(spans)
+    picked.sort(key=lambda spans: root_of(spans)["duration_ms"], reverse=True)
+    return picked[:top]
+
+
+def render(spans: list[dict]) -> list[str]:
+    children: dict[str | None, list[dict]] = defaultdict(list)
+    for span in spans:
+        children[span["parent_span_id"]].append(span)
+    root = root_of(spans)
+    origin = root["start_time_unix_nano"]
+    out = []
+
+    def walk(span: dict, depth: int):
+        kids = sorted(children.get(span["span_id"], ()), key=lambda s: s["start_time_unix_nano"])
+        own = span["duration_ms"] - sum(kid["duration_ms"] for kid in kids)
+        attrs = " ".join(f"{k}={v}" for k, v in span["attributes"].items() if k not in ("session_id", "client_id"))
+        error = f" !{span['status'].get('message', 'error')}" if span["status"]["code"] == "ERROR" else ""
+        offset = (span["start_time_unix_nano"] - origin) / 1_000_000
+        out.append(f"{offset:>9.1f}ms {span['duration_ms']:>9.1f}ms (self {max(own, 0.0):>7.1f}) {'  ' * depth}{span['name']} {attrs}{error}".rstrip())
+        for kid in kids:
+            walk(kid, depth + 1)
+
+    walk(root, 0)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Break down the slowest traces from a TRACE_EXPORTER=jsonl file")
+    parser.add_argument("path", nargs="?", default="traces.jsonl", help="'-' reads stdin")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--name", help="only traces whose root span name starts with this, e.g. engine.step or judge")
+    parser.add_argument("--session-id")
+    parser.add_argument("--trace-id")
+    args = parser.parse_args()
+    if args.path == "-":
+        traces = load_traces(sys.stdin)
+    else:
+        with open(args.path, encoding="utf-8") as f:
+            traces = load_traces(f)
+    picked = [traces[args.trace_id]] if args.trace_id else slowest(traces, args.top, args.name, args.session_id)
+    for spans in picked:
+        root = root_of(spans)
+        print(f"trace {root['trace_id']} session={root['attributes'].get('session_id', '-')} {root['duration_ms']:.1f}ms")
+        print("\n".join(render(spans)))
+        print()
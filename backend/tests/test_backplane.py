@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+
+from app.backplane import InProcessBackplane, RedisBackplane, make_backplane
+from scripts.mock_redis_server import MockRedisServer
+
+
+async def wait_for(predicate, timeout: float = 1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.005)
+
+
+class InProcessBackplaneTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_publish_reaches_every_subscriber_until_unsubscribed(self):
+        backplane = InProcessBackplane()
+        first, second = [], []
+        backplane.subscribe("room", first.append)
+        backplane.subscribe("room", second.append)
+        await backplane.publish("room", "hello")
+        backplane.unsubscribe("room", first.append)
+        await backplane.publish("room", "again")
+        await backplane.publish("other", "ignored")
+
+        self.assertEqual(first, ["hello"])
+        self.assertEqual(second, ["hello", "again"])
+
+    def test_make_backplane_picks_implementation_from_url(self):
+        self.assertIsInstance(make_backplane(""), InProcessBackplane)
+        self.assertIsInstance(make_backplane("redis://127.0.0.1:6379"), RedisBackplane)
+        with self.assertRaises(ValueError):
+            make_backplane("amqp://localhost")
+
+
+class RedisBackplaneTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_messages_cross_connections_through_redis_protocol(self):
+        async with MockRedisServer() as server:
+            worker_a, worker_b = RedisBackplane(server.url), RedisBackplane(server.url)
+            await worker_a.start()
+            await worker_b.start()
+            received = []
+            worker_b.subscribe("session:s1:events", received.append)
+            await wait_for(lambda: server._subscribers.get("session:s1:events"))
+
+            await worker_a.publish("session:s1:events", "한글|payload")
+            await wait_for(lambda: received)
+            worker_b.unsubscribe("session:s1:events", received.append)
+            await wait_for(lambda: not server._subscribers.get("session:s1:events"))
+            await worker_a.publish("session:s1:events", "dropped")
+            await worker_a.aclose()
+            await worker_b.aclose()
+
+        self.assertEqual(received, ["한글|payload"])
+        self.assertEqual(server.published, 2)
+
+    async def test_subscriber_resubscribes_after_reconnect(self):
+        server = MockRedisServer()
+        await server.start()
+        backplane = RedisBackplane(server.url, reconnect_delay_secs=0.01)
+        await backplane.start()
+        received = []
+        backplane.subscribe("room", received.append)
+        await wait_for(lambda: server._subscribers.get("room"))
+
+        await server.stop()
+        restarted = MockRedisServer(port=server.port)
+        await restarted.start()
+        await wait_for(lambda: restarted._subscribers.get("room"))
+        await backplane.publish("room", "after restart")
+        await wait_for(lambda: received)
+        await backplane.aclose()
+        await restarted.stop()
+
+        self.assertEqual(received, ["after restart"])
+
+    async def test_publish_fails_fast_while_redis_is_down(self):
+        server = MockRedisServer()
+        await server.start()
+        backplane = RedisBackplane(server.url, reconnect_delay_secs=0.01)
+        await backplane.start()
+        await server.stop()
+        await wait_for(lambda: not backplane._connected.is_set())
+
+        with self.assertRaises(ConnectionError):
+            await asyncio.wait_for(backplane.publish("room", "lost"), timeout=0.5)
+        restarted = MockRedisServer(port=server.port)
+        await restarted.start()
+        await wait_for(backplane._connected.is_set)
+        await backplane.publish("room", "back")
+        await backplane.aclose()
+        await restarted.stop()
+
+        self.assertEqual(restarted.published, 1)
+
+    async def test_failed_publish_drops_the_connection_for_reconnect(self):
+        async with MockRedisServer() as server:
+            backplane = RedisBackplane(server.url, reconnect_delay_secs=0.01)
+            await backplane.start()
+            backplane._pub[1].transport.abort()
+            with self.assertRaises((ConnectionError, asyncio.IncompleteReadError, OSError)):
+                await backplane.publish("room", "lost")
+            self.assertIsNone(backplane._pub)
+            await wait_for(backplane._connected.is_set)
+            await backplane.publish("room", "again")
+            await backplane.aclose()
+
+        self.assertEqual(server.published, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import sys
+import types
+import unittest
+
+if "fastapi" not in sys.modules:
+    fastapi_stub = types.ModuleType("fastapi")
+
+    class WebSocket:  # pragma: no cover - test stub only
+        pass
+
+    fastapi_stub.WebSocket = WebSocket
+    sys.modules["fastapi"] = fastapi_stub
+
+from benchmarks.suite import compare, measure
+
+
+class BenchmarkSuiteTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_measure_handles_sync_and_async_callables(self):
+        calls = []
+
+        async def tick():
+            calls.append(1)
+
+        sync_row = await measure(lambda: sum(range(10)), min_time=0.01, repeats=2)
+        async_row = await measure(tick, min_time=0.01, repeats=2)
+        for row in (sync_row, async_row):
+            self.assertGreater(row["median_us"], 0)
+            self.assertEqual(row["repeats"], 2)
+        self.assertGreaterEqual(len(calls), async_row["loops"] * 2)
+
+    def test_compare_flags_changes_beyond_threshold(self):
+        baseline = {"results": {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}, "c": {"median_us": 10.0}}}
+        current = {"a": {"median_us": 12.0}, "b": {"median_us": 8.0}, "c": {"median_us": 10.5}, "d": {"median_us": 1.0}}
+        rows = {row["name"]: row for row in compare(current, baseline, threshold=0.1)}
+        self.assertEqual({name: row["status"] for name, row in rows.items()}, {"a": "regressed", "b": "improved", "c": "ok", "d": "new"})
+        self.assertAlmostEqual(rows["a"]["change"], 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
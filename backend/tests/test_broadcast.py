@@ -0,0 +1,116 @@
+import asyncio
+import json
+import sys
+import types
+import unittest
+
+if "fastapi" not in sys.modules:
+    fastapi_stub = types.ModuleType("fastapi")
+
+    class WebSocket:  # pragma: no cover - test stub only
+        pass
+
+    fastapi_stub.WebSocket = WebSocket
+    sys.modules["fastapi"] = fastapi_stub
+
+from app.broadcast import BROADCAST_SEND_LATENCY, BROADCAST_SLOW_CONSUMERS, ClientConnection, serialize
+
+
+class GatedWebSocket:
+    def __init__(self, gate: asyncio.Event | None = None):
+        self.gate = gate
+        self.sent = []
+        self.closed_with = None
+
+    async def send_text(self, text: str):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+class ClientConnectionTestCase(unittest.IsolatedAsyncioTestCase):
+    def connect(self, ws, policy="snapshot", max_queue=4, catch_ups=None, dead=None):
+        async def on_catch_up(conn):
+            catch_ups.append(conn.last_turn_index)
+            await conn.send_now(serialize({"type": "session.snapshot"}))
+
+        return ClientConnection(
+            ws,
+            max_queue=max_queue,
+            slow_consumer_policy=policy,
+            last_turn_index=0,
+            on_catch_up=on_catch_up,
+            on_dead=lambda conn: dead.append(conn) if dead is not None else None,
+        )
+
+    async def test_slow_client_does_not_delay_fast_client(self):
+        gate = asyncio.Event()
+        slow_ws, fast_ws = GatedWebSocket(gate), GatedWebSocket()
+        slow, fast = self.connect(slow_ws, catch_ups=[]), self.connect(fast_ws, catch_ups=[])
+        sends_before = BROADCAST_SEND_LATENCY.count()
+
+        text = serialize({"type": "message.new", "turn_index": 1, "text": "안녕"})
+        for conn in (slow, fast):
+            conn.offer(text, 1)
+        await asyncio.wait_for(fast.queue.join(), timeout=1)
+
+        self.assertEqual(fast_ws.sent, [{"type": "message.new", "turn_index": 1, "text": "안녕"}])
+        self.assertEqual(slow_ws.sent, [])
+        gate.set()
+        await asyncio.wait_for(slow.queue.join(), timeout=1)
+        self.assertEqual(len(slow_ws.sent), 1)
+        self.assertEqual(BROADCAST_SEND_LATENCY.count() - sends_before, 2)
+        await slow.close()
+        await fast.close()
+
+    async def test_overflow_downgrades_to_snapshot_catch_up(self):
+        gate = asyncio.Event()
+        ws = GatedWebSocket(gate)
+        catch_ups = []
+        conn = self.connect(ws, catch_ups=catch_ups)
+        before = BROADCAST_SLOW_CONSUMERS.value(action="snapshot")
+
+        for turn_index in range(1, 8):
+            conn.offer(serialize({"type": "message.new", "turn_index": turn_index}), turn_index)
+        gate.set()
+        await asyncio.wait_for(conn.queue.join(), timeout=1)
+
+        self.assertEqual(BROADCAST_SLOW_CONSUMERS.value(action="snapshot") - before, 1)
+        self.assertEqual(len(catch_ups), 1)
+        self.assertIn({"type": "session.snapshot"}, ws.sent)
+        self.assertFalse(conn.closed)
+        await conn.close()
+
+    async def test_overflow_evicts_under_evict_policy(self):
+        ws = GatedWebSocket(asyncio.Event())
+        dead = []
+        conn = self.connect(ws, policy="evict", max_queue=2, dead=dead)
+
+        for turn_index in range(1, 5):
+            conn.offer(serialize({"type": "message.new", "turn_index": turn_index}), turn_index)
+        self.assertIsNotNone(conn._closer)
+        await conn._closer
+
+        self.assertEqual(dead, [conn])
+        self.assertTrue(conn.closed)
+        self.assertEqual(ws.closed_with, 1013)
+
+    async def test_skips_frames_already_covered_by_catch_up(self):
+        ws = GatedWebSocket()
+        conn = self.connect(ws, catch_ups=[])
+        conn.last_turn_index = 3
+        conn.offer(serialize({"type": "message.new", "turn_index": 2}), 2)
+        conn.offer(serialize({"type": "turn.next", "turn_index": 3}))
+        conn.offer(serialize({"type": "message.new", "turn_index": 4}), 4)
+        await asyncio.wait_for(conn.queue.join(), timeout=1)
+
+        self.assertEqual([frame["type"] for frame in ws.sent], ["turn.next", "message.new"])
+        self.assertEqual(conn.last_turn_index, 4)
+        await conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import httpx
+
+from app.config import settings
+from app.llm_client import LLM_DEADLINE_EXHAUSTED, LLM_REQUEST_DURATION, LLM_RETRIES, LLMClient, LLMDeadlineExceeded, _cancel_all
+from app.llm_router import LLM_HEDGES, CircuitBreaker, Endpoint, LLMRouter
+from scripts.mock_llm_server import MockLLMServer
+
+
+class LLMClientTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = MockLLMServer(reply="응답")
+        await self.server.start()
+        self.llm = LLMClient(base_url=self.server.base_url, api_key="test")
+
+    async def asyncTearDown(self):
+        await self.llm.aclose()
+        await self.server.stop()
+
+    async def _chat(self):
+        return await self.llm.chat(model="mock", messages=[{"role": "user", "content": "hi"}], temperature=0.0, max_tokens=16)
+
+    async def test_chat_reuses_pooled_connection(self):
+        await self.llm.start()
+        for _ in range(3):
+            self.assertEqual(await self._chat(), "응답")
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.server.connections, 1)
+        self.assertGreaterEqual(LLM_REQUEST_DURATION.count(model="mock", outcome="ok"), 3)
+
+    async def test_aclose_releases_client_and_restarts_lazily(self):
+        await self._chat()
+        client = self.llm.client
+        await self.llm.aclose()
+        self.assertTrue(client.is_closed)
+        self.assertEqual(await self._chat(), "응답")
+        self.assertIsNot(self.llm.client, client)
+
+    async def test_chat_stream_yields_incremental_deltas(self):
+        self.server.reply = "안녕 반가워 오늘 날씨 좋다"
+        self.server.chunk_chars = 3
+        deltas = [
+            delta
+            async for delta in self.llm.chat_stream(
+                model="mock", messages=[{"role": "user", "content": "hi"}], temperature=0.0, max_tokens=16
+            )
+        ]
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual("".join(deltas), self.server.reply)
+        self.assertEqual(await self._chat(), self.server.reply)
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_chat_candidates_returns_n_choices_in_one_request(self):
+        texts = await self.llm.chat_candidates(
+            model="mock", messages=[{"role": "user", "content": "hi"}], temperature=0.9, max_tokens=16, n=3
+        )
+        self.assertEqual(texts, ["응답"] * 3)
+        self.assertEqual(self.server.requests, 1)
+
+
+
+class MultiEndpointTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.servers: list[MockLLMServer] = []
+        self.llm: LLMClient | None = None
+
+    async def asyncTearDown(self):
+        if self.llm is not None:
+            await self.llm.aclose()
+        for server in self.servers:
+            await server.stop()
+
+    async def _client(self, *servers: MockLLMServer, **router_kwargs) -> LLMClient:
+        endpoints = []
+        for i, server in enumerate(servers):
+            await server.start()
+            self.servers.append(server)
+            endpoints.append(Endpoint(f"e{i}", server.base_url, "test", {}, CircuitBreaker(f"e{i}", 1, 30.0)))
+        self.llm = LLMClient(router=LLMRouter(endpoints, **router_kwargs))
+        return self.llm
+
+    async def _chat(self):
+        return await self.llm.chat(model="mock", messages=[{"role": "user", "content": "hi"}], temperature=0.0, max_tokens=16)
+
+    async def test_slow_primary_is_hedged_to_backup(self):
+        slow, fast = MockLLMServer(latency_secs=2.0, reply="느림"), MockLLMServer(reply="빠름")
+        await self._client(slow, fast, hedge_default_delay_secs=0.05, hedge_min_delay_secs=0.01)
+        won = LLM_HEDGES.value(outcome="won")
+
+        started = time.perf_counter()
+        self.assertEqual(await self._chat(), "빠름")
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(LLM_HEDGES.value(outcome="won"), won + 1)
+        self.assertEqual((slow.requests, fast.requests), (1, 1))
+        self.assertEqual(self.llm.router.endpoints[0].in_flight, 0)
+
+    async def test_post_cancelled_before_it_starts_releases_the_endpoint(self):
+        llm = await self._client(MockLLMServer())
+        payload = {"model": "mock", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.0, "max_tokens": 16}
+
+        task = llm._start_post(llm._acquire(set()), payload, set())
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        self.assertTrue(task.cancelled())
+        self.assertEqual(llm.router.endpoints[0].in_flight, 0)
+        self.assertEqual(self.servers[0].requests, 0)
+
+    async def test_open_circuit_stops_traffic_to_failing_endpoint(self):
+        broken, healthy = MockLLMServer(fail_status=503), MockLLMServer(reply="정상")
+        await self._client(broken, healthy, hedging=False)
+
+        self.assertEqual(await self._chat(), "정상")
+        self.assertEqual(self.llm.router.endpoints[0].breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(await self._chat(), "정상")
+        self.assertEqual(broken.requests, 1)
+        self.assertEqual(healthy.requests, 2)
+
+
+
+class DeadlineRetryTestCase(unittest.IsolatedAsyncioTestCase):
+    async def _client(self, **server_kwargs) -> LLMClient:
+        self.server = MockLLMServer(reply="응답", **server_kwargs)
+        await self.server.start()
+        self.llm = LLMClient(base_url=self.server.base_url, api_key="test")
+        return self.llm
+
+    async def asyncTearDown(self):
+        await self.llm.aclose()
+        await self.server.stop()
+
+    async def _chat(self, budget_secs=None):
+        return await self.llm.chat(
+            model="mock", messages=[{"role": "user", "content": "hi"}], temperature=0.0, max_tokens=16, budget_secs=budget_secs
+        )
+
+    async def test_honours_retry_after_on_429(self):
+        await self._client(fail_status=429, fail_count=1, retry_after="0.3")
+        retries = LLM_RETRIES.value(reason="status")
+        started = time.perf_counter()
+        self.assertEqual(await self._chat(budget_secs=5.0), "응답")
+        self.assertGreaterEqual(time.perf_counter() - started, 0.3)
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(LLM_RETRIES.value(reason="status"), retries + 1)
+
+    async def test_skips_retry_when_budget_cannot_fit_another_attempt(self):
+        await self._client(fail_status=503, retry_after="5")
+        exhausted = LLM_DEADLINE_EXHAUSTED.value(reason="no_budget")
+        started = time.perf_counter()
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self._chat(budget_secs=2.0)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(LLM_DEADLINE_EXHAUSTED.value(reason="no_budget"), exhausted + 1)
+
+    async def test_does_not_retry_client_errors(self):
+        await self._client(fail_status=400)
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self._chat()
+        self.assertEqual(self.server.requests, 1)
+
+    async def test_retries_back_off_exponentially_with_jitter(self):
+        await self._client(fail_status=500, fail_count=2)
+        self.llm.rng.uniform = lambda low, high: high
+        with mock.patch.object(settings, "llm_retry_base_delay_secs", 0.1):
+            started = time.perf_counter()
+            self.assertEqual(await self._chat(), "응답")
+        self.assertGreaterEqual(time.perf_counter() - started, 0.3)
+        self.assertEqual(self.server.requests, 3)
+
+    async def test_deadline_bounds_slow_calls(self):
+        await self._client(latency_secs=2.0)
+        deadlines = LLM_REQUEST_DURATION.count(model="mock", outcome="deadline")
+        started = time.perf_counter()
+        with self.assertRaises(LLMDeadlineExceeded):
+            await self._chat(budget_secs=0.2)
+        with self.assertRaises(LLMDeadlineExceeded):
+            async for _ in self.llm.chat_stream(
+                model="mock", messages=[{"role": "user", "content": "hi"}], temperature=0.0, max_tokens=16, budget_secs=0.2
+            ):
+                pass
+        self.assertLess(time.perf_counter() - started, 1.5)
+        self.assertEqual(LLM_REQUEST_DURATION.count(model="mock", outcome="deadline"), deadlines + 2)
+
+
+class CancelAllTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_gives_up_on_attempts_that_swallow_cancellation(self):
+        release = asyncio.Event()
+
+        async def stubborn():
+            while not release.is_set():
+                try:
+                    await release.wait()
+                except asyncio.CancelledError:
+                    pass
+
+        task = asyncio.create_task(stubborn())
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        with self.assertLogs("app.llm_client", level="WARNING") as logs:
+            await _cancel_all({task}, recheck_secs=0.01, max_rounds=3)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertFalse(task.done())
+        self.assertIn("ignored cancellation", logs.output[0])
+        release.set()
+        await task
+
+
+if __name__ == "__main__":
+    unittest.main()
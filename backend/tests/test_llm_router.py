@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+
+from app.llm_router import CircuitBreaker, Endpoint, LLMRouter
+
+
+def make_endpoint(name: str, threshold: int = 2, reset_secs: float = 30.0) -> Endpoint:
+    return Endpoint(name, f"http://{name}/v1", "key", {}, CircuitBreaker(name, threshold, reset_secs))
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    def test_opens_after_threshold_and_probes_once_after_reset(self):
+        breaker = CircuitBreaker("a", failure_threshold=2, reset_secs=10.0)
+        breaker.record_failure(0.0)
+        self.assertTrue(breaker.allow(1.0))
+        breaker.record_failure(1.0)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow(5.0))
+
+        self.assertTrue(breaker.allow(11.0))
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.allow(11.0))
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow(11.0))
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("a", failure_threshold=1, reset_secs=10.0)
+        breaker.record_failure(0.0)
+        self.assertTrue(breaker.allow(10.0))
+        breaker.record_failure(10.0)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow(15.0))
+
+
+class LLMRouterTestCase(unittest.TestCase):
+    def test_prefers_lowest_ewma_latency(self):
+        slow, fast = make_endpoint("slow"), make_endpoint("fast")
+        router = LLMRouter([slow, fast])
+        for _ in range(3):
+            router.record_success(slow, 2.0)
+            router.record_success(fast, 0.2)
+        endpoint = router.acquire()
+        self.assertIs(endpoint, fast)
+        self.assertEqual(fast.in_flight, 1)
+        router.release(endpoint)
+        self.assertEqual(fast.in_flight, 0)
+
+    def test_skips_open_circuits_and_excluded_endpoints(self):
+        broken, healthy = make_endpoint("broken", threshold=1), make_endpoint("healthy")
+        router = LLMRouter([broken, healthy])
+        router.record_failure(broken, 0.1)
+        self.assertIs(router.acquire(), healthy)
+        self.assertIsNone(router.acquire({healthy}))
+
+    def test_hedge_delay_tracks_observed_quantile(self):
+        primary, backup = make_endpoint("primary"), make_endpoint("backup")
+        router = LLMRouter([primary, backup], hedge_quantile=0.9, hedge_default_delay_secs=3.0, hedge_min_delay_secs=0.05)
+        self.assertEqual(router.hedge_delay(primary), 3.0)
+        for latency in range(1, 11):
+            router.record_success(primary, latency / 10)
+        self.assertAlmostEqual(router.hedge_delay(primary), 1.0)
+        self.assertIsNone(LLMRouter([primary]).hedge_delay(primary))
+
+    def test_from_settings_maps_models_per_endpoint(self):
+        endpoints = [{"name": "a", "base_url": "http://a/v1/", "models": {"speaker": "a-speaker"}}, {"base_url": "http://b/v1"}]
+        with mock.patch("app.llm_router.settings.llm_endpoints", endpoints):
+            router = LLMRouter.from_settings()
+        self.assertEqual([e.name for e in router.endpoints], ["a", "b"])
+        self.assertEqual(router.endpoints[0].base_url, "http://a/v1")
+        self.assertEqual(router.endpoints[0].payload_for({"model": "speaker"})["model"], "a-speaker")
+        self.assertEqual(router.endpoints[1].payload_for({"model": "speaker"})["model"], "speaker")
+
+
+if __name__ == "__main__":
+    unittest.main()
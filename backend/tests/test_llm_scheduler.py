@@ -0,0 +1,88 @@
+import asyncio
+import time
+import unittest
+
+from app.llm_scheduler import LLM_QUEUE_DEPTH, LLM_QUEUE_WAIT, LLMPriority, LLMScheduler, TokenBucket
+
+
+class LLMSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_waiters_are_admitted_by_priority_within_concurrency(self):
+        scheduler = LLMScheduler(concurrency=1)
+        order = []
+        release = asyncio.Event()
+
+        async def call(name: str, priority: LLMPriority):
+            async with scheduler.admit("m", priority, 10):
+                order.append(name)
+                if name == "first":
+                    await release.wait()
+
+        first = asyncio.create_task(call("first", LLMPriority.BACKGROUND))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(call(name, priority))
+            for name, priority in (("background", LLMPriority.BACKGROUND), ("judge", LLMPriority.JUDGE), ("player", LLMPriority.INTERACTIVE))
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(LLM_QUEUE_DEPTH.value(model="m"), 3)
+        release.set()
+        await asyncio.gather(first, *waiters)
+
+        self.assertEqual(order, ["first", "player", "judge", "background"])
+        self.assertGreaterEqual(LLM_QUEUE_WAIT.count(model="m", priority="interactive"), 1)
+        self.assertEqual(LLM_QUEUE_DEPTH.value(model="m"), 0)
+
+    async def test_token_bucket_delays_admission_until_refilled(self):
+        scheduler = LLMScheduler(concurrency=10, tokens_per_min=6000)
+        async with scheduler.admit("m", LLMPriority.INTERACTIVE, 6000):
+            pass
+        started = time.perf_counter()
+        async with scheduler.admit("m", LLMPriority.INTERACTIVE, 10):
+            pass
+        self.assertGreaterEqual(time.perf_counter() - started, 0.08)
+
+    async def test_cancelled_waiter_leaves_queue_and_usage_refunds_estimate(self):
+        scheduler = LLMScheduler(concurrency=1, tokens_per_min=600, model_limits={"judge": {"concurrency": 2}})
+        async with scheduler.admit("m", LLMPriority.INTERACTIVE, 500) as ticket:
+            waiter = asyncio.create_task(scheduler.admit("m", LLMPriority.BACKGROUND, 10).__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            self.assertEqual(scheduler._lane("m").waiters, [])
+            ticket.used_tokens = 100
+        self.assertGreaterEqual(scheduler._lane("m").tokens.tokens, 500)
+        self.assertEqual(scheduler._lane("m").in_flight, 0)
+        self.assertEqual(scheduler._lane("judge").concurrency, 2)
+
+    async def test_waiter_cancelled_in_the_same_tick_as_a_release_does_not_leak_a_slot(self):
+        scheduler = LLMScheduler(concurrency=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.admit("m", LLMPriority.INTERACTIVE, 10):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(scheduler.admit("m", LLMPriority.BACKGROUND, 10).__aenter__())
+        await asyncio.sleep(0)
+        release.set()
+        waiter.cancel()
+        results = await asyncio.gather(holder, waiter, return_exceptions=True)
+
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], asyncio.CancelledError)
+        self.assertEqual((scheduler._lane("m").in_flight, scheduler._lane("m").waiters), (0, []))
+        async with asyncio.timeout(1):
+            async with scheduler.admit("m", LLMPriority.INTERACTIVE, 10):
+                pass
+
+    def test_token_bucket_caps_oversized_requests_at_capacity(self):
+        bucket = TokenBucket(60)
+        self.assertEqual(bucket.wait_time(1000, bucket.updated), 0.0)
+        bucket.take(1000, bucket.updated)
+        self.assertAlmostEqual(bucket.wait_time(1, bucket.updated), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
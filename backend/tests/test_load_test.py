@@ -0,0 +1,42 @@
+import unittest
+
+from scripts.load_test import histogram_delta, histogram_quantile, percentile, server_report
+
+
+def _snapshot(lag_counts, db_counts):
+    def hist(counts, total_sum, labels):
+        return {"labels": labels, "count": sum(counts), "sum": total_sum, "buckets": [[0.01, counts[0]], [0.1, counts[1]], ["+Inf", counts[2]]]}
+
+    return {
+        "event_loop_lag_seconds": {"kind": "histogram", "samples": [hist(lag_counts, 0.01 * sum(lag_counts), {})]},
+        "db_op_seconds": {"kind": "histogram", "samples": [hist(db_counts, 0.002 * sum(db_counts), {"op": "add_message", "pool": "writer"})]},
+    }
+
+
+class LoadTestStatsTestCase(unittest.TestCase):
+    def test_percentile(self):
+        samples = [i / 100 for i in range(100)]
+        self.assertEqual(percentile(samples, 0.5), 0.5)
+        self.assertEqual(percentile(samples, 0.99), 0.99)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_histogram_quantile_uses_bucket_upper_bounds(self):
+        buckets = [[0.01, 90], [0.1, 9], ["+Inf", 1]]
+        self.assertEqual(histogram_quantile(buckets, 0.5), 0.01)
+        self.assertEqual(histogram_quantile(buckets, 0.95), 0.1)
+        self.assertEqual(histogram_quantile(buckets, 1.0), float("inf"))
+        self.assertIsNone(histogram_quantile([[0.01, 0]], 0.5))
+
+    def test_server_report_only_counts_the_run_window(self):
+        before, after = _snapshot([10, 0, 0], [5, 0, 0]), _snapshot([10, 10, 0], [5, 0, 5])
+        delta = histogram_delta(before, after, "event_loop_lag_seconds")
+        self.assertEqual(delta[0]["count"], 10)
+        report = server_report(before, after, top_db_ops=5)
+        self.assertEqual(report["event_loop_lag_ms"]["p50_le"], 100.0)
+        self.assertEqual(report["db_ops"][0]["op"], "add_message")
+        self.assertEqual(report["db_ops"][0]["count"], 5)
+        self.assertIsNone(server_report(before, None, top_db_ops=5))
+
+
+if __name__ == "__main__":
+    unittest.main()
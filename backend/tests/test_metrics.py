@@ -0,0 +1,61 @@
+import unittest
+
+from app.metrics import MetricsRegistry
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_render_prometheus_writes_help_type_and_escaped_labels(self):
+        counter = self.registry.counter("requests_total", "Requests handled")
+        counter.inc(model='gpt "mini"\nv2')
+        counter.inc(2, model="plain")
+        self.registry.gauge("in_flight", "Calls running").set(1.5)
+
+        text = self.registry.render_prometheus()
+
+        self.assertIn("# HELP requests_total Requests handled\n# TYPE requests_total counter\n", text)
+        self.assertIn('requests_total{model="gpt \\"mini\\"\\nv2"} 1\n', text)
+        self.assertIn('requests_total{model="plain"} 2\n', text)
+        self.assertIn("# TYPE in_flight gauge\nin_flight 1.5\n", text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_histogram_buckets_are_cumulative_with_inf_sum_and_count(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, op="read")
+
+        lines = self.registry.render_prometheus().splitlines()
+
+        self.assertEqual(
+            [line for line in lines if line.startswith("latency_seconds")],
+            [
+                'latency_seconds_bucket{op="read",le="0.1"} 1',
+                'latency_seconds_bucket{op="read",le="1"} 3',
+                'latency_seconds_bucket{op="read",le="+Inf"} 4',
+                'latency_seconds_sum{op="read"} 4.25',
+                'latency_seconds_count{op="read"} 4',
+            ],
+        )
+
+    def test_collectors_run_before_render_and_export_until_removed(self):
+        gauge = self.registry.gauge("sockets", "Open sockets")
+        live = [1, 2, 3]
+
+        def collect():
+            gauge.set(len(live))
+
+        self.registry.add_collector(collect)
+        self.assertIn("sockets 3\n", self.registry.render_prometheus())
+        live.pop()
+        self.assertEqual(self.registry.export()["sockets"]["samples"], [{"labels": {}, "value": 2}])
+
+        self.registry.remove_collector(collect)
+        self.registry.remove_collector(collect)
+        live.pop()
+        self.assertIn("sockets 2\n", self.registry.render_prometheus())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import random
+import unittest
+
+import httpx
+
+from scripts.mock_llm_server import MockLLMServer, parse_distribution
+
+BODY = {"model": "mock", "messages": [{"role": "user", "content": "hi"}]}
+
+
+class ParseDistributionTestCase(unittest.TestCase):
+    def test_parses_supported_shapes(self):
+        rng = random.Random(1)
+        self.assertEqual(parse_distribution("0.25")(rng), 0.25)
+        self.assertEqual(parse_distribution("fixed:1.5")(rng), 1.5)
+        self.assertTrue(all(0.2 <= parse_distribution("uniform:0.2,0.4")(rng) <= 0.4 for _ in range(100)))
+        self.assertTrue(all(parse_distribution("normal:0.1,1")(rng) >= 0 for _ in range(100)))
+        samples = sorted(parse_distribution("lognormal:1.0,0.5")(rng) for _ in range(2001))
+        self.assertAlmostEqual(samples[1000], 1.0, delta=0.1)
+        self.assertGreater(parse_distribution("exp:0.5")(rng), 0)
+        with self.assertRaises(ValueError):
+            parse_distribution("zipf:1")
+
+
+class MockLLMServerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def _post(self, server: MockLLMServer, times: int) -> list[httpx.Response]:
+        async with httpx.AsyncClient() as client:
+            return [await client.post(f"{server.base_url}/chat/completions", json=BODY) for _ in range(times)]
+
+    async def test_rate_limit_answers_429_with_retry_after(self):
+        async with MockLLMServer(rate_limit_rps=2) as server:
+            responses = await self._post(server, 4)
+        self.assertEqual([r.status_code for r in responses[:2]], [200, 200])
+        self.assertEqual(responses[2].status_code, 429)
+        self.assertGreater(float(responses[2].headers["retry-after"]), 0)
+        self.assertEqual(server.statuses[429], 2)
+
+    async def test_error_injection(self):
+        async with MockLLMServer(error_rate=1.0) as server:
+            responses = await self._post(server, 2)
+        self.assertEqual([r.status_code for r in responses], [500, 500])
+
+    async def test_dropped_connections_surface_as_transport_errors(self):
+        async with MockLLMServer(drop_rate=1.0) as server:
+            with self.assertRaises(httpx.TransportError):
+                await self._post(server, 1)
+        self.assertEqual(server.statuses["dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,13 @@
 import asyncio
+import io
 import json
+import sqlite3
 import sys
 import tempfile
+import time
 import types
 import unittest
+from datetime import datetime
 
 if "fastapi" not in sys.modules:
     fastapi_stub = types.ModuleType("fastapi")
@@ -64,27 +68,68 @@ if "pydantic_settings" not in sys.modules:
     pydantic_settings_stub.SettingsConfigDict = SettingsConfigDict
     sys.modules["pydantic_settings"] = pydantic_settings_stub
 
-from app.orchestrator import PASS_MESSAGES, GameOrchestrator
-from app.store import SQLiteStore
+from unittest import mock
+
+from app.backplane import InProcessBackplane, RedisBackplane
+from app.config import settings
+from app.metrics import registry
+from app.orchestrator import (
+    CONNECTED_SOCKETS,
+    LIVE_ENTRIES,
+    LLM_FALLBACKS,
+    LOCK_WAIT,
+    PASS_MESSAGES,
+    SESSIONS_BY_STATUS,
+    SPECULATION_DRAFTS,
+    TURN_GAP,
+    GameOrchestrator,
+)
+from app.store import AsyncSQLiteStore, SQLiteStore
+from app.tracing import JsonlExporter, tracer
+from app.utterance_pool import UtterancePool
+from scripts.mock_redis_server import MockRedisServer
 
 
 class DummyLLMClient:
     async def chat(self, **kwargs):
         return "PICK=A CONF=0.7 WHY=테스트"
 
+    async def chat_stream(self, **kwargs):
+        for chunk in ["오늘  ", "날씨가 ", "정말 ", "좋다"]:
+            yield chunk
+
+    async def chat_candidates(self, *, n, **kwargs):
+        return [f"미리 준비한 말 {i}" for i in range(n)]
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text: str):
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        del code
+
 
 class OrchestratorTestCase(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.temp_dir = tempfile.TemporaryDirectory()
         self.store = SQLiteStore(f"{self.temp_dir.name}/test.db")
-        self.orchestrator = GameOrchestrator(self.store, DummyLLMClient())
+        self.async_store = AsyncSQLiteStore(self.store)
+        self.orchestrator = GameOrchestrator(self.async_store, DummyLLMClient())
         self.orchestrator.ensure_engine = lambda session_id: None
 
+    async def asyncTearDown(self):
+        await self.orchestrator.aclose()
+
     def tearDown(self):
+        self.async_store.close()
         self.temp_dir.cleanup()
 
-    def test_create_session_sets_participants(self):
-        session_id = self.orchestrator.create_session("주제", num_llm_speakers=2, turns_per_speaker=3, max_chars=160, difficulty="normal")
+    async def test_create_session_sets_participants(self):
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=2, turns_per_speaker=3, max_chars=160, difficulty="normal")
         participants = self.store.list_participants(session_id)
         seats = [p["seat"] for p in participants]
         self.assertEqual(seats, ["A", "B", "C", "J"])
@@ -95,20 +140,82 @@ class OrchestratorTestCase(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(parsed["confidence"], 1.0)
         self.assertEqual(parsed["why"], "이유")
 
-    async def test_timeout_worker_returns_cleanly_when_cancelled(self):
-        session_id = self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=1, max_chars=8, difficulty="normal")
-        task = self.orchestrator._timeout_tasks.get(session_id)
-        self.assertIsNone(task)
-
-        task = asyncio.create_task(self.orchestrator._timeout_worker(session_id))
-        await asyncio.sleep(0)
-        task.cancel()
-        await task
-        self.assertFalse(task.cancelled())
+    async def _human_turn_session(self) -> str:
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=2, max_chars=160, difficulty="normal")
+        self.store.update_session(
+            session_id, status="IN_PROGRESS", turn_state={"current_speaker_seat": "A", "turn_counts": {"A": 0, "B": 0}, "turn_index": 0}
+        )
+        return session_id
+
+    async def _cache(self, session_id: str):
+        async with self.orchestrator._locked(session_id, "test"):
+            await self.orchestrator._load_state(session_id)
+
+    async def test_unlocked_snapshot_does_not_repopulate_the_cache(self):
+        session_id = await self._judging_session()
+        loaded, finish = asyncio.Event(), asyncio.Event()
+        list_participants = self.async_store.list_participants
+
+        async def slow_participants(sid):
+            rows = await list_participants(sid)
+            loaded.set()
+            await finish.wait()
+            return rows
+
+        with mock.patch.object(self.async_store, "list_participants", slow_participants):
+            snapshot = asyncio.create_task(self.orchestrator.session_snapshot(session_id))
+            await loaded.wait()
+            self.store.finish_session(session_id, "B", 0.9, "끝")
+            self.orchestrator._sessions.invalidate(session_id)
+            finish.set()
+            self.assertEqual((await snapshot)["status"], "JUDGING")
+
+        self.assertIsNone(self.orchestrator._sessions.peek(session_id))
+        self.assertEqual((await self.orchestrator.session_snapshot(session_id))["status"], "FINISHED")
+
+    async def test_human_deadline_is_persisted_and_survives_restart(self):
+        session_id = await self._human_turn_session()
+        await self.orchestrator._run_loop(session_id)
+        deadline = json.loads(self.store.get_session(session_id)["turn_state_json"])["human_deadline"]
+        self.assertAlmostEqual(deadline, time.time() + settings.human_turn_timeout_secs, delta=5)
+        await self.orchestrator._run_loop(session_id)
+        self.assertEqual(json.loads(self.store.get_session(session_id)["turn_state_json"])["human_deadline"], deadline)
+
+        turn_state = json.loads(self.store.get_session(session_id)["turn_state_json"])
+        turn_state["human_deadline"] = time.time() - 1
+        self.store.update_session(session_id, turn_state=turn_state)
+        await self.orchestrator.aclose()
+        self.assertIsNone(self.store.get_lease(session_id))
+        restarted = GameOrchestrator(self.async_store, DummyLLMClient())
+        restarted.ensure_engine = lambda session_id: None
+        await restarted._run_loop(session_id)
+        while not self.store.list_messages(session_id):
+            await asyncio.sleep(0.01)
+        await restarted.aclose()
+
+        self.assertIn(self.store.list_messages(session_id)[0]["text"], PASS_MESSAGES)
+        self.assertNotIn("human_deadline", json.loads(self.store.get_session(session_id)["turn_state_json"]))
+
+    async def test_stale_timeout_does_not_pass_a_later_human_turn(self):
+        session_id = await self._human_turn_session()
+        await self.orchestrator._run_loop(session_id)
+        stale = self.orchestrator._sessions.get(session_id).turn_state["human_deadline"]
+        self.assertFalse(self.orchestrator._timeouts[session_id].done())
+
+        await self.orchestrator.handle_human_message(session_id, client_id="c1", text="안녕")
+        self.assertNotIn(session_id, self.orchestrator._timeouts)
+        state = self.orchestrator._sessions.get(session_id)
+        turn_state = state.copy_turn_state()
+        turn_state["current_speaker_seat"] = "A"
+        turn_state["human_deadline"] = stale + 30
+        await self.orchestrator._write_turn_state(state, turn_state)
+
+        await self.orchestrator.handle_timeout_pass(session_id, stale)
+        self.assertEqual(len(self.store.list_messages(session_id)), 1)
 
 
     async def test_handle_timeout_pass_uses_random_pass_pool(self):
-        session_id = self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=5, max_chars=160, difficulty="normal")
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=5, max_chars=160, difficulty="normal")
         self.store.update_session(
             session_id,
             status="IN_PROGRESS",
@@ -128,11 +235,12 @@ class OrchestratorTestCase(unittest.IsolatedAsyncioTestCase):
                 turn_state = json.loads(session["turn_state_json"])
                 turn_state["current_speaker_seat"] = "A"
                 self.store.update_session(session_id, status="IN_PROGRESS", turn_state=turn_state)
+                self.orchestrator._sessions.invalidate(session_id)
 
         self.assertGreaterEqual(len(set(auto_messages)), 2)
 
     async def test_handle_human_message_updates_turn_state_and_status(self):
-        session_id = self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=1, max_chars=8, difficulty="normal")
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=1, max_chars=8, difficulty="normal")
         self.store.update_session(
             session_id,
             status="IN_PROGRESS",
@@ -151,6 +259,607 @@ class OrchestratorTestCase(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(messages), 1)
         self.assertEqual(messages[0]["text"], "안녕 하세요 여러분"[:8])
 
+    async def test_streamed_llm_turn_sends_deltas_then_clamped_message(self):
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=2, max_chars=10, difficulty="normal")
+        self.store.update_session(
+            session_id,
+            status="IN_PROGRESS",
+            turn_state={"current_speaker_seat": "B", "turn_counts": {"A": 0, "B": 0}, "turn_index": 0},
+        )
+        ws = RecordingWebSocket()
+        await self.orchestrator.register_client(session_id, "c1", ws)
+
+        with mock.patch.object(settings, "llm_stream_speaker", True), mock.patch.object(settings, "typing_delay_max_secs", 0.0):
+            await self.orchestrator._run_llm_turn(session_id)
+        await self.orchestrator._connected_clients[session_id]["c1"].queue.join()
+
+        types_sent = [p["type"] for p in ws.sent]
+        self.assertEqual(types_sent[0], "message.typing")
+        deltas = [p for p in ws.sent if p["type"] == "message.delta"]
+        self.assertGreater(len(deltas), 1)
+        self.assertTrue(all(d["turn_index"] == 1 for d in deltas))
+        committed = next(p for p in ws.sent if p["type"] == "message.new")
+        self.assertEqual(committed["text"], "오늘 날씨가 정말 좋다"[:10])
+        self.assertEqual("".join(d["text"] for d in deltas), committed["text"])
+        self.assertLess(types_sent.index("message.delta"), types_sent.index("message.new"))
+        self.assertEqual(self.store.list_messages(session_id)[0]["text"], committed["text"])
+
+    async def test_engine_step_trace_breaks_llm_turn_into_phases(self):
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=1, max_chars=160, difficulty="normal")
+        self.store.update_session(
+            session_id,
+            status="IN_PROGRESS",
+            turn_state={"current_speaker_seat": "B", "turn_counts": {"A": 1, "B": 0}, "turn_index": 1},
+        )
+        await self.orchestrator._claim(session_id)
+        stream = io.StringIO()
+        with mock.patch.object(tracer, "exporter", JsonlExporter(stream)), mock.patch.object(settings, "typing_delay_max_secs", 0.01):
+            await self.orchestrator._run_loop(session_id)
+
+        spans = [json.loads(line) for line in stream.getvalue().splitlines()]
+        by_id = {span["span_id"]: span for span in spans}
+        turn = next(span for span in spans if span["name"] == "turn.llm")
+        step = by_id[turn["parent_span_id"]]
+        self.assertEqual(step["name"], "engine.step")
+        self.assertIsNone(step["parent_span_id"])
+        self.assertEqual(step["attributes"], {"session_id": session_id, "seat": "B", "turn_index": 1})
+        self.assertEqual(turn["attributes"], {"session_id": session_id, "seat": "B", "turn_index": 2})
+        phases = {span["name"] for span in spans if span["parent_span_id"] == turn["span_id"]}
+        self.assertTrue({"typing_delay", "broadcast", "db.add_message", "db.update_session"} <= phases, phases)
+
+    async def _speculated_session(self):
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=2, turns_per_speaker=1, max_chars=160, difficulty="normal")
+        self.store.update_session(
+            session_id,
+            status="IN_PROGRESS",
+            turn_state={"current_speaker_seat": "B", "turn_counts": {"A": 1, "B": 0, "C": 0}, "turn_index": 1},
+        )
+        with mock.patch.object(settings, "speculative_generation", True), mock.patch.object(settings, "llm_stream_speaker", False), mock.patch.object(
+            settings, "typing_delay_max_secs", 0.0
+        ):
+            await self.orchestrator._run_llm_turn(session_id)
+        self.assertEqual(self.orchestrator._speculations[session_id]["seat"], "C")
+        session = self.store.get_session(session_id)
+        turn_state = json.loads(session["turn_state_json"])
+        self.assertEqual(turn_state["next_speaker_seat"], "C")
+        turn_state["current_speaker_seat"] = turn_state.pop("next_speaker_seat")
+        self.store.update_session(session_id, turn_state=turn_state)
+        self.orchestrator._sessions.invalidate(session_id)
+        return session_id
+
+    async def test_speculative_draft_is_used_when_window_unchanged(self):
+        session_id = await self._speculated_session()
+        hits = SPECULATION_DRAFTS.value(outcome="hit")
+        self.orchestrator.llm.chat = mock.AsyncMock(side_effect=AssertionError("draft should be reused"))
+
+        with mock.patch.object(settings, "llm_stream_speaker", False), mock.patch.object(settings, "typing_delay_max_secs", 0.0):
+            await self.orchestrator._run_llm_turn(session_id)
+
+        self.assertEqual(SPECULATION_DRAFTS.value(outcome="hit"), hits + 1)
+        self.assertEqual([m["seat"] for m in self.store.list_messages(session_id)], ["B", "C"])
+
+    async def test_speculative_draft_is_discarded_when_window_changes(self):
+        session_id = await self._speculated_session()
+        misses = SPECULATION_DRAFTS.value(outcome="miss")
+        self.store.add_message(session_id, "A", 2, "끼어들기")
+        self.orchestrator._sessions.invalidate(session_id)
+
+        with mock.patch.object(settings, "llm_stream_speaker", False), mock.patch.object(settings, "typing_delay_max_secs", 0.0):
+            await self.orchestrator._run_llm_turn(session_id)
+
+        self.assertEqual(SPECULATION_DRAFTS.value(outcome="miss"), misses + 1)
+        self.assertEqual(self.store.list_messages(session_id)[-1]["seat"], "C")
+
+    async def test_speculative_draft_runs_on_the_turn_deadline(self):
+        self.orchestrator.llm.chat = mock.AsyncMock(return_value="초안")
+        session_id = await self._speculated_session()
+        self.assertEqual(self.orchestrator.llm.chat.call_args.kwargs["budget_secs"], settings.llm_speaker_deadline_secs)
+
+        self.orchestrator._speculations[session_id]["task"] = asyncio.create_task(self._failing_after(0.2))
+        fallbacks = LLM_FALLBACKS.value(kind="speaker", source="canned")
+        self.orchestrator.llm.chat.reset_mock()
+        with mock.patch.object(settings, "llm_stream_speaker", False), mock.patch.object(settings, "typing_delay_max_secs", 0.0), mock.patch.object(
+            settings, "llm_speaker_deadline_secs", 0.3
+        ), mock.patch.object(settings, "llm_retry_min_attempt_secs", 0.2):
+            await asyncio.wait_for(self.orchestrator._run_llm_turn(session_id), timeout=1)
+
+        self.orchestrator.llm.chat.assert_not_called()
+        self.assertEqual(LLM_FALLBACKS.value(kind="speaker", source="canned"), fallbacks + 1)
+        self.assertEqual(self.store.list_messages(session_id)[-1]["seat"], "C")
+
+    async def _failing_after(self, secs: float):
+        await asyncio.sleep(secs)
+        raise RuntimeError("draft failed")
+
+    async def test_slow_speculative_draft_falls_back_to_pool_after_budget(self):
+        session_id = await self._speculated_session()
+        self.orchestrator._pools[session_id] = UtterancePool(4, 4)
+        self.orchestrator._pools[session_id].add("C", ["미리 준비한 말"], 1)
+        draft = self.orchestrator._speculations[session_id]["task"] = asyncio.create_task(asyncio.sleep(10, "늦은 초안"))
+        pooled = SPECULATION_DRAFTS.value(outcome="pool")
+        with mock.patch.object(settings, "llm_stream_speaker", False), mock.patch.object(settings, "typing_delay_max_secs", 0.0), mock.patch.object(
+            settings, "utterance_pool_latency_budget_secs", 0.05
+        ):
+            await asyncio.wait_for(self.orchestrator._run_llm_turn(session_id), timeout=1)
+
+        self.assertTrue(draft.cancelled())
+        self.assertEqual(SPECULATION_DRAFTS.value(outcome="pool"), pooled + 1)
+        self.assertEqual(self.store.list_messages(session_id)[-1]["text"], "미리 준비한 말")
+
+    async def _pooled_session(self) -> str:
+        with mock.patch.object(settings, "utterance_pool_enabled", True):
+            session_id = await self.orchestrator.create_session("주제", num_llm_speakers=2, turns_per_speaker=2, max_chars=160, difficulty="normal")
+        await self.orchestrator._pool_refills[session_id]
+        self.store.update_session(
+            session_id,
+            status="IN_PROGRESS",
+            turn_state={"current_speaker_seat": "B", "turn_counts": {"A": 1, "B": 0, "C": 0}, "turn_index": 1},
+        )
+        self.orchestrator._sessions.invalidate(session_id)
+        return session_id
+
+    async def test_session_creation_fills_utterance_pool(self):
+        session_id = await self._pooled_session()
+        pool = self.orchestrator._pools[session_id]
+        self.assertEqual(pool.size("B"), settings.utterance_pool_candidates)
+        self.assertEqual(pool.size("C"), settings.utterance_pool_candidates)
+        self.assertEqual(pool.size("A"), 0)
+
+    async def test_slow_speaker_call_falls_back_to_pool_after_budget(self):
+        session_id = await self._pooled_session()
+        cancelled = asyncio.Event()
+
+        async def slow_chat(**kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        self.orchestrator.llm.chat = slow_chat
+        with mock.patch.object(settings, "llm_stream_speaker", False), mock.patch.object(
+            settings, "utterance_pool_latency_budget_secs", 0.05
+        ), mock.patch.object(settings, "typing_delay_max_secs", 0.0):
+            await asyncio.wait_for(self.orchestrator._run_llm_turn(session_id), timeout=1)
+
+        self.assertTrue(cancelled.is_set())
+        self.assertTrue(self.store.list_messages(session_id)[-1]["text"].startswith("미리 준비한 말"))
+        self.assertEqual(self.orchestrator._pools[session_id].size("B"), settings.utterance_pool_candidates - 1)
+
+    async def test_failed_stream_uses_pooled_utterance(self):
+        session_id = await self._pooled_session()
+
+        async def broken_stream(**kwargs):
+            raise RuntimeError("upstream down")
+            yield ""
+
+        self.orchestrator.llm.chat_stream = broken_stream
+        before = LLM_FALLBACKS.value(kind="speaker", source="pool")
+        with mock.patch.object(settings, "llm_stream_speaker", True), mock.patch.object(settings, "typing_delay_max_secs", 0.0):
+            await self.orchestrator._run_llm_turn(session_id)
+
+        self.assertTrue(self.store.list_messages(session_id)[-1]["text"].startswith("미리 준비한 말"))
+        self.assertEqual(LLM_FALLBACKS.value(kind="speaker", source="pool"), before + 1)
+
+    async def test_metrics_collector_reports_sessions_sockets_turn_gaps_and_lock_waits(self):
+        session_id = await self._human_turn_session()
+        await self.orchestrator.start()
+        await self.orchestrator.register_client(session_id, "c1", RecordingWebSocket())
+        gaps, waits = TURN_GAP.count(seat_type="human"), LOCK_WAIT.count(site="handle_human_message")
+
+        await self.orchestrator.handle_human_message(session_id, "c1", "첫 번째")
+        self.store.update_session(session_id, turn_state={"current_speaker_seat": "A", "turn_counts": {"A": 1, "B": 0}, "turn_index": 1})
+        self.orchestrator._sessions.invalidate(session_id)
+        await self.orchestrator.handle_human_message(session_id, "c1", "두 번째")
+        text = registry.render_prometheus()
+
+        self.assertEqual(TURN_GAP.count(seat_type="human"), gaps + 1)
+        self.assertEqual(LOCK_WAIT.count(site="handle_human_message"), waits + 2)
+        self.assertEqual(CONNECTED_SOCKETS.value(), 1)
+        self.assertEqual(SESSIONS_BY_STATUS.value(status="IN_PROGRESS"), 1)
+        self.assertIn('orchestrator_sessions{status="IN_PROGRESS"} 1\n', text)
+        await self.orchestrator.aclose()
+        self.assertNotIn(self.orchestrator.collect_metrics, registry._collectors)
+
+    async def test_inspect_sessions_flags_stuck_games_and_sorts_without_locks(self):
+        stuck_id = await self._human_turn_session()
+        live_id = await self._human_turn_session()
+        lobby_id = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=2, max_chars=160, difficulty="normal")
+        for session_id in (stuck_id, live_id, lobby_id):
+            await self._cache(session_id)
+        self.orchestrator._owned.update({stuck_id, live_id})
+        self.orchestrator._engine_tasks[stuck_id] = asyncio.create_task(asyncio.sleep(0))
+        release = asyncio.Event()
+        self.orchestrator._engine_tasks[live_id] = asyncio.create_task(release.wait())
+        await asyncio.sleep(0)
+        await self.orchestrator.register_client(live_id, "c1", RecordingWebSocket())
+        await self.orchestrator.handle_human_message(live_id, "c1", "안녕")
+
+        async def hold_lock():
+            async with self.orchestrator._locked(live_id, "test"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold_lock())
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(hold_lock())
+        await asyncio.sleep(0)
+        with self.orchestrator._llm_call(live_id), self.orchestrator._llm_call(live_id):
+            rows = {row["session_id"]: row for row in self.orchestrator.inspect_sessions()}
+            by_lock = self.orchestrator.inspect_sessions(sort="lock_held_secs")
+        stuck = self.orchestrator.inspect_sessions(stuck=True)
+        in_progress = self.orchestrator.inspect_sessions(statuses={"IN_PROGRESS"}, sort="clients", descending=False)
+        release.set()
+        await asyncio.gather(holder, waiter)
+
+        self.assertEqual([row["session_id"] for row in stuck], [stuck_id])
+        self.assertEqual((stuck[0]["current_speaker_seat"], stuck[0]["status"]), ("A", "IN_PROGRESS"))
+        self.assertFalse(stuck[0]["engine_alive"])
+        live = rows[live_id]
+        self.assertEqual((live["status"], live["turn_index"], live["clients"]), ("IN_PROGRESS", 1, 1))
+        self.assertTrue(live["engine_alive"] and not live["stuck"])
+        self.assertEqual(live["pending_llm_calls"], 2)
+        self.assertGreater(live["secs_since_last_turn"], 0)
+        self.assertGreaterEqual(live["lock_held_secs"], 0.01)
+        self.assertGreaterEqual(live["secs_since_activity"], live["secs_since_last_turn"])
+        self.assertGreaterEqual(live["secs_since_last_turn"], live["lock_held_secs"])
+        self.assertEqual(live["lock_waiters"], 1)
+        self.assertNotIn(live_id, self.orchestrator._lock_waiters)
+        self.assertEqual(rows[lobby_id]["status"], "LOBBY")
+        self.assertFalse(rows[lobby_id]["stuck"])
+        self.assertEqual(by_lock[0]["session_id"], live_id)
+        self.assertIsNone(by_lock[-1]["lock_held_secs"])
+        self.assertEqual([row["session_id"] for row in in_progress], [stuck_id, live_id])
+        self.assertNotIn(live_id, self.orchestrator._llm_pending)
+        with self.assertRaises(ValueError):
+            self.orchestrator.inspect_sessions(sort="status")
+
+    async def test_hot_path_turns_do_not_read_from_store_once_cached(self):
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=2, max_chars=160, difficulty="normal")
+        self.store.update_session(
+            session_id,
+            status="IN_PROGRESS",
+            turn_state={"current_speaker_seat": "A", "turn_counts": {"A": 0, "B": 0}, "turn_index": 0},
+        )
+        await self._cache(session_id)
+
+        failing_read = mock.AsyncMock(side_effect=AssertionError("hot path must not read from sqlite"))
+        with mock.patch.multiple(self.async_store, get_session=failing_read, list_participants=failing_read, list_messages=failing_read):
+            await self.orchestrator.handle_human_message(session_id, client_id="c1", text="안녕")
+            state = self.orchestrator._sessions.get(session_id)
+            turn_state = state.copy_turn_state()
+            turn_state["current_speaker_seat"] = "B"
+            await self.orchestrator._write_turn_state(state, turn_state)
+            with mock.patch.object(settings, "llm_stream_speaker", False), mock.patch.object(settings, "typing_delay_max_secs", 0.0):
+                await self.orchestrator._run_llm_turn(session_id)
+            snapshot = await self.orchestrator.session_snapshot(session_id)
+
+        self.assertEqual(snapshot["turn_counts"], {"A": 1, "B": 1})
+        self.assertEqual([m["seat"] for m in self.store.list_messages(session_id)], ["A", "B"])
+        persisted = json.loads(self.store.get_session(session_id)["turn_state_json"])
+        self.assertEqual(persisted["turn_counts"], {"A": 1, "B": 1})
+
+    async def _judging_session(self) -> str:
+        session_id = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=1, max_chars=160, difficulty="normal")
+        self.store.add_message(session_id, "A", 1, "안녕")
+        self.store.update_session(session_id, status="JUDGING")
+        return session_id
+
+    async def test_judge_runs_outside_session_lock_and_finishes_once(self):
+        session_id = await self._judging_session()
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_judge(**kwargs):
+            calls.append(kwargs["model"])
+            await release.wait()
+            return "PICK=B CONF=0.9 WHY=느림"
+
+        ws = RecordingWebSocket()
+        with mock.patch.object(self.orchestrator.llm, "chat", slow_judge):
+            await self.orchestrator._run_loop(session_id)
+            while not calls:
+                await asyncio.sleep(0)
+            await asyncio.wait_for(self.orchestrator.register_client(session_id, "c1", ws), timeout=1)
+            duplicate = asyncio.create_task(self.orchestrator._judge_session(session_id))
+            while len(calls) < 2:
+                await asyncio.sleep(0)
+            release.set()
+            await asyncio.wait_for(asyncio.gather(duplicate, self.orchestrator._judges.join()), timeout=1)
+        await self.orchestrator._connected_clients[session_id]["c1"].queue.join()
+
+        self.assertEqual(self.store.get_session(session_id)["status"], "FINISHED")
+        self.assertEqual(self.store.get_result(session_id)["pick_seat"], "B")
+        self.assertEqual([frame["type"] for frame in ws.sent], ["session.finished"])
+        self.assertEqual(len(calls), 2)
+
+    async def test_judge_submissions_wait_when_queue_is_full(self):
+        first, second = await self._judging_session(), await self._judging_session()
+        release = asyncio.Event()
+
+        async def blocked_judge(**kwargs):
+            await release.wait()
+            return "PICK=A CONF=0.5 WHY=대기"
+
+        with mock.patch.object(settings, "judge_workers", 1), mock.patch.object(settings, "judge_queue_max", 1):
+            orchestrator = GameOrchestrator(self.async_store, DummyLLMClient())
+        with mock.patch.object(orchestrator.llm, "chat", blocked_judge):
+            await orchestrator._judges.submit(first)
+            await asyncio.sleep(0)
+            await orchestrator._judges.submit(second)
+            third = await self._judging_session()
+            pending = asyncio.create_task(orchestrator._judges.submit(third))
+            await asyncio.sleep(0.01)
+            self.assertFalse(pending.done())
+            release.set()
+            await asyncio.wait_for(pending, timeout=1)
+            await orchestrator._judges.join()
+        await orchestrator.aclose()
+
+        for session_id in (first, second, third):
+            self.assertEqual(self.store.get_session(session_id)["status"], "FINISHED")
+
+    def _live_entries(self) -> dict:
+        orchestrator = self.orchestrator
+        return {
+            "locks": len(orchestrator._locks),
+            "clients": len(orchestrator._connected_clients),
+            "engine_tasks": len(orchestrator._engine_tasks),
+            "timeouts": len(orchestrator._timeouts),
+            "activity": len(orchestrator._last_activity),
+            "session_cache": len(orchestrator._sessions),
+        }
+
+    async def test_finished_sessions_release_orchestrator_state(self):
+        for _ in range(20):
+            session_id = await self._judging_session()
+            ws = RecordingWebSocket()
+            await self.orchestrator.register_client(session_id, "c1", ws)
+            await self.orchestrator._run_loop(session_id)
+            await self.orchestrator._judges.join()
+            self.assertIn(session_id, self.orchestrator._locks)
+            await self.orchestrator.unregister_client(session_id, "c1", ws)
+        unwatched = await self._judging_session()
+        await self.orchestrator._run_loop(unwatched)
+        await self.orchestrator._judges.join()
+
+        self.assertEqual(self.store.get_session(unwatched)["status"], "FINISHED")
+        self.assertEqual(set(self._live_entries().values()), {0})
+        self.orchestrator._sweep(0.0)
+        self.assertEqual(LIVE_ENTRIES.value(kind="locks"), 0)
+
+    async def test_evicted_session_with_live_engine_is_not_reaped(self):
+        session_id = await self._human_turn_session()
+        release = asyncio.Event()
+        engine = self.orchestrator._engine_tasks[session_id] = asyncio.create_task(release.wait())
+        self.orchestrator._touch(session_id)
+
+        self.orchestrator._reap_if_finished(session_id)
+        await asyncio.sleep(0)
+
+        self.assertFalse(engine.cancelled())
+        self.assertIs(self.orchestrator._engine_tasks[session_id], engine)
+        release.set()
+        await engine
+        self.orchestrator._reap_if_finished(session_id)
+        self.assertNotIn(session_id, self.orchestrator._engine_tasks)
+
+    async def test_evicted_judging_session_with_queued_judge_is_not_reaped(self):
+        session_id = await self._human_turn_session()
+        self.store.update_session(session_id, status="JUDGING")
+        self.orchestrator._sessions.invalidate(session_id)
+        self.orchestrator._judges.pending.add(session_id)
+        self.orchestrator._touch(session_id)
+        touched = self.orchestrator._last_activity[session_id]
+
+        self.orchestrator._reap_if_finished(session_id)
+        with mock.patch.object(settings, "session_idle_ttl_secs", 10.0):
+            self.orchestrator._sweep(touched + 11)
+
+        self.assertIn(session_id, self.orchestrator._last_activity)
+        self.orchestrator._judges.pending.discard(session_id)
+
+    async def test_turn_commits_count_as_activity_and_reaping_releases_the_lease(self):
+        session_id = await self._human_turn_session()
+        await self.orchestrator._run_loop(session_id)
+        self.orchestrator._last_activity[session_id] = 0.0
+        await self.orchestrator.handle_human_message(session_id, client_id="c1", text="안녕")
+        self.assertGreater(self.orchestrator._last_activity[session_id], 0.0)
+        self.assertEqual(self.store.get_lease(session_id)["owner"], self.orchestrator.worker_id)
+
+        with mock.patch.object(settings, "session_idle_ttl_secs", 10.0):
+            self.orchestrator._sweep(self.orchestrator._last_activity[session_id] + 11)
+        await asyncio.gather(*self.orchestrator._background)
+
+        self.assertNotIn(session_id, self.orchestrator._owned)
+        self.assertIsNone(self.store.get_lease(session_id))
+
+    async def test_idle_sessions_without_clients_are_reaped_after_ttl(self):
+        idle = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=2, max_chars=160, difficulty="normal")
+        watched = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=2, max_chars=160, difficulty="normal")
+        for session_id in (idle, watched):
+            self.store.update_session(
+                session_id, status="IN_PROGRESS", turn_state={"current_speaker_seat": "A", "turn_counts": {"A": 0, "B": 0}, "turn_index": 0}
+            )
+            await self._cache(session_id)
+            self.orchestrator._touch(session_id)
+            self.orchestrator._schedule_timeout(session_id, time.time() + 60)
+        await self.orchestrator.register_client(watched, "c1", RecordingWebSocket())
+        timeout = self.orchestrator._timeouts[idle]
+        now = asyncio.get_running_loop().time()
+
+        with mock.patch.object(settings, "session_idle_ttl_secs", 10.0):
+            self.orchestrator._sweep(now + 5)
+            self.assertIn(idle, self.orchestrator._timeouts)
+            self.orchestrator._sweep(now + 11)
+        await asyncio.sleep(0)
+
+        self.assertTrue(timeout.cancelled)
+        self.assertNotIn(idle, self.orchestrator._locks)
+        self.assertNotIn(idle, self.orchestrator._last_activity)
+        self.assertIsNone(self.orchestrator._sessions.peek(idle))
+        self.assertIn(watched, self.orchestrator._timeouts)
+        self.assertEqual(self.store.get_session(idle)["status"], "IN_PROGRESS")
+        self.assertEqual(LIVE_ENTRIES.value(kind="timeouts"), 1)
+
+    async def test_second_worker_relays_events_and_commands_through_owner(self):
+        session_id = await self._human_turn_session()
+        backplane = InProcessBackplane()
+        owner = GameOrchestrator(self.async_store, DummyLLMClient(), backplane)
+        follower = GameOrchestrator(self.async_store, DummyLLMClient(), backplane)
+        for worker in (owner, follower):
+            worker.ensure_engine = lambda session_id: None
+        owner_ws, follower_ws = RecordingWebSocket(), RecordingWebSocket()
+        await owner.register_client(session_id, "c1", owner_ws)
+        await follower.register_client(session_id, "c2", follower_ws)
+        await follower.session_snapshot(session_id)
+
+        await owner._run_loop(session_id)
+        await follower._run_loop(session_id)
+        self.assertEqual(self.store.get_lease(session_id)["owner"], owner.worker_id)
+        self.assertNotIn(session_id, follower._owned)
+
+        await follower.handle_human_message(session_id, client_id="c2", text="다른 워커에서 보냄")
+        await asyncio.gather(*owner._background)
+        for worker in (owner, follower):
+            await worker._connected_clients[session_id][("c1" if worker is owner else "c2")].queue.join()
+
+        self.assertEqual([m["text"] for m in self.store.list_messages(session_id)], ["다른 워커에서 보냄"])
+        for ws in (owner_ws, follower_ws):
+            self.assertIn("message.new", [frame["type"] for frame in ws.sent])
+        self.assertIsNone(follower._sessions.peek(session_id))
+        await owner.aclose()
+        await follower.aclose()
+
+    async def test_local_clients_still_get_frames_while_redis_is_down(self):
+        session_id = await self._human_turn_session()
+        server = MockRedisServer()
+        await server.start()
+        backplane = RedisBackplane(server.url, reconnect_delay_secs=0.05)
+        await backplane.start()
+        worker = GameOrchestrator(self.async_store, DummyLLMClient(), backplane)
+        worker.ensure_engine = lambda session_id: None
+        ws = RecordingWebSocket()
+        await worker.register_client(session_id, "c1", ws)
+        await server.stop()
+        while backplane._connected.is_set():
+            await asyncio.sleep(0.005)
+
+        await asyncio.wait_for(worker.handle_human_message(session_id, client_id="c1", text="레디스 없이"), timeout=1)
+        await worker._connected_clients[session_id]["c1"].queue.join()
+
+        self.assertIn("message.new", [frame["type"] for frame in ws.sent])
+        await worker.aclose()
+        await backplane.aclose()
+
+    async def test_lease_moves_to_another_worker_when_owner_stops_renewing(self):
+        session_id = await self._human_turn_session()
+        owner = GameOrchestrator(self.async_store, DummyLLMClient())
+        standby = GameOrchestrator(self.async_store, DummyLLMClient())
+        standby.ensure_engine = lambda session_id: None
+        await owner._run_loop(session_id)
+        await standby.register_client(session_id, "c1", RecordingWebSocket())
+        self.assertFalse(await standby._claim(session_id))
+
+        with self.store._conn() as conn:
+            conn.execute("UPDATE session_leases SET expires_at = 0 WHERE session_id = ?", (session_id,))
+        self.assertTrue(await standby._claim(session_id))
+        await owner._renew_leases()
+
+        self.assertNotIn(session_id, owner._owned)
+        self.assertNotIn(session_id, owner._timeouts)
+        self.assertEqual(self.store.get_lease(session_id)["owner"], standby.worker_id)
+        await owner.aclose()
+        await standby.aclose()
+        self.assertIsNone(self.store.get_lease(session_id))
+
+    async def test_lease_keeper_survives_renewal_errors_and_disowns_expired_leases(self):
+        session_id = await self._human_turn_session()
+        await self.orchestrator._run_loop(session_id)
+        self.assertIn(session_id, self.orchestrator._timeouts)
+        failing = mock.AsyncMock(side_effect=sqlite3.OperationalError("database is locked"))
+
+        with mock.patch.object(self.async_store, "acquire_lease", failing), mock.patch.object(
+            settings, "session_lease_ttl_secs", 0.15
+        ), self.assertLogs("app.orchestrator", level="WARNING"):
+            await self.orchestrator._renew_leases()
+            self.assertIn(session_id, self.orchestrator._owned)
+            keeper = asyncio.create_task(self.orchestrator._lease_keeper())
+            while session_id in self.orchestrator._owned:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            self.assertFalse(keeper.done())
+            keeper.cancel()
+            await asyncio.gather(keeper, return_exceptions=True)
+
+        self.assertGreaterEqual(failing.await_count, 2)
+        self.assertNotIn(session_id, self.orchestrator._timeouts)
+
+    async def test_recovery_resumes_live_sessions_with_remaining_deadlines(self):
+        human = await self._human_turn_session()
+        with self.store._conn() as conn:
+            conn.execute("UPDATE sessions SET updated_at = '2000-01-01T00:00:00+00:00' WHERE id = ?", (human,))
+        llm = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=1, max_chars=160, difficulty="normal")
+        self.store.update_session(
+            llm, status="IN_PROGRESS", turn_state={"current_speaker_seat": "B", "turn_counts": {"A": 1, "B": 0}, "turn_index": 1}
+        )
+        judging = await self._judging_session()
+        lobby = await self.orchestrator.create_session("주제", num_llm_speakers=1, turns_per_speaker=1, max_chars=160, difficulty="normal")
+        recovering = GameOrchestrator(self.async_store, DummyLLMClient())
+
+        with mock.patch.object(settings, "llm_stream_speaker", False), mock.patch.object(settings, "typing_delay_max_secs", 0.0):
+            self.assertEqual(await recovering.recover(), 3)
+            while not (self.store.list_messages(human) and self.store.get_result(llm) and self.store.get_result(judging)):
+                await asyncio.sleep(0.01)
+        await recovering.aclose()
+
+        self.assertIn(self.store.list_messages(human)[0]["text"], PASS_MESSAGES)
+        self.assertEqual(self.store.list_messages(llm)[0]["seat"], "B")
+        self.assertEqual(self.store.get_session(judging)["status"], "FINISHED")
+        self.assertEqual(self.store.get_session(lobby)["status"], "LOBBY")
+
+    async def test_recovery_persists_the_derived_human_deadline(self):
+        session_id = await self._human_turn_session()
+        updated_at = datetime.fromisoformat(self.store.get_session(session_id)["updated_at"]).timestamp()
+        recovering = GameOrchestrator(self.async_store, DummyLLMClient())
+        recovering.ensure_engine = lambda session_id: None
+
+        self.assertEqual(await recovering.recover(), 1)
+        recovering._sessions.invalidate(session_id)
+        await recovering._run_loop(session_id)
+        await recovering.aclose()
+
+        deadline = json.loads(self.store.get_session(session_id)["turn_state_json"])["human_deadline"]
+        self.assertAlmostEqual(deadline, updated_at + settings.human_turn_timeout_secs, delta=0.001)
+
+    async def test_recovery_paces_overdue_human_turns_like_llm_turns(self):
+        overdue = [await self._human_turn_session() for _ in range(3)]
+        waiting = await self._human_turn_session()
+        with self.store._conn() as conn:
+            conn.executemany("UPDATE sessions SET updated_at = '2000-01-01T00:00:00+00:00' WHERE id = ?", [(sid,) for sid in overdue])
+        recovering = GameOrchestrator(self.async_store, DummyLLMClient())
+        started = {}
+        recovering.ensure_engine = lambda session_id: started.setdefault(session_id, time.perf_counter())
+
+        with mock.patch.object(settings, "recovery_engines_per_sec", 10.0):
+            self.assertEqual(await recovering.recover(), 4)
+        await recovering.aclose()
+
+        times = sorted(started[sid] for sid in overdue)
+        self.assertGreaterEqual(min(b - a for a, b in zip(times, times[1:])), 0.09)
+        self.assertIn(waiting, started)
+
+    async def test_recovery_skips_sessions_leased_by_a_live_worker(self):
+        session_id = await self._human_turn_session()
+        self.store.acquire_lease(session_id, "other-worker", 60)
+        recovering = GameOrchestrator(self.async_store, DummyLLMClient())
+
+        with mock.patch.object(settings, "session_lease_ttl_secs", 0.01):
+            self.assertEqual(await recovering.recover(), 0)
+        await recovering.aclose()
+
+        self.assertNotIn(session_id, recovering._engine_tasks)
+        self.assertEqual(self.store.get_lease(session_id)["owner"], "other-worker")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from app.profiling import LOOP_STALLS, ProfilerBusyError, SamplingProfiler, StallDetector
+
+
+def _block_loop(secs: float):
+    time.sleep(secs)
+
+
+def _spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class SamplingProfilerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_collapsed_stacks_point_at_code_blocking_the_loop(self):
+        profiler = SamplingProfiler(max_secs=5.0)
+
+        async def blocker():
+            for _ in range(10):
+                _block_loop(0.02)
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(blocker())
+        samples = await profiler.profile(0.3, 0.005)
+        await task
+
+        blocking = sum(count for stack, count in samples.items() if stack.endswith("test_profiling.py:_block_loop"))
+        self.assertGreater(blocking, 0)
+        stack, count = profiler.render(samples).splitlines()[0].rsplit(" ", 1)
+        self.assertEqual(int(count), max(samples.values()))
+        self.assertIn(";", stack)
+
+    async def test_only_one_profile_runs_at_a_time(self):
+        profiler = SamplingProfiler(max_secs=5.0)
+        first = asyncio.create_task(profiler.profile(0.2, 0.01))
+        await asyncio.sleep(0.05)
+        with self.assertRaises(ProfilerBusyError):
+            await profiler.profile(0.1, 0.01)
+        await first
+        await profiler.profile(0.02, 0.01)
+
+    async def test_all_threads_prefixes_stacks_with_thread_name(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_spin, args=(stop,), name="sqlite-writer_0")
+        worker.start()
+        try:
+            samples = await SamplingProfiler(max_secs=5.0).profile(0.2, 0.005, all_threads=True)
+        finally:
+            stop.set()
+            worker.join()
+        self.assertTrue(any(stack.startswith("sqlite-writer_0;") and "_spin" in stack for stack in samples))
+        self.assertFalse(any(stack.startswith("sampling-profiler;") for stack in samples))
+
+    async def test_window_is_capped_by_max_secs(self):
+        started = time.perf_counter()
+        await SamplingProfiler(max_secs=0.1).profile(10.0, 0.01)
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+
+class StallDetectorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_reports_blocking_step_with_task_and_stack(self):
+        detector = StallDetector(threshold_secs=0.05)
+        detector.start()
+        stalls = LOOP_STALLS.value()
+
+        async def stuck_handler():
+            _block_loop(0.3)
+
+        try:
+            await asyncio.sleep(0.1)
+            with self.assertLogs("app.profiling", level="WARNING") as logs:
+                await asyncio.create_task(stuck_handler(), name="stuck")
+                await asyncio.sleep(0.1)
+        finally:
+            await detector.aclose()
+
+        self.assertEqual(len(detector.recent), 1)
+        stall = detector.recent[0]
+        self.assertIn("stuck", stall["task"])
+        self.assertIn("_block_loop", stall["stack"][-1])
+        self.assertIn("stuck_handler", stall["stack"][-2])
+        self.assertGreaterEqual(stall["blocked_ms"], 250)
+        self.assertEqual(LOOP_STALLS.value(), stalls + 1)
+        self.assertIn("_block_loop", logs.output[0])
+
+    async def test_disabled_without_threshold(self):
+        detector = StallDetector(threshold_secs=0)
+        detector.start()
+        self.assertIsNone(detector._thread)
+        await detector.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from app.prompts import build_judge_messages, build_speaker_messages, difficulty_to_window
+from app.prompts import build_judge_messages, build_pool_messages, build_speaker_messages, difficulty_to_window
 
 
 class PromptsTestCase(unittest.TestCase):
@@ -18,6 +18,12 @@ class PromptsTestCase(unittest.TestCase):
         self.assertIn("A: m9", prompt[1]["content"])
         self.assertNotIn("A: m5", prompt[1]["content"])
 
+    def test_build_pool_messages_handles_empty_history(self):
+        opener = build_pool_messages("주제", "B", "페르소나", [], "normal")
+        self.assertIn("아직 아무도 말하지 않았어.", opener[1]["content"])
+        follow_up = build_pool_messages("주제", "B", "페르소나", [{"seat": "A", "text": "안녕"}], "normal")
+        self.assertIn("A: 안녕", follow_up[1]["content"])
+
     def test_build_judge_messages_includes_seats_and_logs(self):
         prompt = build_judge_messages("주제", ["A", "B"], [{"seat": "A", "text": "안녕"}])
         self.assertIn("좌석: A, B", prompt[1]["content"])
@@ -0,0 +1,42 @@
+import json
+import unittest
+
+from app.session_cache import SessionCache, SessionState
+
+
+def make_state(session_id: str) -> SessionState:
+    session = {
+        "id": session_id,
+        "status": "IN_PROGRESS",
+        "difficulty": "easy",
+        "turn_state_json": json.dumps({"turn_counts": {"A": 0}, "turn_index": 0}),
+    }
+    messages = [{"seat": "A", "text": f"m{i}"} for i in range(6)]
+    return SessionState(session, [{"seat": "A", "type": "human"}], messages)
+
+
+class SessionCacheTestCase(unittest.TestCase):
+    def test_state_keeps_recent_ring_and_copies_turn_state(self):
+        state = make_state("s1")
+        self.assertEqual([m["text"] for m in state.recent_messages], ["m2", "m3", "m4", "m5"])
+        state.recent_messages.append({"seat": "A", "text": "m6"})
+        self.assertEqual(len(state.recent_messages), 4)
+        copied = state.copy_turn_state()
+        copied["turn_counts"]["A"] = 5
+        self.assertEqual(state.turn_state["turn_counts"]["A"], 0)
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = SessionCache(max_entries=2)
+        cache.put(make_state("s1"))
+        cache.put(make_state("s2"))
+        cache.get("s1")
+        cache.put(make_state("s3"))
+        self.assertIsNotNone(cache.get("s1"))
+        self.assertIsNone(cache.get("s2"))
+        self.assertEqual(len(cache), 2)
+        cache.invalidate("s1")
+        self.assertIsNone(cache.get("s1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
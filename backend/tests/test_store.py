@@ -1,7 +1,16 @@
+import asyncio
+import sqlite3
 import tempfile
+import time
 import unittest
 
-from app.store import SQLiteStore
+from app.store import AsyncSQLiteStore, SQLiteStore
+
+
+class SlowSQLiteStore(SQLiteStore):
+    def add_message(self, session_id: str, seat: str, turn_index: int, text: str):
+        time.sleep(0.2)
+        return super().add_message(session_id, seat, turn_index, text)
 
 
 class SQLiteStoreTestCase(unittest.TestCase):
@@ -10,6 +19,7 @@ class SQLiteStoreTestCase(unittest.TestCase):
         self.store = SQLiteStore(f"{self.temp_dir.name}/test.db")
 
     def tearDown(self):
+        self.store.close()
         self.temp_dir.cleanup()
 
     def test_session_message_and_result_lifecycle(self):
@@ -27,11 +37,143 @@ class SQLiteStoreTestCase(unittest.TestCase):
         self.assertEqual(self.store.get_message_index(session_id, message_id), 1)
         self.assertEqual(len(self.store.list_messages(session_id)), 1)
 
+        for idx in range(2, 6):
+            self.store.add_message(session_id, "A", idx, f"메시지{idx}")
+        self.assertEqual([m["turn_index"] for m in self.store.list_recent_messages(session_id, 3)], [3, 4, 5])
+        self.assertEqual([m["turn_index"] for m in self.store.list_messages_after(session_id, 3)], [4, 5])
+
         self.store.save_result(session_id, "A", 0.8, "근거")
         result = self.store.get_result(session_id)
         self.assertEqual(result["pick_seat"], "A")
         self.assertEqual(result["confidence"], 0.8)
 
+    def test_finish_session_only_transitions_from_judging(self):
+        session_id = self.store.create_session("주제", 1, 160, "normal", {"turn_index": 0}, config={})
+        self.assertFalse(self.store.finish_session(session_id, "A", 0.5, "이른 판정"))
+        self.assertIsNone(self.store.get_result(session_id))
+
+        self.store.update_session(session_id, status="JUDGING")
+        self.assertTrue(self.store.finish_session(session_id, "B", 0.9, "판정"))
+        self.assertFalse(self.store.finish_session(session_id, "A", 0.1, "중복"))
+        self.assertEqual(self.store.get_session(session_id)["status"], "FINISHED")
+        self.assertEqual(self.store.get_result(session_id)["pick_seat"], "B")
+
+    def test_session_lease_is_exclusive_until_expiry(self):
+        session_id = self.store.create_session("주제", 1, 160, "normal", {"turn_index": 0}, config={})
+        self.assertTrue(self.store.acquire_lease(session_id, "w1", 30))
+        self.assertFalse(self.store.acquire_lease(session_id, "w2", 30))
+        self.assertTrue(self.store.acquire_lease(session_id, "w1", 30))
+        self.assertFalse(self.store.acquire_lease(session_id, "w2", -1))
+
+        self.store.release_lease(session_id, "w2")
+        self.assertEqual(self.store.get_lease(session_id)["owner"], "w1")
+        self.store.release_lease(session_id, "w1")
+        self.assertTrue(self.store.acquire_lease(session_id, "w2", 30))
+
+    def test_load_live_sessions_bulk_loads_recent_window(self):
+        live = self.store.create_session("진행", 1, 160, "easy", {"turn_index": 0}, config={})
+        self.store.update_session(live, status="IN_PROGRESS")
+        self.store.add_participant(live, "A", "human")
+        for idx in range(1, 8):
+            self.store.add_message(live, "A", idx, f"m{idx}")
+        judging = self.store.create_session("판정", 1, 160, "easy", {"turn_index": 0}, config={})
+        self.store.update_session(judging, status="JUDGING")
+        for status in ("LOBBY", "FINISHED"):
+            self.store.update_session(self.store.create_session(status, 1, 160, "easy", {"turn_index": 0}, config={}), status=status)
+
+        rows = {row["session"]["id"]: row for row in self.store.load_live_sessions(3)}
+
+        self.assertEqual(set(rows), {live, judging})
+        self.assertEqual([m["text"] for m in rows[live]["messages"]], ["m5", "m6", "m7"])
+        self.assertEqual(rows[live]["participants"], [{"seat": "A", "type": "human", "persona_id": None, "display_name": None}])
+        self.assertEqual(rows[judging]["messages"], [])
+
+    def test_connection_is_reused_with_tuned_pragmas(self):
+        with self.store._conn() as first:
+            journal_mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = first.execute("PRAGMA synchronous").fetchone()[0]
+        with self.store._conn() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)
+
+    def test_messages_query_uses_session_index(self):
+        with self.store._conn() as conn:
+            plan = " ".join(
+                row["detail"]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT id, seat, turn_index, text, created_at FROM messages WHERE session_id = ? ORDER BY turn_index ASC, created_at ASC",
+                    ("s1",),
+                )
+            )
+        self.assertIn("idx_messages_session_turn", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+class MigrationTestCase(unittest.TestCase):
+    def test_legacy_database_is_upgraded_in_place(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = f"{temp_dir}/legacy.db"
+            conn = sqlite3.connect(db_path)
+            conn.executescript(
+                """
+                CREATE TABLE sessions (id TEXT PRIMARY KEY, topic TEXT NOT NULL, status TEXT NOT NULL, turns_per_speaker INTEGER NOT NULL,
+                    max_chars INTEGER NOT NULL, difficulty TEXT NOT NULL, created_at TEXT NOT NULL, updated_at TEXT NOT NULL,
+                    turn_state_json TEXT NOT NULL, config_json TEXT);
+                CREATE TABLE messages (id TEXT PRIMARY KEY, session_id TEXT NOT NULL, seat TEXT NOT NULL, turn_index INTEGER NOT NULL,
+                    text TEXT NOT NULL, created_at TEXT NOT NULL);
+                INSERT INTO messages VALUES ('m1', 's1', 'A', 1, '안녕', '2024-01-01T00:00:00');
+                """
+            )
+            conn.close()
+
+            store = SQLiteStore(db_path)
+            try:
+                self.assertEqual(store.schema_version(), 3)
+                self.assertEqual([m["id"] for m in store.list_messages("s1")], ["m1"])
+                with store._conn() as conn:
+                    indexes = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+                self.assertTrue({"idx_messages_session_turn", "idx_participants_session_seat", "idx_sessions_status_updated"} <= indexes)
+            finally:
+                store.close()
+
+            reopened = SQLiteStore(db_path)
+            self.assertEqual(reopened.schema_version(), 3)
+            reopened.close()
+
+
+class AsyncSQLiteStoreTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = AsyncSQLiteStore(SlowSQLiteStore(f"{self.temp_dir.name}/test.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    async def test_slow_writes_do_not_stall_event_loop(self):
+        session_id = await self.store.create_session("주제", 2, 160, "normal", {"turn_index": 0}, config={})
+        max_lag = 0.0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal max_lag
+            loop = asyncio.get_running_loop()
+            while not done.is_set():
+                started = loop.time()
+                await asyncio.sleep(0.01)
+                max_lag = max(max_lag, loop.time() - started - 0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        await asyncio.gather(*(self.store.add_message(session_id, "A", idx, f"m{idx}") for idx in range(3)))
+        done.set()
+        await tick_task
+
+        messages = await self.store.list_messages(session_id)
+        self.assertEqual([m["turn_index"] for m in messages], [0, 1, 2])
+        self.assertLess(max_lag, 0.1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+
+from app.timers import TimerWheel
+
+
+class TimerWheelTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.wheel = TimerWheel(tick_secs=0.01, slots=8)
+
+    async def asyncTearDown(self):
+        await self.wheel.aclose()
+
+    async def test_timers_fire_in_deadline_order_past_one_wheel_rotation(self):
+        fired = []
+        for delay, name in ((0.15, "late"), (0.02, "early"), (0.05, "middle")):
+            self.wheel.call_later(delay, lambda name=name: fired.append(name))
+        self.assertEqual(len(self.wheel), 3)
+
+        while len(fired) < 2:
+            await asyncio.sleep(0.005)
+        self.assertEqual(fired, ["early", "middle"])
+        await asyncio.wait_for(self.wheel.sleep(0.2), timeout=1)
+        self.assertEqual(fired, ["early", "middle", "late"])
+        self.assertEqual(len(self.wheel), 0)
+
+    async def test_cancelled_timer_never_fires(self):
+        fired = []
+        handle = self.wheel.call_later(0.02, lambda: fired.append("x"))
+        handle.cancel()
+        self.assertTrue(handle.done())
+        self.assertEqual(len(self.wheel), 0)
+        await asyncio.sleep(0.05)
+        self.assertEqual(fired, [])
+
+    async def test_coroutine_callbacks_and_sleep(self):
+        done = asyncio.Event()
+
+        async def callback():
+            done.set()
+
+        self.wheel.call_later(0.01, callback)
+        await asyncio.wait_for(self.wheel.sleep(0.02), timeout=1)
+        await asyncio.wait_for(done.wait(), timeout=1)
+
+        sleeper = asyncio.create_task(self.wheel.sleep(10))
+        await asyncio.sleep(0)
+        sleeper.cancel()
+        await asyncio.gather(sleeper, return_exceptions=True)
+        self.assertEqual(len(self.wheel), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
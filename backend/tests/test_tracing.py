@@ -0,0 +1,106 @@
+import asyncio
+import io
+import json
+import unittest
+
+from app.tracing import NOOP_SPAN, JsonlExporter, Tracer
+from scripts.trace_report import render, root_of, slowest
+
+
+def _read(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TracerTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.tracer = Tracer(JsonlExporter(self.stream))
+
+    def test_disabled_tracer_returns_shared_noop_span(self):
+        tracer = Tracer()
+        with tracer.span("turn.llm", session_id="s") as span:
+            span.set_attribute("seat", "B")
+        self.assertIs(span, NOOP_SPAN)
+
+    async def test_spans_nest_across_awaits_and_tasks_and_export_with_root(self):
+        async def db_call():
+            with self.tracer.span("db.add_message", pool="writer"):
+                await asyncio.sleep(0)
+
+        with self.tracer.span("engine.step", root=True, session_id="s1") as root:
+            root.set_attribute("seat", "B")
+            with self.tracer.span("lock.wait", site="run_llm_turn"):
+                await asyncio.sleep(0)
+            await asyncio.create_task(db_call())
+            self.assertEqual(self.stream.getvalue(), "")
+
+        spans = {span["name"]: span for span in _read(self.stream)}
+        self.assertEqual(set(spans), {"engine.step", "lock.wait", "db.add_message"})
+        self.assertIsNone(spans["engine.step"]["parent_span_id"])
+        self.assertEqual(spans["engine.step"]["attributes"], {"session_id": "s1", "seat": "B"})
+        for name in ("lock.wait", "db.add_message"):
+            self.assertEqual(spans[name]["trace_id"], root.trace_id)
+            self.assertEqual(spans[name]["parent_span_id"], root.span_id)
+        self.assertGreaterEqual(spans["engine.step"]["end_time_unix_nano"], spans["db.add_message"]["end_time_unix_nano"])
+
+    def test_root_option_starts_a_new_trace_and_errors_are_recorded(self):
+        with self.tracer.span("ws.session.join", root=True) as outer:
+            with self.assertRaises(ValueError):
+                with self.tracer.span("judge", root=True) as inner:
+                    raise ValueError("bad reply")
+        self.assertNotEqual(outer.trace_id, inner.trace_id)
+        judge = next(span for span in _read(self.stream) if span["name"] == "judge")
+        self.assertEqual(judge["status"], {"code": "ERROR", "message": "ValueError: bad reply"})
+
+    def test_sample_rate_drops_whole_traces(self):
+        self.tracer.sample_rate = 0.0
+        with self.tracer.span("engine.step") as root:
+            with self.tracer.span("db.get_session") as child:
+                child.set_attribute("rows", 1)
+        self.assertFalse(root.sampled or child.sampled)
+        self.assertEqual(self.stream.getvalue(), "")
+
+    def test_min_duration_keeps_only_slow_traces(self):
+        self.tracer.min_duration_ms = 50
+        with self.tracer.span("engine.step"):
+            with self.tracer.span("db.get_session"):
+                pass
+        self.assertEqual(self.stream.getvalue(), "")
+        with self.tracer.span("engine.step") as root:
+            with self.tracer.span("llm.stream"):
+                pass
+            root.start_ns -= 100_000_000
+        self.assertEqual([span["name"] for span in _read(self.stream)], ["llm.stream", "engine.step"])
+
+    def test_non_activating_span_does_not_become_parent(self):
+        with self.tracer.span("turn.llm") as turn:
+            with self.tracer.span("llm.stream", activate=False):
+                with self.tracer.span("broadcast") as broadcast:
+                    pass
+        self.assertEqual(broadcast.parent_span_id, turn.span_id)
+
+
+class TraceReportTestCase(unittest.TestCase):
+    def test_renders_slowest_trace_as_tree_with_self_time(self):
+        stream = io.StringIO()
+        tracer = Tracer(JsonlExporter(stream))
+        for session_id, slow_ms in (("fast", 0), ("slow", 300)):
+            with tracer.span("engine.step", session_id=session_id) as root:
+                with tracer.span("llm.stream", model="m") as llm:
+                    llm.start_ns -= slow_ms * 1_000_000
+                root.start_ns -= slow_ms * 1_000_000
+        traces = {}
+        for span in _read(stream):
+            traces.setdefault(span["trace_id"], []).append(span)
+
+        picked = slowest(traces, top=1)
+        lines = render(picked[0])
+
+        self.assertEqual(root_of(picked[0])["attributes"]["session_id"], "slow")
+        self.assertIn("engine.step", lines[0])
+        self.assertTrue(lines[1].rstrip().endswith("  llm.stream model=m"))
+        self.assertEqual(slowest(traces, top=5, name="judge"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from app.utterance_pool import UTTERANCE_POOL_DRAWS, UtterancePool
+
+
+class UtterancePoolTestCase(unittest.TestCase):
+    def test_draw_returns_newest_candidate(self):
+        pool = UtterancePool(max_per_seat=4, max_staleness_turns=8)
+        pool.add("B", ["old"], turn_index=0)
+        pool.add("B", ["new", "  "], turn_index=2)
+        self.assertEqual(pool.size("B"), 2)
+        self.assertEqual(pool.draw("B", 3, "budget"), "new")
+        self.assertEqual(pool.draw("B", 3, "budget"), "old")
+        before = UTTERANCE_POOL_DRAWS.value(reason="budget", outcome="empty")
+        self.assertIsNone(pool.draw("B", 3, "budget"))
+        self.assertEqual(UTTERANCE_POOL_DRAWS.value(reason="budget", outcome="empty"), before + 1)
+
+    def test_add_keeps_most_recent_per_seat(self):
+        pool = UtterancePool(max_per_seat=2, max_staleness_turns=8)
+        pool.add("B", ["a", "b", "c"], turn_index=0)
+        self.assertEqual(pool.size("B"), 2)
+        self.assertEqual(pool.size("C"), 0)
+
+    def test_stale_candidates_are_dropped(self):
+        pool = UtterancePool(max_per_seat=4, max_staleness_turns=2)
+        pool.add("B", ["a", "b"], turn_index=0)
+        before = UTTERANCE_POOL_DRAWS.value(reason="error", outcome="stale")
+        self.assertIsNone(pool.draw("B", 3, "error"))
+        self.assertEqual(UTTERANCE_POOL_DRAWS.value(reason="error", outcome="stale"), before + 1)
+        self.assertEqual(pool.size("B"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -100,6 +100,10 @@ if "pydantic_settings" not in sys.modules:
 
 from fastapi import WebSocketDisconnect
 
+from unittest import mock
+
+from app.broadcast import ClientConnection, serialize
+from app.config import settings
 from app.ws import make_ws_router
 
 
@@ -108,16 +112,24 @@ class DummyStore:
         self.messages = []
         self.message_indexes = {}
         self.result = None
+        self.on_query = None
 
-    def list_messages(self, session_id: str):
+    async def list_messages(self, session_id: str):
         del session_id
         return list(self.messages)
 
-    def get_message_index(self, session_id: str, message_id: str):
+    async def list_messages_after(self, session_id: str, after_turn_index: int):
+        del session_id
+        rows = [m for m in self.messages if m["turn_index"] > after_turn_index]
+        if self.on_query is not None:
+            self.on_query()
+        return rows
+
+    async def get_message_index(self, session_id: str, message_id: str):
         del session_id
         return self.message_indexes.get(message_id)
 
-    def get_result(self, session_id: str):
+    async def get_result(self, session_id: str):
         del session_id
         return self.result
 
@@ -126,14 +138,25 @@ class DummyOrchestrator:
     def __init__(self, store: DummyStore, status: str = "IN_PROGRESS"):
         self.store = store
         self._status = status
-
-    async def register_client(self, session_id: str, client_id: str, websocket):
-        del session_id, client_id, websocket
+        self.conn = None
+
+    async def register_client(self, session_id: str, client_id: str, websocket, after_turn_index: int | None = None, paused: bool = False):
+        del session_id, client_id
+        self.conn = ClientConnection(
+            websocket,
+            max_queue=100,
+            slow_consumer_policy="drop",
+            last_turn_index=after_turn_index or 0,
+            on_catch_up=lambda conn: None,
+            on_dead=lambda conn: None,
+            paused=paused,
+        )
+        return self.conn
 
     async def unregister_client(self, session_id: str, client_id: str, websocket):
         del session_id, client_id, websocket
 
-    def session_snapshot(self, session_id: str):
+    async def session_snapshot(self, session_id: str):
         return {"type": "session.state", "session_id": session_id, "status": self._status}
 
     def ensure_engine(self, session_id: str):
@@ -156,13 +179,21 @@ class FakeWebSocket:
     async def send_json(self, payload: dict):
         self.sent.append(payload)
 
+    async def send_text(self, text: str):
+        self.sent.append(json.loads(text))
+
 
 class WsResumeTestCase(unittest.TestCase):
     def _run_resume(self, orchestrator: DummyOrchestrator, payload: dict):
         router = make_ws_router(orchestrator)
         endpoint = router.routes[-1].endpoint
         ws = FakeWebSocket([payload])
-        asyncio.run(endpoint(ws, "s1"))
+
+        async def run():
+            await endpoint(ws, "s1")
+            await orchestrator.conn.queue.join()
+
+        asyncio.run(run())
         return ws.sent
 
     def test_resume_filters_messages_after_last_seen_turn_index(self):
@@ -209,6 +240,48 @@ class WsResumeTestCase(unittest.TestCase):
         self.assertEqual(sent[1]["type"], "session.finished")
         self.assertEqual(sent[1]["judge"]["pick_seat"], "A")
 
+    def test_resume_by_turn_index_replays_in_chunked_batches(self):
+        store = DummyStore()
+        store.messages = [{"id": f"m{i}", "turn_index": i, "seat": "A", "text": str(i)} for i in range(1, 8)]
+
+        with mock.patch.object(settings, "resume_batch_size", 2):
+            sent = self._run_resume(
+                DummyOrchestrator(store),
+                {"type": "session.resume", "client_id": "c1", "last_seen_turn_index": 2, "batch_replay": True},
+            )
+
+        self.assertEqual(sent[0]["type"], "session.state")
+        self.assertTrue(all(frame["type"] == "message.batch" for frame in sent[1:]))
+        self.assertEqual([len(frame["messages"]) for frame in sent[1:]], [2, 2, 1])
+        replayed = [m["message_id"] for frame in sent[1:] for m in frame["messages"]]
+        self.assertEqual(replayed, ["m3", "m4", "m5", "m6", "m7"])
+
+    def test_batch_replay_with_nothing_new_sends_no_batch(self):
+        store = DummyStore()
+        store.messages = [{"id": "m1", "turn_index": 1, "seat": "A", "text": "one"}]
+
+        sent = self._run_resume(
+            DummyOrchestrator(store),
+            {"type": "session.resume", "client_id": "c1", "last_seen_turn_index": 1, "batch_replay": True},
+        )
+
+        self.assertEqual([frame["type"] for frame in sent], ["session.state"])
+
+    def test_turn_committed_during_resume_is_sent_once_after_the_replay(self):
+        store = DummyStore()
+        store.messages = [{"id": f"m{i}", "turn_index": i, "seat": "A", "text": str(i)} for i in range(1, 4)]
+        orchestrator = DummyOrchestrator(store)
+
+        def commit_live():
+            live = {"type": "message.new", "message_id": "m3", "turn_index": 3, "seat": "A", "text": "3"}
+            orchestrator.conn.offer(serialize(live), 3)
+            orchestrator.conn.offer(serialize({**live, "message_id": "m4", "turn_index": 4}), 4)
+
+        store.on_query = commit_live
+        sent = self._run_resume(orchestrator, {"type": "session.resume", "client_id": "c1", "last_seen_turn_index": 1})
+
+        self.assertEqual([frame.get("message_id") for frame in sent], [None, "m2", "m3", "m4"])
+
 
 if __name__ == "__main__":
     unittest.main()
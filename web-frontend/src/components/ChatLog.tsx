@@ -1,18 +1,19 @@
 import { useEffect, useRef } from 'react';
-import type { Message, TypingState } from '../types/models';
+import type { DraftState, Message, TypingState } from '../types/models';
 import ChatBubble from './ChatBubble';
 
 type Props = {
   messages: Message[];
   typingState: TypingState;
+  drafts: DraftState;
 };
 
-export default function ChatLog({ messages, typingState }: Props) {
+export default function ChatLog({ messages, typingState, drafts }: Props) {
   const bottomRef = useRef<HTMLDivElement>(null);
 
   useEffect(() => {
     bottomRef.current?.scrollIntoView({ behavior: 'smooth' });
-  }, [messages, typingState]);
+  }, [messages, typingState, drafts]);
 
   return (
     <div className="chat-log">
@@ -21,9 +22,9 @@ export default function ChatLog({ messages, typingState }: Props) {
       ))}
       {Object.entries(typingState)
         .filter(([, isTyping]) => isTyping)
-        .map(([_seat], index) => (
+        .map(([seat], index) => (
           <div key={`typing-${index}`} className="typing-indicator">
-            상대가 입력 중...
+            {drafts[seat] || '상대가 입력 중...'}
           </div>
         ))}
       <div ref={bottomRef} />
@@ -6,9 +6,15 @@ import ChatInput from '../components/ChatInput';
 import ChatLog from '../components/ChatLog';
 import HeaderBar from '../components/HeaderBar';
 import JudgeModal from '../components/JudgeModal';
-import type { InboundEvent } from '../types/events';
-import type { ConnectionState, JudgeResult, Message, SessionState, TypingState } from '../types/models';
-import { getLastSeenMessageId, getOrCreateClientId, setLastSeenMessageId } from '../utils/storage';
+import type { InboundEvent, MessageNewEvent } from '../types/events';
+import type { ConnectionState, DraftState, JudgeResult, Message, SessionState, TypingState } from '../types/models';
+import {
+  getLastSeenMessageId,
+  getLastSeenTurnIndex,
+  getOrCreateClientId,
+  setLastSeenMessageId,
+  setLastSeenTurnIndex,
+} from '../utils/storage';
 
 const HUMAN_SEAT = 'A';
 
@@ -39,6 +45,7 @@ export default function SessionPage() {
   const [messages, setMessages] = useState<Message[]>([]);
   const [messageIds, setMessageIds] = useState<Set<string>>(new Set());
   const [typingState, setTypingState] = useState<TypingState>({});
+  const [drafts, setDrafts] = useState<DraftState>({});
   const [input, setInput] = useState('');
   const [judgeResult, setJudgeResult] = useState<JudgeResult | null>(null);
   const [connectionState, setConnectionState] = useState<ConnectionState>({
@@ -64,6 +71,8 @@ export default function SessionPage() {
             type: 'session.resume',
             client_id: clientId,
             last_seen_message_id: lastSeen,
+            last_seen_turn_index: getLastSeenTurnIndex(sessionId),
+            batch_replay: true,
           };
         }
         return {
@@ -106,6 +115,31 @@ export default function SessionPage() {
     }, 1000);
   };
 
+  const appendMessage = (event: MessageNewEvent) => {
+    setTypingState((prev) => ({ ...prev, [event.seat]: false }));
+    setDrafts((prev) => ({ ...prev, [event.seat]: '' }));
+    setMessageIds((prev) => {
+      if (prev.has(event.message_id)) {
+        return prev;
+      }
+      const copy = new Set(prev);
+      copy.add(event.message_id);
+      setMessages((old) => [
+        ...old,
+        {
+          messageId: event.message_id,
+          turnIndex: event.turn_index,
+          seat: event.seat,
+          text: event.text,
+          ts: event.ts,
+        },
+      ]);
+      setLastSeenMessageId(sessionId, event.message_id);
+      setLastSeenTurnIndex(sessionId, event.turn_index);
+      return copy;
+    });
+  };
+
   const handleEvent = (event: InboundEvent) => {
     switch (event.type) {
       case 'session.state':
@@ -130,27 +164,15 @@ export default function SessionPage() {
         }
         setTypingState((prev) => ({ ...prev, [event.seat]: true }));
         return;
+      case 'message.delta':
+        setTypingState((prev) => ({ ...prev, [event.seat]: true }));
+        setDrafts((prev) => ({ ...prev, [event.seat]: (prev[event.seat] ?? '') + event.text }));
+        return;
       case 'message.new':
-        setTypingState((prev) => ({ ...prev, [event.seat]: false }));
-        setMessageIds((prev) => {
-          if (prev.has(event.message_id)) {
-            return prev;
-          }
-          const copy = new Set(prev);
-          copy.add(event.message_id);
-          setMessages((old) => [
-            ...old,
-            {
-              messageId: event.message_id,
-              turnIndex: event.turn_index,
-              seat: event.seat,
-              text: event.text,
-              ts: event.ts,
-            },
-          ]);
-          setLastSeenMessageId(sessionId, event.message_id);
-          return copy;
-        });
+        appendMessage(event);
+        return;
+      case 'message.batch':
+        event.messages.forEach(appendMessage);
         return;
       case 'turn.next':
         setSessionState((prev) => ({
@@ -198,7 +220,7 @@ export default function SessionPage() {
       />
       {connectionState.reconnecting && <div className="banner">재연결 중...</div>}
       {connectionState.lastError && <div className="banner error">{connectionState.lastError}</div>}
-      <ChatLog messages={messages} typingState={typingState} />
+      <ChatLog messages={messages} typingState={typingState} drafts={drafts} />
       <ChatInput
         value={input}
         maxChars={sessionState.maxChars}
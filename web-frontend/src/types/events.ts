@@ -18,6 +18,13 @@ export type MessageTypingEvent = {
   seat: string;
 };
 
+export type MessageDeltaEvent = {
+  type: 'message.delta';
+  turn_index: number;
+  seat: string;
+  text: string;
+};
+
 export type MessageNewEvent = {
   type: 'message.new';
   message_id: string;
@@ -27,6 +34,11 @@ export type MessageNewEvent = {
   ts?: string;
 };
 
+export type MessageBatchEvent = {
+  type: 'message.batch';
+  messages: MessageNewEvent[];
+};
+
 export type TurnNextEvent = {
   type: 'turn.next';
   current_speaker_seat: string | null;
@@ -44,7 +56,9 @@ export type InboundEvent =
   | SessionStateEvent
   | TurnRequestHumanEvent
   | MessageTypingEvent
+  | MessageDeltaEvent
   | MessageNewEvent
+  | MessageBatchEvent
   | TurnNextEvent
   | SessionFinishedEvent;
 
@@ -57,6 +71,8 @@ export type SessionResumeEvent = {
   type: 'session.resume';
   client_id: string;
   last_seen_message_id: string | null;
+  last_seen_turn_index?: number | null;
+  batch_replay?: boolean;
 };
 
 export type HumanMessageEvent = {
@@ -20,6 +20,8 @@ export type Message = {
 
 export type TypingState = Record<string, boolean>;
 
+export type DraftState = Record<string, string>;
+
 export type ConnectionState = {
   connected: boolean;
   reconnecting: boolean;
@@ -28,3 +28,16 @@ export function getLastSeenMessageId(sessionId: string): string | null {
 export function setLastSeenMessageId(sessionId: string, messageId: string) {
   localStorage.setItem(lastSeenKey(sessionId), messageId);
 }
+
+function lastSeenTurnKey(sessionId: string) {
+  return `last_seen_turn:${sessionId}`;
+}
+
+export function getLastSeenTurnIndex(sessionId: string): number | null {
+  const saved = localStorage.getItem(lastSeenTurnKey(sessionId));
+  return saved === null ? null : Number(saved);
+}
+
+export function setLastSeenTurnIndex(sessionId: string, turnIndex: number) {
+  localStorage.setItem(lastSeenTurnKey(sessionId), String(turnIndex));
+}